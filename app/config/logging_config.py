@@ -1,13 +1,92 @@
+import atexit
 import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
 from .settings import Settings
 
+_listener: Optional[QueueListener] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves all formatting to the listener thread.
+
+    The stock QueueHandler formats the message in the calling thread; here the
+    record is passed through untouched so the event loop only pays for the
+    enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger for records below ``exempt_level``.
+
+    Each logger may emit ``rate`` records per second with bursts of ``burst``.
+    Excess records are dropped and the next record that gets through notes how
+    many were suppressed.
+    """
+
+    def __init__(self, rate: float, burst: int, exempt_level: int = logging.ERROR):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.exempt_level = exempt_level
+        # logger name -> (tokens, last refill time, suppressed count)
+        self._buckets: Dict[str, Tuple[float, float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= self.exempt_level:
+            return True
+
+        now = time.monotonic()
+        tokens, last, suppressed = self._buckets.get(record.name, (self.burst, now, 0))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1:
+            self._buckets[record.name] = (tokens, now, suppressed + 1)
+            return False
+
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+        self._buckets[record.name] = (tokens - 1, now, 0)
+        return True
+
+
 def setup_logging():
-    logging.basicConfig(
-        level=getattr(logging, Settings.LOG_LEVEL),
-        format=Settings.LOG_FORMAT,
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('app.log')
-        ]
-    )
-    return logging.getLogger(__name__)
\ No newline at end of file
+    """Route all logging through a queue drained by a background thread"""
+    global _listener
+    if _listener is None:
+        formatter = logging.Formatter(Settings.LOG_FORMAT)
+        stream_handler = logging.StreamHandler()
+        file_handler = RotatingFileHandler(
+            Settings.LOG_FILE,
+            maxBytes=Settings.LOG_MAX_BYTES,
+            backupCount=Settings.LOG_BACKUP_COUNT
+        )
+        for handler in (stream_handler, file_handler):
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(Settings.LOG_RATE_LIMIT, Settings.LOG_RATE_BURST))
+
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, Settings.LOG_LEVEL))
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+
+        _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return logging.getLogger(__name__)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
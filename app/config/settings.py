@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,13 +14,139 @@ class Settings:
     
     ENV = os.getenv('ENVIRONMENT', 'development')
     HOST = "0.0.0.0"
-    PORT = 5001
+    PORT = int(os.getenv('PORT', '5001'))
     ALLOWED_ORIGINS = (
         ["http://localhost:5001"] if ENV == 'development'
         else ["https://world-of-wordcraft.up.railway.app"]
     )
+
+    # Worker processes sharing the port through SO_REUSEPORT. With more than
+    # one worker, sessions and chat go through a shared store and message bus
+    WORKERS = int(os.getenv('WORKERS', '1'))
+    WORKER_ID = os.getenv('WORKER_ID', 'main')
+    SESSION_STORE = os.getenv('SESSION_STORE', 'memory' if WORKERS == 1 else 'sqlite')
+    SESSION_STORE_PATH = os.getenv('SESSION_STORE_PATH', 'sessions.db')
+    # Workers refresh their presence rows every PRESENCE_HEARTBEAT seconds;
+    # rows not refreshed for PRESENCE_TTL seconds belong to a dead worker
+    PRESENCE_HEARTBEAT = float(os.getenv('PRESENCE_HEARTBEAT', '10'))
+    PRESENCE_TTL = float(os.getenv('PRESENCE_TTL', '30'))
+    MESSAGE_BUS = os.getenv('MESSAGE_BUS', 'local' if WORKERS == 1 else 'unix')
+    BUS_DIR = os.getenv('BUS_DIR', os.path.join(tempfile.gettempdir(), f'wordcraft-bus-{PORT}'))
+    # Zone mode gives each worker ownership of part of the world. Workers also
+    # listen on ZONE_PORT_BASE + worker id so players can be handed off to them
+    ZONE_MODE = os.getenv('ZONE_MODE', 'false').lower() in ('1', 'true', 'yes')
+    ZONE_SIZE = int(os.getenv('ZONE_SIZE', '16'))
+    ZONE_PORT_BASE = int(os.getenv('ZONE_PORT_BASE', str(PORT + 1)))
+    # How handed off clients reach the zone owner: 'relay' reconnects through
+    # the public port and the accepting worker relays to the owner over
+    # loopback (zone ports stay private); 'direct' reconnects to the owner's
+    # zone port, which must then be reachable by clients
+    ZONE_HANDOFF = os.getenv('ZONE_HANDOFF', 'relay')
+
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_FILE = os.getenv('LOG_FILE', 'app.log' if WORKER_ID == 'main' else f'app.worker-{WORKER_ID}.log')
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    # Records per second (and burst size) allowed per logger below ERROR, 0 disables
+    LOG_RATE_LIMIT = float(os.getenv('LOG_RATE_LIMIT', '50'))
+    LOG_RATE_BURST = int(os.getenv('LOG_RATE_BURST', '100'))
+
+    # Event loop lag monitoring. ASYNCIO_DEBUG also turns on asyncio's own
+    # slow callback reporting, which is too costly for production
+    LOOP_MONITOR_INTERVAL = float(os.getenv('LOOP_MONITOR_INTERVAL', '0.1'))
+    LOOP_LAG_THRESHOLD = float(os.getenv('LOOP_LAG_THRESHOLD', '0.1'))
+    ASYNCIO_DEBUG = os.getenv('ASYNCIO_DEBUG', 'false').lower() in ('1', 'true', 'yes')
+
+    # Resume tokens let a reconnecting client skip the password login. Without
+    # a configured secret tokens only stay valid until the process restarts
+    SESSION_SECRET = os.getenv('SESSION_SECRET', '')
+    SESSION_TOKEN_TTL = int(os.getenv('SESSION_TOKEN_TTL', '900'))
+
+    # Database connection pool
+    DB_PATH = os.getenv('DB_PATH', 'game.db')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '4'))
+    DB_ACQUIRE_TIMEOUT = float(os.getenv('DB_ACQUIRE_TIMEOUT', '5.0'))
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024)))
+    # Negative values are in KiB, see https://www.sqlite.org/pragma.html#pragma_cache_size
+    DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', '-16000'))
+
+    # Password hashing worker pool ('thread' or 'process')
+    HASH_EXECUTOR = os.getenv('HASH_EXECUTOR', 'thread')
+    HASH_WORKERS = int(os.getenv('HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+    HASH_MAX_QUEUE = int(os.getenv('HASH_MAX_QUEUE', '32'))
+    HASH_ROUNDS = int(os.getenv('HASH_ROUNDS', '12'))
+
+    # Room cache in front of the rooms table. The cap is measured on the
+    # serialized room, dirty rooms are written back every ROOM_FLUSH_INTERVAL
+    ROOM_CACHE_MAX_BYTES = int(os.getenv('ROOM_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    ROOM_FLUSH_INTERVAL = float(os.getenv('ROOM_FLUSH_INTERVAL', '2.0'))
+
+    # Room generation. LLM_BACKEND is 'openai' or 'stub' (canned rooms, no network)
+    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai' if OPENAI_API_KEY else 'stub')
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4')
+    LLM_MAX_TOKENS = int(os.getenv('LLM_MAX_TOKENS', '500'))
+    LLM_TEMPERATURE = float(os.getenv('LLM_TEMPERATURE', '0.7'))
+    # Simulated completion time of the stub backend, in seconds
+    LLM_STUB_LATENCY = float(os.getenv('LLM_STUB_LATENCY', '0'))
+    # Concurrent generations, and how many of them may be speculative
+    # neighbour prefetches; keep the budget below the worker count so players
+    # always find a free worker
+    GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', '4'))
+    PREFETCH_BUDGET = int(os.getenv('PREFETCH_BUDGET', '2'))
+    # Rooms queued within the batching window are generated by one request;
+    # rooms missing or invalid in a reply are asked for again this many times
+    GENERATION_BATCH_SIZE = int(os.getenv('GENERATION_BATCH_SIZE', '4'))
+    GENERATION_BATCH_WINDOW = float(os.getenv('GENERATION_BATCH_WINDOW', '0.02'))
+    GENERATION_RETRIES = int(os.getenv('GENERATION_RETRIES', '1'))
+    # Alternative endpoint for OpenAI compatible servers
+    OPENAI_API_BASE = os.getenv('OPENAI_API_BASE', '')
+    # Completion cache keyed by model, prompt and parameters: a memory LRU of
+    # LLM_CACHE_MEMORY_ENTRIES in front of a SQLite file capped by size and TTL.
+    # LLM_CACHE_WARM_FROM seeds an empty cache from an existing cache file
+    LLM_CACHE = os.getenv('LLM_CACHE', 'true' if LLM_BACKEND == 'openai' else 'false').lower() in ('1', 'true', 'yes')
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', 'llm_cache.db')
+    LLM_CACHE_MEMORY_ENTRIES = int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', '1024'))
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+    LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', str(30 * 24 * 3600)))
+    LLM_CACHE_WARM_FROM = os.getenv('LLM_CACHE_WARM_FROM', '')
+    # Every completion request goes through a bounded pool: LLM_CONCURRENCY in
+    # flight, LLM_MAX_QUEUE waiting, at most LLM_RATE_LIMIT started per minute
+    # (0 for no limit) and LLM_TIMEOUT seconds from request to reply. After
+    # LLM_BREAKER_FAILURES consecutive failures rooms come from the local
+    # procedural generator for LLM_BREAKER_RESET seconds
+    LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '4'))
+    LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', '32'))
+    LLM_RATE_LIMIT = float(os.getenv('LLM_RATE_LIMIT', '60'))
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '20'))
+    LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+    LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', '30'))
+
+    # Rooms per side of the buckets used for neighbourhood player lookups
+    OCCUPANCY_BUCKET_SIZE = int(os.getenv('OCCUPANCY_BUCKET_SIZE', '8'))
+
+    # Per-client outbound message queue. When a queue is full the frame is
+    # either dropped ('drop') or the slow client is disconnected ('disconnect')
+    OUTBOUND_QUEUE_SIZE = int(os.getenv('OUTBOUND_QUEUE_SIZE', '256'))
+    OUTBOUND_OVERFLOW_POLICY = os.getenv('OUTBOUND_OVERFLOW_POLICY', 'disconnect')
+
+    # Per-client inbound command queue and the delay before a long running
+    # command sends a "working" progress frame
+    INBOUND_QUEUE_SIZE = int(os.getenv('INBOUND_QUEUE_SIZE', '16'))
+    COMMAND_PROGRESS_DELAY = float(os.getenv('COMMAND_PROGRESS_DELAY', '0.5'))
+
+    # Protocol level ping/pong detects half-open connections; the idle timeout
+    # disconnects players who have not sent a command for that many seconds
+    WS_PING_INTERVAL = float(os.getenv('WS_PING_INTERVAL', '20'))
+    WS_PING_TIMEOUT = float(os.getenv('WS_PING_TIMEOUT', '20'))
+    # Each compressed socket keeps its own zlib state (about 100 KiB, see
+    # benchmarks/bench_connection_memory.py) while game messages are small
+    WS_PER_MESSAGE_DEFLATE = os.getenv('WS_PER_MESSAGE_DEFLATE', 'false').lower() in ('1', 'true', 'yes')
+    IDLE_TIMEOUT = float(os.getenv('IDLE_TIMEOUT', '1800'))
+    REAPER_INTERVAL = float(os.getenv('REAPER_INTERVAL', '30'))
+    # Time allowed for closing every connection on shutdown
+    SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', '5'))
     
     @classmethod
     def validate_paths(cls):
@@ -5,6 +5,7 @@ from ...network.session_manager import SessionManager
 class FontSizeCommand(Command):
     name = "fontsize"
     description = "Change the game text font size"
+    usage = "fontsize <number>"
     requires_login = False
     MIN_SIZE = 1
     MAX_SIZE = 1000
@@ -5,6 +5,7 @@ from ...network.session_manager import SessionManager
 class HighContrastCommand(Command):
     name = "highcontrast"
     description = "Toggle high contrast mode (on/off)"
+    usage = "highcontrast <on|off>"
     requires_login = False
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
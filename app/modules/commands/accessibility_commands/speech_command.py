@@ -5,6 +5,7 @@ from ...network.session_manager import SessionManager
 class SpeechCommand(Command):
     name = "speech"
     description = "Control text-to-speech settings"
+    usage = "speech <on|off>"
     requires_login = False
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
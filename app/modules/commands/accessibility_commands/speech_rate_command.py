@@ -5,6 +5,8 @@ from ...network.session_manager import SessionManager
 class SpeechRateCommand(Command):
     name = "speech-rate"
     description = "Change text-to-speech rate"
+    usage = "speech-rate <0.1-10>"
+    aliases = ("speech rate",)
     requires_login = False
     MIN_RATE = 0.1
     MAX_RATE = 10.0
@@ -5,6 +5,8 @@ from ...network.session_manager import SessionManager
 class SpeechRepeatCommand(Command):
     name = "speech-repeat"
     description = "Repeat all visible game text using text-to-speech"
+    usage = "speech-repeat"
+    aliases = ("speech repeat",)
     requires_login = False
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
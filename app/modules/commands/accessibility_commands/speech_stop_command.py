@@ -5,6 +5,8 @@ from ...network.session_manager import SessionManager
 class SpeechStopCommand(Command):
     name = "speech-stop"
     description = "Stop any ongoing text-to-speech"
+    usage = "speech-stop"
+    aliases = ("speech stop",)
     requires_login = False
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
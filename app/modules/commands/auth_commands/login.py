@@ -2,6 +2,7 @@ from ..command import Command
 from ...database.sqlite_handler import SQLiteHandler
 from ...network.websocket_message import WebSocketMessage
 from ...network.session_manager import SessionManager
+from ...network.resume_tokens import ResumeTokens
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,11 +10,13 @@ logger = logging.getLogger(__name__)
 class LoginCommand(Command):
     name = "login"
     description = "Login to your account"
+    usage = "login <username> <password>"
     requires_login = False
+    services = ('db',)
 
-    def __init__(self):
+    def __init__(self, db: SQLiteHandler):
         super().__init__()
-        self.db = SQLiteHandler()
+        self.db = db
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
         # Parse username and password
@@ -25,16 +28,19 @@ class LoginCommand(Command):
             )
 
         username, password = parts
-        logger.debug(f"Attempting login for user: {username}")
+        logger.debug("Attempting login for user: %s", username)
 
         # Attempt login
         success, message = await self.db.verify_login(username, password)
         
         if success:
-            session_manager.create_session(client_id, username)
+            location = await self.db.get_player_location(username)
+            session_manager.create_session(client_id, username, location)
+            session = session_manager.get_session(client_id)
             return WebSocketMessage(
                 type='success',
-                message=f'Welcome back, {username}!'
+                message=f'Welcome back, {username}!',
+                data={'resume_token': ResumeTokens().issue(username, session['roles'], session['location'])}
             )
             
         return WebSocketMessage(
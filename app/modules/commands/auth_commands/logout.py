@@ -1,19 +1,29 @@
 from ..command import Command
 from ...network.websocket_message import WebSocketMessage
 from ...network.session_manager import SessionManager
+from ...network.resume_tokens import ResumeTokens
 from ...constants import WELCOME_MESSAGE
 import logging
 
 logger = logging.getLogger(__name__)
 
+LOGOUT_MESSAGE = WebSocketMessage.constant(
+    type='logout',
+    message='You have been logged out.\n\n' + WELCOME_MESSAGE
+)
+
 class LogoutCommand(Command):
     name = "logout"
     description = "Logout from your current session"
+    usage = "logout"
     requires_login = True
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        username = session_manager.get_username(client_id)
+        if username:
+            try:
+                await ResumeTokens().revoke(username)
+            except Exception as e:
+                logger.error(f"Revoking resume tokens for {username} failed: {e}")
         session_manager.end_session(client_id)
-        return WebSocketMessage(
-            type='logout',
-            message='You have been logged out.\n\n' + WELCOME_MESSAGE
-        )
\ No newline at end of file
+        return LOGOUT_MESSAGE
\ No newline at end of file
@@ -4,6 +4,7 @@ from ..command import Command
 from ...database.sqlite_handler import SQLiteHandler
 from ...network.websocket_message import WebSocketMessage
 from ...network.session_manager import SessionManager
+from ...network.resume_tokens import ResumeTokens
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,11 +12,13 @@ logger = logging.getLogger(__name__)
 class RegisterCommand(Command):
     name = "register"
     description = "Register a new account"
+    usage = "register <username> <password>"
     requires_login = False
+    services = ('db',)
 
-    def __init__(self):
+    def __init__(self, db: SQLiteHandler):
         super().__init__()
-        self.db = SQLiteHandler()
+        self.db = db
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
         # Parse args
@@ -31,13 +34,15 @@ class RegisterCommand(Command):
         success, message = await self.db.register_user(username, password)
         if success:
             # Create session and login user automatically
-            session_manager.create_session(client_id, username)
             starting_room = self.db.users.room_generator.get_starting_room()
+            session_manager.create_session(client_id, username, starting_room["coordinates"])
+            session = session_manager.get_session(client_id)
             room_description = starting_room["description"]
             _message = f'\nWelcome to World of Wordcraft, {username}! You are now logged in.\n\n{room_description}'
             return WebSocketMessage(
                 type='success',
-                message=_message
+                message=_message,
+                data={'resume_token': ResumeTokens().issue(username, session['roles'], session['location'])}
             )
 
         return WebSocketMessage(
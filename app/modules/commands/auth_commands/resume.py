@@ -0,0 +1,42 @@
+from ..command import Command
+from ...network.websocket_message import WebSocketMessage
+from ...network.session_manager import SessionManager
+from ...network.resume_tokens import ResumeTokens
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESUME_FAILED = WebSocketMessage.constant(
+    type='resume-failed',
+    message='Your session has expired. Please login again.'
+)
+
+class ResumeCommand(Command):
+    name = "resume"
+    description = "Restore a previous session after reconnecting"
+    usage = "resume <token>"
+    requires_login = False
+
+    async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        token = args.strip()
+        if not token:
+            return WebSocketMessage(
+                type='error',
+                message='Usage: resume <token>'
+            )
+
+        tokens = ResumeTokens()
+        claims = await tokens.verify(token)
+        if not claims:
+            return RESUME_FAILED
+
+        username = claims['sub']
+        session_manager.create_session(client_id, username, claims.get('loc'), claims['roles'])
+        session = session_manager.get_session(client_id)
+        logger.debug("Resumed session for user: %s", username)
+        # Hand out a fresh token so an active player never has to log in again
+        return WebSocketMessage(
+            type='success',
+            message=f'Welcome back, {username}!',
+            data={'resume_token': tokens.issue(username, session['roles'], session['location'])}
+        )
@@ -1,11 +1,20 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 from ..network.websocket_message import WebSocketMessage
 from ..network.session_manager import SessionManager
+from ..roles import Role
 
 class Command(ABC):
     name = ""
     description = ""
+    # Argument synopsis shown by help, e.g. "login <username> <password>"
+    usage = ""
+    # Extra names the command answers to, e.g. "l" or "speech rate"
+    aliases: Tuple[str, ...] = ()
     requires_login = False
+    required_role: Optional[Role] = None
+    # Names of shared registry services passed to __init__ as keyword arguments
+    services: Tuple[str, ...] = ()
 
     def __init__(self):
         if not self.name or not self.description:
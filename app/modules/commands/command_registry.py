@@ -1,11 +1,17 @@
 import logging
 import re
-from typing import Dict, Type, Optional
+from typing import Dict, Type, Optional, Tuple
 from .command import Command
+from ..database.sqlite_handler import SQLiteHandler
+from ..generators.generation_pipeline import RoomGenerationPipeline
 from .player_commands.look_command import LookCommand
+from .player_commands.say_command import SayCommand
+from .player_commands.yell_command import YellCommand
+from .player_commands.tell_command import TellCommand
 from .auth_commands.login import LoginCommand
 from .auth_commands.logout import LogoutCommand
 from .auth_commands.register import RegisterCommand
+from .auth_commands.resume import ResumeCommand
 from .help_command import HelpCommand
 from .accessibility_commands.highcontrast_command import HighContrastCommand
 from .accessibility_commands.fontsize_command import FontSizeCommand
@@ -18,63 +24,100 @@ logger = logging.getLogger(__name__)
 
 class CommandRegistry:
     _instance = None
-    _commands: Dict[str, Type[Command]] = {}
+    # Primary command name -> shared command instance
+    _commands: Dict[str, Command] = {}
+    # Every single word name and alias -> command instance
+    _dispatch: Dict[str, Command] = {}
+    # Two word aliases such as "speech rate": first word -> second word -> command
+    _phrases: Dict[str, Dict[str, Command]] = {}
     _loaded = False
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, db: Optional[SQLiteHandler] = None):
         if not self._loaded:
+            # Services shared by every command instance
+            self.db = db or SQLiteHandler()
+            self._services = {'db': self.db, 'registry': self, 'rooms': RoomGenerationPipeline()}
+            # Bumped whenever the set of commands changes
+            self.version = 0
             self._load_commands()
             self._loaded = True
 
     def _load_commands(self):
-        """Load and register all available commands"""
-        command_classes = {
-            'help': HelpCommand,
-            'login': LoginCommand,
-            'logout': LogoutCommand,
-            'register': RegisterCommand,
-            'look': LookCommand,
-            'highcontrast': HighContrastCommand,
-            'fontsize': FontSizeCommand,
-            'speech': SpeechCommand,
-            'speech-rate': SpeechRateCommand,
-            'speech-repeat': SpeechRepeatCommand,
-            'speech-stop': SpeechStopCommand
-        }
+        """Instantiate and register all available commands"""
+        command_classes = [
+            HelpCommand,
+            LoginCommand,
+            LogoutCommand,
+            RegisterCommand,
+            ResumeCommand,
+            LookCommand,
+            SayCommand,
+            YellCommand,
+            TellCommand,
+            HighContrastCommand,
+            FontSizeCommand,
+            SpeechCommand,
+            SpeechRateCommand,
+            SpeechRepeatCommand,
+            SpeechStopCommand,
+        ]
 
-        for cmd_name, cmd_class in command_classes.items():
+        for cmd_class in command_classes:
             try:
-                # Verify command class inheritance
-                if not issubclass(cmd_class, Command):
-                    raise ValueError(f"{cmd_class.__name__} is not a Command subclass")
-                
-                # Register command
-                self._commands[cmd_name] = cmd_class
-                logger.info(f"Registered command: {cmd_name}")
-                
+                self.register(cmd_class)
             except Exception as e:
-                logger.error(f"Error registering command {cmd_name}: {e}")
+                logger.error(f"Error registering command {cmd_class.__name__}: {e}")
 
         logger.info(f"Available commands: {', '.join(self._commands.keys())}")
 
+    def register(self, cmd_class: Type[Command]) -> Command:
+        """Create the shared instance of a command and add it to the dispatch table"""
+        # Verify command class inheritance
+        if not issubclass(cmd_class, Command):
+            raise ValueError(f"{cmd_class.__name__} is not a Command subclass")
+
+        command = cmd_class(**{name: self._services[name] for name in cmd_class.services})
+        self._commands[command.name] = command
+        for key in (command.name, *command.aliases):
+            words = key.lower().split()
+            if len(words) == 1:
+                self._dispatch[words[0]] = command
+            elif len(words) == 2:
+                self._phrases.setdefault(words[0], {})[words[1]] = command
+            else:
+                raise ValueError(f"Alias '{key}' of {cmd_class.__name__} has more than two words")
+        self.version += 1
+        logger.info(f"Registered command: {command.name}")
+        return command
+
     def sanitize_command(self, text: str) -> str:
         return re.sub(r'[^a-zA-Z0-9]', '', text).lower()
 
     def is_valid_command(self, command: str) -> bool:
-        return command.lower() in self._commands
+        return command.lower() in self._dispatch
 
-    def get_command(self, name: str) -> Optional[Type[Command]]:
-        """Get command class by name"""
-        command = self._commands.get(name.lower())
+    def get_command(self, name: str) -> Optional[Command]:
+        """Get command instance by name or alias"""
+        command = self._dispatch.get(name.lower())
         if not command:
-            logger.warning(f"Command not found: {name}")
+            logger.warning("Command not found: %s", name)
         return command
 
+    def resolve(self, name: str, args: str) -> Tuple[Optional[Command], str]:
+        """Look up a parsed command, honouring two word aliases like 'speech rate'"""
+        phrases = self._phrases.get(name)
+        if phrases and args:
+            parts = args.split(maxsplit=1)
+            command = phrases.get(parts[0].lower())
+            if command:
+                return command, parts[1] if len(parts) > 1 else ""
+        return self.get_command(name), args
+
     @property
-    def commands(self) -> Dict[str, Type[Command]]:
-        return self._commands.copy()
\ No newline at end of file
+    def commands(self) -> Dict[str, Command]:
+        return self._commands.copy()
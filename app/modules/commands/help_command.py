@@ -1,60 +1,88 @@
+from typing import Dict, FrozenSet, Tuple
 from .command import Command
 from ..network.websocket_message import WebSocketMessage
 from ..network.session_manager import SessionManager
+from ..roles import Role
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Help audience: login state plus the session's roles
+Audience = Tuple[bool, FrozenSet[Role]]
+ANONYMOUS_AUDIENCE: Audience = (False, frozenset({Role.ANONYMOUS}))
+
 class HelpCommand(Command):
     name = "help"
     description = "Get help about available commands"
+    usage = "help [command]"
     requires_login = False
+    services = ('registry',)
 
-    GENERAL_COMMANDS = {
-        'help': 'Usage: help [command]\nGet help about commands\n',
-        'login': 'Usage: login <username> <password>\nLogin to your account\n',
-        'register': 'Usage: register <username> <password>\nCreate a new account\n',
-        'highcontrast': 'Usage: highcontrast <on|off>\nToggle high contrast theme\n',
-        'fontsize': 'Usage: fontsize <number>\nChange the game text font size\n',
-    }
-
-    PLAYER_COMMANDS = {
-        'logout': 'Usage: logout\nLog out of your account\n',
-        'look': 'Usage: look\nLook around your current location\n',
-        'speech': 'Usage: speech <on|off>\nToggle text-to-speech output\n',
-        'speech-rate': 'Usage: speech-rate <0.1-10>\nChange text-to-speech playback rate\n',
-        'speech-repeat': 'Usage: speech-repeat\nRepeat all visible game text using text-to-speech\n',
-        'speech-stop': 'Usage: speech-stop\nStop any ongoing text-to-speech\n'
-    }
+    def __init__(self, registry):
+        super().__init__()
+        self.registry = registry
+        # Rendered help per audience, rebuilt only when the registry changes
+        self._version = None
+        self._listings: Dict[Audience, WebSocketMessage] = {}
+        self._entries: Dict[Audience, Dict[str, WebSocketMessage]] = {}
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
-        command = args.strip().lower()
-        is_logged_in = session_manager.is_logged_in(client_id)
-        
-        # Combine available commands based on login status
-        available_commands = self.GENERAL_COMMANDS.copy()
-        if is_logged_in:
-            available_commands.update(self.PLAYER_COMMANDS)
+        listing, entries = self._rendered(self._audience(client_id, session_manager))
 
         # Show specific command help if provided
+        command = args.strip().lower()
         if command:
-            if command in available_commands:
-                help_text = f"Command: {command}\n{available_commands[command]}"
-                return WebSocketMessage(
-                    type="help",
-                    message=help_text
-                )
+            entry = entries.get(command)
+            if entry:
+                return entry
             return WebSocketMessage(
                 type="error",
                 message=f"Unknown command: {command}"
             )
+        return listing
+
+    def _audience(self, client_id: str, session_manager: SessionManager) -> Audience:
+        session = session_manager.get_session(client_id)
+        if not session:
+            return ANONYMOUS_AUDIENCE
+        return session['logged_in'], frozenset(session['roles'])
+
+    def _rendered(self, audience: Audience) -> Tuple[WebSocketMessage, Dict[str, WebSocketMessage]]:
+        if self._version != self.registry.version:
+            self._listings.clear()
+            self._entries.clear()
+            self._version = self.registry.version
+
+        listing = self._listings.get(audience)
+        if listing is None:
+            listing, entries = self._render(audience)
+            self._listings[audience] = listing
+            self._entries[audience] = entries
+            logger.debug(f"Rendered help for audience {audience}")
+        return listing, self._entries[audience]
+
+    def _render(self, audience: Audience) -> Tuple[WebSocketMessage, Dict[str, WebSocketMessage]]:
+        logged_in, roles = audience
+        visible = [
+            command for command in self.registry.commands.values()
+            if (logged_in or not command.requires_login)
+            and (command.required_role is None or command.required_role in roles)
+        ]
 
         # List all available commands with descriptions
-        commands_list = "Available Commands:\n\n"
-        for cmd, desc in sorted(available_commands.items()):
-            commands_list += f"{cmd}: {desc}\n"
-        
-        return WebSocketMessage(
+        sections = []
+        entries = {}
+        for command in sorted(visible, key=lambda c: c.name):
+            text = f"Usage: {command.usage or command.name}\n{command.description}\n"
+            if command.aliases:
+                text += f"Aliases: {', '.join(command.aliases)}\n"
+            sections.append(f"{command.name}: {text}")
+            entry = WebSocketMessage.constant(type="help", message=f"Command: {command.name}\n{text}")
+            for key in (command.name, *command.aliases):
+                entries[key.lower()] = entry
+
+        listing = WebSocketMessage.constant(
             type="help",
-            message=commands_list
-        )
\ No newline at end of file
+            message="Available Commands:\n\n" + "\n".join(sections)
+        )
+        return listing, entries
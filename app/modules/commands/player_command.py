@@ -2,9 +2,11 @@ from abc import abstractmethod
 from .command import Command
 from ..network.websocket_message import WebSocketMessage
 from ..network.session_manager import SessionManager
+from ..roles import Role
 
 class PlayerCommand(Command):
     requires_login = True
+    required_role = Role.PLAYER
 
     async def execute(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
         """Execute method matches base class signature"""
@@ -1,16 +1,43 @@
+import logging
+
 from ..player_command import PlayerCommand
 from ...roles import Role
 from ...network.websocket_message import WebSocketMessage
 from ...network.session_manager import SessionManager
+from ...generators.generation_pipeline import RoomGenerationPipeline
 from ...decorators import required_roles
 
+logger = logging.getLogger(__name__)
+
 class LookCommand(PlayerCommand):
     name = "look"
     description = "Look around your current location"
+    usage = "look"
+    aliases = ("l",)
+    services = ('rooms',)
+
+    def __init__(self, rooms: RoomGenerationPipeline):
+        super().__init__()
+        self.rooms = rooms
 
     @required_roles([Role.PLAYER])
     async def handle(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        message = 'You look around...'
+        location = session_manager.get_location(client_id)
+        if location:
+            try:
+                room = await self.rooms.get_room(location)
+                message += f"\n{room.get_description()}"
+                exits = room.to_dict()['exits']
+                if exits:
+                    message += f"\nExits: {', '.join(exits)}"
+            except Exception as e:
+                # The room can still be looked at without its description
+                logger.error(f"Could not load room {location}: {e}")
+            players = await session_manager.get_players_in_room(location, exclude=client_id)
+            if players:
+                message += f"\nOther players here: {', '.join(sorted(players))}"
         return WebSocketMessage(
             type='look',
-            message='You look around...'
-        )
\ No newline at end of file
+            message=message
+        )
@@ -0,0 +1,36 @@
+from ..player_command import PlayerCommand
+from ...roles import Role
+from ...network.websocket_message import WebSocketMessage
+from ...network.session_manager import SessionManager
+from ...network.broadcaster import Broadcaster
+from ...network.cluster import Cluster
+from ...decorators import required_roles
+
+class SayCommand(PlayerCommand):
+    name = "say"
+    description = "Say something to everyone in your room"
+    usage = "say <message>"
+
+    @required_roles([Role.PLAYER])
+    async def handle(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        text = args.strip()
+        if not text:
+            return WebSocketMessage(
+                type='error',
+                message='Usage: say <message>'
+            )
+
+        sender = session_manager.get_username(client_id)
+        location = session_manager.get_location(client_id)
+        message = WebSocketMessage(
+            type='chat',
+            message=f'{sender} says: {text}',
+            data={'chat_type': 'say', 'sender': sender, 'location': location}
+        )
+        Broadcaster().send_many(session_manager.occupancy.in_room(location), message, exclude=client_id)
+        Cluster().publish_room(location, message)
+        return WebSocketMessage(
+            type='chat',
+            message=f'You say: {text}',
+            data={'chat_type': 'say', 'sender': sender, 'location': location}
+        )
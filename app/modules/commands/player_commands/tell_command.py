@@ -0,0 +1,62 @@
+from ..player_command import PlayerCommand
+from ...roles import Role
+from ...network.websocket_message import WebSocketMessage
+from ...network.session_manager import SessionManager
+from ...network.broadcaster import Broadcaster
+from ...network.cluster import Cluster
+from ...decorators import required_roles
+
+class TellCommand(PlayerCommand):
+    name = "tell"
+    description = "Send a private message to another player"
+    usage = "tell <player_name> <message>"
+
+    @required_roles([Role.PLAYER])
+    async def handle(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        parts = args.split(maxsplit=1)
+        if len(parts) < 2:
+            return WebSocketMessage(
+                type='error',
+                message='Usage: tell <player_name> <message>'
+            )
+
+        target_name, text = parts
+        sender = session_manager.get_username(client_id)
+        target_id = session_manager.get_client_id_by_username(target_name)
+        if target_id is None:
+            # The player may be connected to another worker process
+            remote = await session_manager.find_remote_player(target_name)
+            if remote is None:
+                return WebSocketMessage(
+                    type='error',
+                    message=f'Player {target_name} not found or not online.'
+                )
+            target = remote['username']
+            delivered = Cluster().send_to_user(target, remote['worker'], self._message(sender, target, text))
+        elif target_id == client_id:
+            return WebSocketMessage(
+                type='error',
+                message=f'Player {target_name} not found or not online.'
+            )
+        else:
+            target = session_manager.get_username(target_id)
+            delivered = Broadcaster().send(target_id, self._message(sender, target, text))
+
+        if not delivered:
+            return WebSocketMessage(
+                type='error',
+                message=f'Could not deliver your message to {target}.'
+            )
+        return WebSocketMessage(
+            type='chat',
+            message=f'You tell {target}: {text}',
+            data={'chat_type': 'tell', 'sender': sender, 'target': target}
+        )
+
+    @staticmethod
+    def _message(sender: str, target: str, text: str) -> WebSocketMessage:
+        return WebSocketMessage(
+            type='chat',
+            message=f'{sender} tells you: {text}',
+            data={'chat_type': 'tell', 'sender': sender, 'target': target}
+        )
@@ -0,0 +1,36 @@
+from ..player_command import PlayerCommand
+from ...roles import Role
+from ...network.websocket_message import WebSocketMessage
+from ...network.session_manager import SessionManager
+from ...network.broadcaster import Broadcaster
+from ...network.cluster import Cluster
+from ...decorators import required_roles
+
+class YellCommand(PlayerCommand):
+    name = "yell"
+    description = "Yell something to every player in the world"
+    usage = "yell <message>"
+
+    @required_roles([Role.PLAYER])
+    async def handle(self, args: str, client_id: str, session_manager: SessionManager) -> WebSocketMessage:
+        text = args.strip()
+        if not text:
+            return WebSocketMessage(
+                type='error',
+                message='Usage: yell <message>'
+            )
+
+        sender = session_manager.get_username(client_id)
+        message = WebSocketMessage(
+            type='chat',
+            message=f'{sender} yells: {text}',
+            data={'chat_type': 'yell', 'sender': sender}
+        )
+        # Only logged in players; anonymous sockets haven't joined the world yet
+        Broadcaster().send_many(session_manager.logged_in_client_ids(), message, exclude=client_id)
+        Cluster().publish_all(message)
+        return WebSocketMessage(
+            type='chat',
+            message=f'You yell: {text}',
+            data={'chat_type': 'yell', 'sender': sender}
+        )
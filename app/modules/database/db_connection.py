@@ -1,25 +1,189 @@
+import asyncio
 import aiosqlite
 from pathlib import Path
 import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from ...config.settings import Settings
+from ..metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
+
+DB_ACQUIRE_WAIT = MetricsRegistry().histogram(
+    'wordcraft_db_acquire_wait_seconds',
+    'Time spent waiting for a pooled database connection',
+    labelnames=('role',)
+)
+DB_CALL_DURATION = MetricsRegistry().histogram(
+    'wordcraft_db_call_duration_seconds',
+    'Time a pooled database connection was held',
+    labelnames=('role',)
+)
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection became available within the acquire timeout"""
+
+
 class DatabaseConnection:
-    def __init__(self, db_path: str = "game.db"):
+    """Long-lived SQLite connection pool.
+
+    A single writer connection is serialized behind a lock (SQLite only allows
+    one writer at a time anyway) while a fixed set of reader connections serve
+    concurrent SELECTs through WAL. Connections are opened lazily on first use
+    and the pragmas are applied once per connection.
+    """
+
+    def __init__(self, db_path: str = Settings.DB_PATH,
+                 pool_size: int = Settings.DB_POOL_SIZE,
+                 acquire_timeout: float = Settings.DB_ACQUIRE_TIMEOUT):
         self.db_path = Path(db_path)
-        self._connection = None
+        self.pool_size = max(1, pool_size)
+        self.acquire_timeout = acquire_timeout
 
-    @asynccontextmanager
-    async def connect(self):
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._open_lock = asyncio.Lock()
+        self._opened = False
+
+        # Pool statistics
+        self._in_use = 0
+        self._waiters = 0
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        registry = MetricsRegistry()
+        registry.gauge('wordcraft_db_connections_in_use', 'Pooled database connections in use',
+                       func=lambda: self._in_use)
+        registry.gauge('wordcraft_db_waiters', 'Tasks waiting for a pooled database connection',
+                       func=lambda: self._waiters)
+
+    async def _open_connection(self, readonly: bool = False) -> aiosqlite.Connection:
         conn = await aiosqlite.connect(self.db_path)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA mmap_size={int(Settings.DB_MMAP_SIZE)}")
+        await conn.execute(f"PRAGMA cache_size={int(Settings.DB_CACHE_SIZE)}")
+        await conn.execute("PRAGMA foreign_keys=ON")
+        if readonly:
+            await conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    async def open(self):
+        """Open the writer and reader connections if not already open"""
+        if self._opened:
+            return
+        async with self._open_lock:
+            if self._opened:
+                return
+            # The writer is opened first so WAL mode is set before readers attach
+            self._writer = await self._open_connection()
+            for _ in range(self.pool_size):
+                reader = await self._open_connection(readonly=True)
+                self._readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+            self._opened = True
+            logger.info(
+                f"Database pool opened for {self.db_path} "
+                f"(1 writer, {self.pool_size} readers)"
+            )
+
+    def _record_wait(self, started: float, role: str):
+        waited = time.perf_counter() - started
+        DB_ACQUIRE_WAIT.labels(role).observe(waited)
+        self._acquisitions += 1
+        self._total_wait += waited
+        if waited > self._max_wait:
+            self._max_wait = waited
+
+    @asynccontextmanager
+    async def writer(self):
+        """Acquire the single serialized writer connection"""
+        await self.open()
+        started = time.perf_counter()
+        self._waiters += 1
+        try:
+            await asyncio.wait_for(self._writer_lock.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeoutError("Timed out waiting for the database writer")
+        finally:
+            self._waiters -= 1
+        self._record_wait(started, 'writer')
+        self._in_use += 1
+        acquired = time.perf_counter()
+        try:
+            yield self._writer
+        except BaseException:
+            # Don't hand a half finished transaction to the next writer user
+            try:
+                await self._writer.rollback()
+            except Exception as e:
+                logger.error(f"Rolling back the database writer failed: {e}")
+            raise
+        finally:
+            self._in_use -= 1
+            self._writer_lock.release()
+            DB_CALL_DURATION.labels('writer').observe(time.perf_counter() - acquired)
+
+    @asynccontextmanager
+    async def reader(self):
+        """Acquire one of the pooled read-only connections"""
+        await self.open()
+        started = time.perf_counter()
+        self._waiters += 1
+        try:
+            conn = await asyncio.wait_for(self._idle_readers.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeoutError("Timed out waiting for a database reader")
+        finally:
+            self._waiters -= 1
+        self._record_wait(started, 'reader')
+        self._in_use += 1
+        acquired = time.perf_counter()
         try:
-            self._connection = conn
             yield conn
         finally:
-            await conn.close()
+            self._in_use -= 1
+            self._idle_readers.put_nowait(conn)
+            DB_CALL_DURATION.labels('reader').observe(time.perf_counter() - acquired)
+
+    def connect(self):
+        """Backwards compatible alias for the writer connection"""
+        return self.writer()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool usage statistics"""
+        return {
+            'readers': len(self._readers),
+            'idle_readers': self._idle_readers.qsize(),
+            'in_use': self._in_use,
+            'waiters': self._waiters,
+            'acquisitions': self._acquisitions,
+            'timeouts': self._timeouts,
+            'total_wait_seconds': self._total_wait,
+            'avg_wait_seconds': self._total_wait / self._acquisitions if self._acquisitions else 0.0,
+            'max_wait_seconds': self._max_wait,
+        }
 
     async def close(self):
-        if self._connection:
-            await self._connection.close()
-            self._connection = None
\ No newline at end of file
+        async with self._open_lock:
+            if not self._opened:
+                return
+            for reader in self._readers:
+                await reader.close()
+            self._readers.clear()
+            self._idle_readers = asyncio.Queue()
+            if self._writer:
+                await self._writer.close()
+                self._writer = None
+            self._opened = False
+            logger.info(f"Database pool closed for {self.db_path}")
@@ -0,0 +1,99 @@
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).with_name('migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_\w+\.sql$')
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Tuple[int, str, str]]:
+    """(version, name, sql) for every numbered migration file, in version order"""
+    migrations = []
+    for path in directory.iterdir():
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), path.name, path.read_text()))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise RuntimeError(f"Migrations in {directory} are not numbered 1..N: {versions}")
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script into complete statements, so they can run inside one transaction.
+
+    executescript() commits before it starts, which would break the single
+    transaction; sqlite3.complete_statement knows about trigger bodies and
+    string literals, so splitting on it is safe where splitting on ';' is not.
+    """
+    statements, buffer = [], ''
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if statement.strip(';').strip():
+                statements.append(statement)
+            buffer = ''
+    leftover = [line for line in buffer.splitlines() if line.strip() and not line.strip().startswith('--')]
+    if leftover:
+        raise ValueError(f"Incomplete SQL statement: {leftover[0][:80]}")
+    return statements
+
+
+class MigrationRunner:
+    """Applies numbered schema migrations tracked by PRAGMA user_version.
+
+    On an up-to-date database startup costs a single PRAGMA read. Pending
+    migrations are applied together in one write transaction, with the version
+    re-checked once the write lock is held so several workers starting against
+    the same file apply each migration exactly once.
+    """
+
+    def __init__(self, directory: Path = MIGRATIONS_DIR):
+        self.migrations = load_migrations(directory)
+
+    @property
+    def latest(self) -> int:
+        return self.migrations[-1][0] if self.migrations else 0
+
+    @staticmethod
+    async def current_version(conn: aiosqlite.Connection) -> int:
+        async with conn.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        return row[0]
+
+    async def migrate(self, conn: aiosqlite.Connection) -> int:
+        """Bring the schema up to date, returning the number of migrations applied"""
+        version = await self.current_version(conn)
+        if version == self.latest:
+            return 0
+        if version > self.latest:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this server ({self.latest})"
+            )
+
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = await self.current_version(conn)
+            pending = [m for m in self.migrations if m[0] > version]
+            for _, name, sql in pending:
+                logger.info(f"Applying migration {name}")
+                for statement in split_statements(sql):
+                    await conn.execute(statement)
+            if pending:
+                # PRAGMA does not take parameters; the value is an int we produced
+                await conn.execute(f"PRAGMA user_version = {self.latest:d}")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        if pending:
+            logger.info(f"Database schema migrated from version {version} to {self.latest}")
+        return len(pending)
@@ -0,0 +1,9 @@
+-- rooms.coordinates is the primary key and players.username is UNIQUE COLLATE
+-- NOCASE, so both already have an index; these duplicates only slowed writes.
+DROP INDEX IF EXISTS idx_room_coordinates;
+DROP INDEX IF EXISTS idx_player_name;
+
+-- With foreign_keys=ON, deleting or re-keying a player or role looks up the
+-- referencing rows, which is a full table scan without an index on the child.
+CREATE INDEX IF NOT EXISTS idx_players_role_id ON players(role_id);
+CREATE INDEX IF NOT EXISTS idx_banned_players_banned_by ON banned_players(banned_by);
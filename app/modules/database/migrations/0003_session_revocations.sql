@@ -0,0 +1,4 @@
+-- Time of the player's last logout. Resume tokens issued before it are
+-- rejected; kept with the player so revocations survive restarts and are
+-- seen by every worker process sharing the database.
+ALTER TABLE players ADD COLUMN sessions_revoked_at REAL;
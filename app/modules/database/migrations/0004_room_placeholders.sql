@@ -0,0 +1,5 @@
+-- Rooms built by the procedural generator because the LLM was unavailable
+-- or kept replying with invalid rooms. They are generated again on a later
+-- visit once the LLM is back, and a placeholder only ever gives way to a
+-- generated room, never the other way round.
+ALTER TABLE rooms ADD COLUMN placeholder INTEGER NOT NULL DEFAULT 0;
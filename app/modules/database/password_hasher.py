@@ -1,11 +1,162 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
 import bcrypt
 
+from ...config.settings import Settings
+from ..metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+HASH_QUEUE_TIME = MetricsRegistry().histogram(
+    'wordcraft_password_hash_queue_seconds',
+    'Time password hashing jobs waited for a worker'
+)
+HASH_DURATION = MetricsRegistry().histogram(
+    'wordcraft_password_hash_seconds',
+    'Time spent hashing or verifying a password',
+    labelnames=('operation',)
+)
+HASH_REJECTED = MetricsRegistry().counter(
+    'wordcraft_password_hash_rejected_total',
+    'Password hashing requests rejected because the queue was full'
+)
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full and the request was rejected"""
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    # Module level so it can be pickled for a process pool
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check_password(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _timed_call(func, args):
+    started = time.perf_counter()
+    result = func(*args)
+    return started, result, time.perf_counter() - started
+
+
 class PasswordHasher:
-    @staticmethod
-    def hash_password(password: str) -> bytes:
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode(), salt)
-
-    @staticmethod
-    def verify_password(password: str, hashed: bytes) -> bool:
-        return bcrypt.checkpw(password.encode(), hashed)
\ No newline at end of file
+    """Async entry point for bcrypt hashing and verification.
+
+    bcrypt is deliberately slow, so every call runs in a worker pool instead of
+    on the event loop. The number of queued plus running jobs is bounded; once
+    the bound is reached new requests fail fast with HasherBusyError.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, workers: int = Settings.HASH_WORKERS,
+                 max_queue: int = Settings.HASH_MAX_QUEUE,
+                 executor_type: str = Settings.HASH_EXECUTOR,
+                 rounds: int = Settings.HASH_ROUNDS):
+        if hasattr(self, 'initialized'):
+            return
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.executor_type = executor_type
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_queue_time = 0.0
+        self._total_hash_time = 0.0
+        self._last_hash_time = 0.0
+        MetricsRegistry().gauge(
+            'wordcraft_password_hash_queue_depth',
+            'Password hashing jobs waiting for a worker',
+            func=lambda: self.queue_depth
+        )
+        self.initialized = True
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='bcrypt'
+                )
+            logger.info(f"Password hasher using {self.executor_type} pool with {self.workers} workers")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker"""
+        return max(0, self._pending - self.workers)
+
+    async def _submit(self, operation: str, func, *args):
+        # Capacity covers the jobs being worked on plus the bounded backlog
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            HASH_REJECTED.inc()
+            raise HasherBusyError("Password hashing queue is full")
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            if self.executor_type == 'process':
+                # Worker processes can't share our clock reference cheaply, so
+                # the whole round trip is counted as hash time
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), func, *args
+                )
+                started, elapsed = submitted, time.perf_counter() - submitted
+            else:
+                started, result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), _timed_call, func, args
+                )
+        finally:
+            self._pending -= 1
+
+        queued = max(0.0, started - submitted)
+        HASH_QUEUE_TIME.observe(queued)
+        HASH_DURATION.labels(operation).observe(elapsed)
+        self._completed += 1
+        self._total_queue_time += queued
+        self._total_hash_time += elapsed
+        self._last_hash_time = elapsed
+        return result
+
+    async def hash_password(self, password: str) -> bytes:
+        return await self._submit('hash', _hash_password, password.encode(), self.rounds)
+
+    async def verify_password(self, password: str, hashed: bytes) -> bool:
+        if isinstance(hashed, str):
+            hashed = hashed.encode()
+        return await self._submit('verify', _check_password, password.encode(), hashed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and hashing latency statistics"""
+        return {
+            'workers': self.workers,
+            'pending': self._pending,
+            'queue_depth': self.queue_depth,
+            'rejected': self._rejected,
+            'completed': self._completed,
+            'avg_queue_seconds': self._total_queue_time / self._completed if self._completed else 0.0,
+            'avg_hash_seconds': self._total_hash_time / self._completed if self._completed else 0.0,
+            'last_hash_seconds': self._last_hash_time,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
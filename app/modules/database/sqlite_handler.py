@@ -1,26 +1,25 @@
 import logging
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from starlette.websockets import WebSocket
 
 from .db_connection import DatabaseConnection
+from .migration_runner import MigrationRunner
 from .user_repository import UserRepository
+from ...config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
 class SQLiteHandler:
-    def __init__(self, db_path: str = "game.db"):
+    def __init__(self, db_path: str = Settings.DB_PATH):
         self.db = DatabaseConnection(db_path)
         self.users = UserRepository(self.db)
 
     async def init_db(self):
         try:
-            async with self.db.connect() as conn:
-                with open('app/schema.sql', 'r') as f:
-                    schema_sql = f.read()
-                await conn.executescript(schema_sql)
-                await conn.commit()
-            logger.info("Database initialized with schema")
+            async with self.db.writer() as conn:
+                applied = await MigrationRunner().migrate(conn)
+            logger.info(f"Database schema ready ({applied} migrations applied)")
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
@@ -31,5 +30,17 @@ class SQLiteHandler:
     async def verify_login(self, username: str, password: str) -> Tuple[bool, str]:
         return await self.users.verify_user(username, password)
 
+    async def get_player_location(self, username: str) -> Optional[str]:
+        return await self.users.get_location(username)
+
+    async def revoke_sessions(self, username: str, revoked_at: float) -> None:
+        await self.users.revoke_sessions(username, revoked_at)
+
+    async def get_sessions_revoked_at(self, username: str) -> Optional[float]:
+        return await self.users.get_sessions_revoked_at(username)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.db.stats()
+
     async def close(self):
         await self.db.close()
\ No newline at end of file
@@ -1,26 +1,28 @@
-import bcrypt
 import logging
 import re
-from typing import Tuple
-from .db_connection import DatabaseConnection
+from typing import Optional, Tuple
+from .db_connection import DatabaseConnection, PoolTimeoutError
+from .password_hasher import HasherBusyError, PasswordHasher
 from ..generators.room import Room
 from ..generators.room_generator import RoomGenerator
 
 logger = logging.getLogger(__name__)
 
+SERVER_BUSY_MESSAGE = "Server busy, please retry in a moment"
+
 class UserRepository:
     def __init__(self, db: DatabaseConnection):
         self.db = db
+        self.hasher = PasswordHasher()
         self.room_generator = RoomGenerator()
 
     async def create_user(self, username: str, password: str) -> Tuple[bool, str]:
         if not self._validate_username(username):
             return False, "Invalid username format"
         try:
-            # Hash password and store as bytes
-            salt = bcrypt.gensalt()
-            hashed = bcrypt.hashpw(password.encode(), salt)
-            async with self.db.connect() as conn:
+            # Hash password off the event loop and store as bytes
+            hashed = await self.hasher.hash_password(password)
+            async with self.db.writer() as conn:
                 await conn.execute(
                     "INSERT INTO players (username, password_hash) VALUES (?, ?)",
                     (username, hashed)
@@ -28,6 +30,9 @@ class UserRepository:
                 await conn.commit()
                 self.log_starting_room()
                 return True, "User created successfully"
+        except (HasherBusyError, PoolTimeoutError) as e:
+            logger.warning("Rejected registration for %s: %s", username, e)
+            return False, SERVER_BUSY_MESSAGE
         except Exception as e:
             logger.error(f"Error creating user: {e}")
             return False, "Username already exists"
@@ -38,7 +43,7 @@ class UserRepository:
 
     async def verify_user(self, username: str, password: str) -> Tuple[bool, str]:
         try:
-            async with self.db.connect() as conn:
+            async with self.db.reader() as conn:
                 cursor = await conn.execute(
                     "SELECT password_hash FROM players WHERE username = ?",
                     (username,)
@@ -49,13 +54,49 @@ class UserRepository:
                 return False, "Invalid username or password"
 
             stored_hash = row[0]
-            if bcrypt.checkpw(password.encode(), stored_hash):
+            if await self.hasher.verify_password(password, stored_hash):
                 return True, "Login successful"
             return False, "Invalid username or password"
-            
+
+        except (HasherBusyError, PoolTimeoutError) as e:
+            logger.warning("Rejected login for %s: %s", username, e)
+            return False, SERVER_BUSY_MESSAGE
         except Exception as e:
             logger.error(f"Error verifying user: {e}")
             return False, "Authentication failed"
 
+    async def get_location(self, username: str) -> Optional[str]:
+        try:
+            async with self.db.reader() as conn:
+                cursor = await conn.execute(
+                    "SELECT location FROM players WHERE username = ?",
+                    (username,)
+                )
+                row = await cursor.fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error loading location for {username}: {e}")
+            return None
+
+    async def revoke_sessions(self, username: str, revoked_at: float) -> None:
+        async with self.db.writer() as conn:
+            await conn.execute(
+                "UPDATE players SET sessions_revoked_at = ? WHERE username = ?",
+                (revoked_at, username)
+            )
+            await conn.commit()
+
+    async def get_sessions_revoked_at(self, username: str) -> Optional[float]:
+        """Time of the player's last logout, 0 if never, None if there is no such player"""
+        async with self.db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT sessions_revoked_at FROM players WHERE username = ?",
+                (username,)
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return row[0] or 0.0
+
     def _validate_username(self, username: str) -> bool:
-        return bool(re.match(r'^[a-zA-Z0-9_]{3,20}$', username))
\ No newline at end of file
+        return bool(re.match(r'^[a-zA-Z0-9_]{3,20}$', username))
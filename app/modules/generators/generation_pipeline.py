@@ -0,0 +1,301 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from .room import Room
+from .room_generator import RoomGenerationError, RoomGenerator
+from ..metrics import MetricsRegistry
+from ..world.occupancy import format_coordinates, parse_coordinates
+from ..world.room_store import RoomStore
+from ..world.zones import ZoneMap
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Queue priorities, lower runs first
+PLAYER = 0
+PREFETCH = 1
+PRIORITY_LABELS = {PLAYER: 'player', PREFETCH: 'prefetch'}
+
+GENERATIONS = MetricsRegistry().counter(
+    'wordcraft_room_generations_total',
+    'Rooms generated by priority and result',
+    labelnames=('priority', 'result')
+)
+GENERATION_DURATION = MetricsRegistry().histogram(
+    'wordcraft_room_generation_seconds',
+    'Time from queueing a room generation to the room being stored',
+    labelnames=('priority',)
+)
+GENERATION_COALESCED = MetricsRegistry().counter(
+    'wordcraft_room_generation_coalesced_total',
+    'Room requests that joined a generation already in flight'
+)
+GENERATION_BATCH_SIZE = MetricsRegistry().histogram(
+    'wordcraft_room_generation_batch_size',
+    'Rooms generated together by one completion request',
+    buckets=(1, 2, 4, 8, 16, 32)
+)
+PREFETCH_SKIPPED = MetricsRegistry().counter(
+    'wordcraft_room_prefetch_skipped_total',
+    'Neighbour prefetches not started because the prefetch budget was used up'
+)
+
+
+class _Job:
+    __slots__ = ('key', 'previous', 'priority', 'future', 'queued_at', 'started')
+
+    def __init__(self, key: str, previous: Optional[str], priority: int, future: asyncio.Future):
+        self.key = key
+        self.previous = previous
+        self.priority = priority
+        self.future = future
+        self.queued_at = time.perf_counter()
+        self.started = False
+
+
+class RoomGenerationPipeline:
+    """Generates missing rooms in batches, with one in-flight job per room.
+
+    Every request for a room that is not stored yet joins the single in-flight
+    job for those coordinates, so players stepping into the same unexplored
+    room at once cost one LLM call. After a room is shown, the rooms behind its
+    exits are queued as speculative prefetches. Placeholder rooms, built by
+    the procedural fallback while the LLM was unavailable, are generated again
+    when a player visits them once the LLM is back.
+
+    A dispatcher takes jobs off a priority queue and starts at most ``workers``
+    completion requests at a time. Each request carries up to ``batch_size``
+    rooms of the same priority that were queued within ``batch_window``.
+    Player requests always run before queued prefetches (a queued prefetch a
+    player starts waiting for is promoted), and at most ``prefetch_budget``
+    prefetches are queued or running at any time so they can never occupy
+    every worker.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, store: Optional[RoomStore] = None, generator: Optional[RoomGenerator] = None,
+                 workers: int = Settings.GENERATION_WORKERS,
+                 prefetch_budget: int = Settings.PREFETCH_BUDGET,
+                 batch_size: int = Settings.GENERATION_BATCH_SIZE,
+                 batch_window: float = Settings.GENERATION_BATCH_WINDOW):
+        if hasattr(self, 'initialized'):
+            return
+        self.store = store or RoomStore()
+        self.generator = generator or RoomGenerator()
+        self.workers = max(1, workers)
+        self.prefetch_budget = max(0, prefetch_budget)
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        # Neighbours in zones owned by other workers are theirs to generate
+        self.zones = ZoneMap.from_settings()
+
+        self._jobs: Dict[str, _Job] = {}
+        self._queue: "asyncio.PriorityQueue" = asyncio.PriorityQueue()
+        self._order = itertools.count()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: List[asyncio.Task] = []
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        self._prefetching = 0
+
+        registry = MetricsRegistry()
+        registry.gauge('wordcraft_room_generations_in_flight', 'Room generations queued or running',
+                       func=lambda: len(self._jobs))
+        self.initialized = True
+
+    async def start(self):
+        await self.generator.start()
+        self._dispatcher = asyncio.create_task(self._dispatch(), name="room-generation-dispatcher")
+
+    async def stop(self):
+        tasks = [task for task in (self._dispatcher, *self._tasks, *self._prefetch_tasks) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+        for job in list(self._jobs.values()):
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+        self._prefetching = 0
+        await self.generator.close()
+
+    async def get_room(self, coordinates) -> Room:
+        """The room at coordinates, generating it if needed, then prefetch its neighbours"""
+        key = format_coordinates(parse_coordinates(coordinates))
+        room = await self.store.get(key)
+        if room is None:
+            room = await self.request(key, PLAYER)
+        elif room.is_placeholder() and self.generator.available():
+            # Built while the LLM was unavailable; generate the real room now it is back
+            try:
+                room = await self.request(key, PLAYER)
+            except Exception as e:
+                logger.warning(f"Replacing placeholder room {key} failed: {e}")
+        if self.prefetch_budget:
+            task = asyncio.create_task(self._prefetch_neighbours(room))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+        return room
+
+    def request(self, key: str, priority: int = PLAYER, previous: Optional[str] = None) -> "asyncio.Future[Room]":
+        """Join or start the generation of the room at key"""
+        job = self._jobs.get(key)
+        if job is not None:
+            GENERATION_COALESCED.inc()
+            if priority < job.priority and not job.started:
+                # Re-queue at the higher priority; the old entry is skipped when popped
+                if job.priority == PREFETCH:
+                    self._prefetching -= 1
+                job.priority = priority
+                self._queue.put_nowait((priority, next(self._order), job))
+            return asyncio.shield(job.future)
+
+        job = _Job(key, previous, priority, asyncio.get_running_loop().create_future())
+        self._jobs[key] = job
+        if priority == PREFETCH:
+            self._prefetching += 1
+        self._queue.put_nowait((priority, next(self._order), job))
+        return asyncio.shield(job.future)
+
+    async def _prefetch_neighbours(self, room: Room):
+        origin = room.get_coordinates()
+        for target in set(room.to_dict()['exits'].values()):
+            if not isinstance(target, str) or target in self._jobs:
+                continue
+            if self.zones and not self.zones.owns(target):
+                continue
+            try:
+                # Also warms the cache with neighbours that already exist
+                if await self.store.get(target) is not None:
+                    continue
+            except Exception as e:
+                logger.warning(f"Prefetch lookup of {target} failed: {e}")
+                continue
+            if target in self._jobs:
+                continue
+            if self._prefetching >= self.prefetch_budget:
+                PREFETCH_SKIPPED.inc()
+                continue
+            self.request(target, PREFETCH, previous=origin)
+
+    async def _dispatch(self):
+        while True:
+            # A job is only taken once a worker is free, so it stays promotable
+            # and batchable for as long as it is queued
+            await self._slots.acquire()
+            job = await self._next_job()
+            batch = [job]
+            if self.batch_size > 1 and self.batch_window and self._queue.qsize() < self.batch_size - 1:
+                # Let requests arriving right behind this one join the same completion
+                await asyncio.sleep(self.batch_window)
+            self._fill(batch)
+            task = asyncio.create_task(self._generate(batch))
+            self._tasks.append(task)
+            task.add_done_callback(self._generation_done)
+
+    def _generation_done(self, task: asyncio.Task):
+        self._tasks.remove(task)
+        self._slots.release()
+
+    @staticmethod
+    def _runnable(job: _Job, priority: int) -> bool:
+        # Entries left behind by a promotion are skipped
+        return not job.started and job.priority == priority
+
+    async def _next_job(self) -> _Job:
+        while True:
+            priority, _, job = await self._queue.get()
+            if self._runnable(job, priority):
+                job.started = True
+                return job
+
+    def _fill(self, batch: List[_Job]):
+        """Add queued jobs of the same priority to a batch, up to batch_size"""
+        # Players never wait for speculative rooms generated in the same reply
+        priority = batch[0].priority
+        while len(batch) < self.batch_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if not self._runnable(entry[2], entry[0]):
+                continue
+            if entry[0] != priority:
+                self._queue.put_nowait(entry)
+                return
+            entry[2].started = True
+            batch.append(entry[2])
+
+    async def _generate(self, batch: List[_Job]):
+        GENERATION_BATCH_SIZE.observe(len(batch))
+        try:
+            results = await self._store(batch, await self.generator.generate_rooms(
+                {job.key: job.previous for job in batch}
+            ))
+        except asyncio.CancelledError:
+            for job in batch:
+                job.future.cancel()
+            self._finish(batch)
+            raise
+        except Exception as e:
+            results = {job.key: e for job in batch}
+
+        for job in batch:
+            label = PRIORITY_LABELS[job.priority]
+            result = results.get(job.key)
+            if not isinstance(result, Room):
+                logger.error(f"Generating room {job.key} failed: {result}")
+                GENERATIONS.labels(label, 'error').inc()
+                job.future.set_exception(result)
+                # Prefetches often have nobody waiting; don't report the exception as lost
+                job.future.exception()
+                continue
+            GENERATIONS.labels(label, 'ok').inc()
+            GENERATION_DURATION.labels(label).observe(time.perf_counter() - job.queued_at)
+            job.future.set_result(result)
+        self._finish(batch)
+
+    async def _store(self, batch: List[_Job], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the generated rooms, returning the stored room or the error for each job"""
+        rooms = []
+        for job in batch:
+            result = results.get(job.key)
+            if result is None:
+                results[job.key] = RoomGenerationError(f"No room was generated for {job.key}")
+                continue
+            if isinstance(result, Exception):
+                continue
+            try:
+                rooms.append(Room.from_dict(result))
+            except Exception as e:
+                results[job.key] = e
+        if rooms:
+            # Another worker may have generated some of these first; everyone keeps its rooms
+            results.update(await self.store.create(rooms))
+        return results
+
+    def _finish(self, batch: List[_Job]):
+        for job in batch:
+            self._jobs.pop(job.key, None)
+            if job.priority == PREFETCH:
+                self._prefetching -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': len(self._jobs),
+            'queued': self._queue.qsize(),
+            'prefetching': self._prefetching,
+            'workers': self.workers,
+            'busy_workers': len(self._tasks),
+            'batch_size': self.batch_size,
+            'prefetch_budget': self.prefetch_budget,
+        }
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Optional
+
+from ..world.directions import DIRECTIONS, neighbour
+from ..world.occupancy import format_coordinates, parse_coordinates
+
+
+class ProceduralRoomGenerator:
+    """Fast local room generator used when the LLM is unavailable.
+
+    Rooms are assembled from fixed phrase pools, seeded by the coordinates so
+    the same room always comes out the same. No I/O, so it always answers
+    within microseconds.
+    """
+
+    PLACES = ('stone corridor', 'dusty storeroom', 'low cellar', 'overgrown garden',
+              'empty guardroom', 'winding tunnel', 'collapsed hall', 'quiet shrine')
+    FEATURES = ('Torches flicker in iron brackets along the walls.',
+                'Roots push through cracks in the ceiling.',
+                'A cold draught carries the smell of damp earth.',
+                'Faded murals cover the walls.',
+                'Broken crates are stacked in one corner.',
+                'The floor is worn smooth by countless feet.')
+    NPCS = (('Lost Traveller', 'A weary traveller looking for the way out.'),
+            ('Old Caretaker', 'A stooped figure sweeping the floor.'))
+    ITEMS = (('Rusty Key', 'A small key, orange with rust.'),
+             ('Candle Stub', 'A half-burnt candle.'),
+             ('Torn Map', 'A corner of a map, most of it missing.'))
+
+    def generate_room(self, coordinates: str, previous_room: Optional[str] = None) -> dict:
+        key = format_coordinates(parse_coordinates(coordinates))
+        seed = hashlib.sha256(f'procedural:{key}'.encode()).digest()
+
+        directions = list(DIRECTIONS)[:4]
+        exits = {direction: neighbour(key, direction)
+                 for i, direction in enumerate(directions) if seed[i] % 2}
+        if previous_room:
+            previous = format_coordinates(parse_coordinates(previous_room))
+            for direction in DIRECTIONS:
+                if neighbour(key, direction) == previous:
+                    exits[direction] = previous
+        if not exits:
+            direction = directions[seed[4] % len(directions)]
+            exits[direction] = neighbour(key, direction)
+
+        place = self.PLACES[seed[5] % len(self.PLACES)]
+        feature = self.FEATURES[seed[6] % len(self.FEATURES)]
+        npcs = []
+        if seed[7] % 4 == 0:
+            name, description = self.NPCS[seed[8] % len(self.NPCS)]
+            npcs.append({"id": f"{name.lower().replace(' ', '_')}@{key}", "name": name, "description": description})
+        items = []
+        if seed[9] % 3 == 0:
+            name, description = self.ITEMS[seed[10] % len(self.ITEMS)]
+            items.append({"id": f"{name.lower().replace(' ', '_')}@{key}", "name": name, "description": description})
+
+        return {
+            "coordinates": key,
+            "description": f"You are in a {place}. {feature}",
+            "exits": exits,
+            "npcs": npcs,
+            "items": items,
+        }
@@ -12,6 +12,7 @@ class Room:
         self._items = []
         self._npcs = []
         self._exits = {}
+        self._placeholder = False
 
     def get_name(self):
         return self._name
@@ -39,6 +40,9 @@ class Room:
         if npc in self._npcs:
             self._npcs.remove(npc)
 
+    def is_placeholder(self):
+        return self._placeholder
+
     def get_coordinates(self):
         return self._coordinates
 
@@ -57,7 +61,7 @@ class Room:
         return f"{self._name}: {self._description}\nItems: {', '.join([item.name for item in self._items])}\nExits: {', '.join(self._exits.keys())}"
 
     def _validate_coordinates_string(self, coordinates: str) -> bool:
-        pattern = r'^\d+,\d+,\d+$'
+        pattern = r'^-?\d+,-?\d+,-?\d+$'
         return bool(re.match(pattern, coordinates))
 
     def to_dict(self):
@@ -66,7 +70,8 @@ class Room:
             "description": self._description,
             "exits": self._exits,
             "npcs": [{"id": npc.id, "name": npc.name, "description": npc.description} for npc in self._npcs],
-            "items": [{"id": item.id, "name": item.name, "description": item.description} for item in self._items]
+            "items": [{"id": item.id, "name": item.name, "description": item.description} for item in self._items],
+            "placeholder": self._placeholder
         }
 
     @classmethod
@@ -76,4 +81,5 @@ class Room:
         room._exits = data["exits"]
         room._npcs = [NPC(npc["id"], npc["name"], npc["description"]) for npc in data["npcs"]]
         room._items = [Item(item["id"], item["name"], item["description"]) for item in data["items"]]
+        room._placeholder = bool(data.get("placeholder", False))
         return room
\ No newline at end of file
@@ -1,10 +1,44 @@
+import json
+import logging
+import re
+from typing import Dict, Optional, Union
+
+from .procedural_generator import ProceduralRoomGenerator
+from ..llm.client import LLMClient, create_llm_client
+from ..llm.worker_pool import LLMUnavailableError
+from ..metrics import MetricsRegistry
+from ..world.directions import DIRECTIONS, neighbour
+from ..world.occupancy import format_coordinates, parse_coordinates
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+ROOM_RETRIES = MetricsRegistry().counter(
+    'wordcraft_room_generation_retries_total',
+    'Rooms asked for again because they were missing or invalid in a reply'
+)
+FALLBACK_ROOMS = MetricsRegistry().counter(
+    'wordcraft_room_fallbacks_total',
+    'Rooms built by the procedural generator instead of the LLM, by reason',
+    labelnames=('reason',)
+)
+
+
+class RoomGenerationError(ValueError):
+    """Raised when a completion cannot be turned into a valid room"""
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
 class RoomGenerator:
     STARTING_ROOM = {
         "coordinates": "0,0,0",
         "description": "You find yourself in a cozy stone chamber lit by glowing crystals. A friendly tutorial guide stands nearby ready to help. On the wall, you see glowing signs explaining basic commands like 'look' and 'help'.",
         "exits": {
             "north": "0,1,0",
-            "east": "1,0,0", 
+            "east": "1,0,0",
             "west": "-1,0,0"
         },
         "npcs": [
@@ -23,10 +57,209 @@ class RoomGenerator:
         ]
     }
 
+    SYSTEM_PROMPT = "You are a MUD game master creating accessible game spaces."
+    # The system prompt and format instructions are sent once per batch of rooms
+    PROMPT_TEMPLATE = """Create an immersive room for a text-based MMORPG (MUD) for each of these coordinates:
+{rooms}
+
+Reply with a single JSON object and nothing else:
+{{"rooms": [{{"coordinates": "<x,y,z exactly as listed>",
+  "description": "<vivid, screen-reader friendly description, 2-3 sentences>",
+  "exits": ["<2-3 of north, south, east, west, up, down>"],
+  "npcs": [{{"name": "...", "description": "..."}}],
+  "items": [{{"name": "...", "description": "..."}}]}}]}}
+Give every room at most one NPC and at most two items."""
+
+    def __init__(self, llm: Optional[LLMClient] = None, retries: int = Settings.GENERATION_RETRIES):
+        self._llm = llm
+        self.retries = max(0, retries)
+        self.fallback = ProceduralRoomGenerator()
+
+    @property
+    def llm(self) -> LLMClient:
+        # Created at startup or first use so importing the generator needs no backend
+        if self._llm is None:
+            self._llm = create_llm_client()
+        return self._llm
+
+    def available(self) -> bool:
+        """Whether completion requests are currently expected to get through"""
+        return self.llm.available()
+
+    async def start(self):
+        await self.llm.start()
+
+    async def close(self):
+        if self._llm is not None:
+            await self._llm.close()
+
     def get_starting_room(self):
         """Returns the default starting room"""
         return self.STARTING_ROOM.copy()
 
-    def generate_room(self, coordinates, previous_room=None):
-        if coordinates == self.STARTING_ROOM["coordinates"]:
-            return self.STARTING_ROOM
\ No newline at end of file
+    async def generate_room(self, coordinates: str, previous_room: Optional[str] = None) -> dict:
+        """Room data for coordinates, with an exit back towards previous_room if given"""
+        key = format_coordinates(parse_coordinates(coordinates))
+        result = (await self.generate_rooms({key: previous_room}))[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def generate_rooms(self, requests: Dict[str, Optional[str]]) -> Dict[str, Union[dict, Exception]]:
+        """Generate several rooms with one completion each attempt.
+
+        ``requests`` maps coordinates to the room players arrive from (or None).
+        Each room in the reply is validated on its own; only the rooms that were
+        missing or invalid are asked for again, up to ``retries`` more times.
+        Rooms that still failed, or could not be asked for because the LLM is
+        unavailable, come from the procedural fallback generator, so every
+        request gets a room.
+        """
+        pending = {format_coordinates(parse_coordinates(key)): previous for key, previous in requests.items()}
+        results: Dict[str, Union[dict, Exception]] = {}
+        errors: Dict[str, Exception] = {}
+        starting = self.STARTING_ROOM["coordinates"]
+        if starting in pending:
+            del pending[starting]
+            results[starting] = self.get_starting_room()
+
+        for attempt in range(1 + self.retries):
+            if not pending:
+                break
+            if attempt:
+                ROOM_RETRIES.inc(len(pending))
+            parsed = await self._attempt(pending, errors, attempt)
+            results.update(parsed)
+            if any(isinstance(result, LLMUnavailableError) for result in parsed.values()):
+                # Refused or timed out; retrying now would only wait again
+                break
+            errors = {key: result for key, result in parsed.items() if isinstance(result, RoomGenerationError)}
+            pending = {key: previous for key, previous in pending.items() if isinstance(parsed[key], Exception)}
+
+        for key, previous in pending.items():
+            results[key] = self._fallback_room(key, previous, results[key])
+        return results
+
+    async def _attempt(self, pending: Dict[str, Optional[str]], errors: Dict[str, Exception],
+                       attempt: int) -> Dict[str, Union[dict, Exception]]:
+        """Ask for the pending rooms in one completion, returning a room or an error for each"""
+        messages = [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": self.build_prompt(pending, errors, attempt)},
+        ]
+        max_tokens = self.llm.max_tokens * len(pending)
+        try:
+            content = await self.llm.complete(messages, max_tokens=max_tokens)
+            parsed = self.parse_rooms(pending, content)
+        except Exception as e:
+            return {key: e for key in pending}
+        if not any(isinstance(result, Exception) for result in parsed.values()):
+            # Only a reply that is usable as a whole may be served again from the cache
+            await self.llm.accept(messages, content, max_tokens=max_tokens)
+        return parsed
+
+    @staticmethod
+    def _fallback_reason(error: Exception) -> str:
+        if isinstance(error, LLMUnavailableError):
+            return 'unavailable'
+        if isinstance(error, RoomGenerationError):
+            return 'invalid'
+        return 'error'
+
+    def _fallback_room(self, key: str, previous: Optional[str], error: Exception) -> dict:
+        """Procedural room for one the LLM could not provide"""
+        logger.warning(f"Using a procedural room for {key}: {error}")
+        FALLBACK_ROOMS.labels(self._fallback_reason(error)).inc()
+        # Stored as a placeholder, generated again on a later visit
+        return {**self.fallback.generate_room(key, previous), 'placeholder': True}
+
+    def build_prompt(self, requests: Dict[str, Optional[str]],
+                     errors: Optional[Dict[str, Exception]] = None, attempt: int = 0) -> str:
+        lines = [
+            f"- {key} (players arrive from {previous})" if previous else f"- {key}"
+            for key, previous in requests.items()
+        ]
+        prompt = self.PROMPT_TEMPLATE.format(rooms="\n".join(lines))
+        if errors:
+            # Tells the model what to fix, and keeps a retry from being served
+            # the same cached reply as the attempt that failed
+            prompt += f"\n\nYour reply to attempt {attempt} had these problems:\n" + "\n".join(
+                f"* {error}" for error in dict.fromkeys(str(error) for error in errors.values())
+            )
+        return prompt
+
+    def parse_rooms(self, requests: Dict[str, Optional[str]], content: str) -> Dict[str, Union[dict, Exception]]:
+        """Split a batch reply into validated rooms, with an error for each bad or missing one"""
+        by_key = self._index_reply(content)
+        results: Dict[str, Union[dict, Exception]] = {}
+        for key, previous in requests.items():
+            entry = by_key.get(key)
+            if entry is None:
+                results[key] = RoomGenerationError(f"Room {key} is missing from the reply")
+                continue
+            try:
+                results[key] = self.parse_room(key, entry, previous)
+            except RoomGenerationError as e:
+                results[key] = e
+        return results
+
+    @staticmethod
+    def _index_reply(content: str) -> Dict[str, dict]:
+        """Entries of a batch reply by their normalized coordinates"""
+        # Models like to wrap JSON in a markdown code fence
+        content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content.strip())
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            raise RoomGenerationError(f"Reply is not valid JSON: {e}")
+        entries = data.get('rooms') if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            raise RoomGenerationError("Reply has no list of rooms")
+
+        by_key = {}
+        for entry in entries:
+            try:
+                by_key[format_coordinates(parse_coordinates(entry['coordinates']))] = entry
+            except (TypeError, KeyError, ValueError):
+                continue
+        return by_key
+
+    def parse_room(self, coordinates: str, data: dict, previous_room: Optional[str] = None) -> dict:
+        """Validate one generated room and convert it to the stored room format"""
+        description = data.get('description')
+        if not isinstance(description, str) or not description.strip():
+            raise RoomGenerationError(f"Room {coordinates} has no description")
+
+        exits = {
+            direction.lower(): neighbour(coordinates, direction.lower())
+            for direction in data.get('exits') or ()
+            if isinstance(direction, str) and direction.lower() in DIRECTIONS
+        }
+        if previous_room:
+            previous = format_coordinates(parse_coordinates(previous_room))
+            for direction in DIRECTIONS:
+                if neighbour(coordinates, direction) == previous:
+                    exits[direction] = previous
+        if not exits:
+            raise RoomGenerationError(f"Room {coordinates} has no exits")
+
+        return {
+            "coordinates": coordinates,
+            "description": description.strip(),
+            "exits": exits,
+            "npcs": self._entities(data.get('npcs'), coordinates),
+            "items": self._entities(data.get('items'), coordinates),
+        }
+
+    @staticmethod
+    def _entities(entries, coordinates: str) -> list:
+        entities = []
+        for entry in entries or ():
+            if not isinstance(entry, dict) or not isinstance(entry.get('name'), str):
+                continue
+            entities.append({
+                "id": f"{_slug(entry['name'])}@{coordinates}",
+                "name": entry['name'],
+                "description": str(entry.get('description', '')),
+            })
+        return entities
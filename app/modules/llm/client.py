@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from ...config.settings import Settings
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]
+
+# A room requested in a generation prompt, see RoomGenerator.build_prompt
+ROOM_LINE = re.compile(r'^- (-?\d+,-?\d+,-?\d+)', re.MULTILINE)
+
+
+class LLMClient(ABC):
+    """Chat completion backend used for generated content.
+
+    ``complete`` takes OpenAI style chat messages and returns the text of the
+    first choice. Backends raise on any failure; retries and fallbacks are
+    the caller's business, and so is validating the reply: callers ``accept``
+    a reply they could use, and only accepted replies may be cached.
+    """
+
+    def __init__(self, model: str = Settings.LLM_MODEL,
+                 max_tokens: int = Settings.LLM_MAX_TOKENS,
+                 temperature: float = Settings.LLM_TEMPERATURE):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    @abstractmethod
+    async def complete(self, messages: Messages, max_tokens: Optional[int] = None,
+                       temperature: Optional[float] = None) -> str:
+        """Text of the first choice for the chat messages"""
+        pass
+
+    async def accept(self, messages: Messages, content: str, max_tokens: Optional[int] = None,
+                     temperature: Optional[float] = None) -> None:
+        """Mark the reply to a ``complete`` call with the same arguments as usable"""
+        pass
+
+    def available(self) -> bool:
+        """Whether requests are currently expected to reach the backend"""
+        return True
+
+    async def start(self) -> None:
+        """Open whatever the client needs, before the first request"""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class OpenAIClient(LLMClient):
+    """OpenAI chat completions through the async API of the openai package"""
+
+    def __init__(self, api_key: str = Settings.OPENAI_API_KEY,
+                 api_base: str = Settings.OPENAI_API_BASE, **kwargs):
+        super().__init__(**kwargs)
+        if openai is None:
+            raise RuntimeError("LLM_BACKEND is 'openai' but the openai package is not installed")
+        if not api_key:
+            raise RuntimeError("LLM_BACKEND is 'openai' but OPENAI_API_KEY is not set")
+        self.api_key = api_key
+        self.api_base = api_base or None
+
+    async def complete(self, messages, max_tokens=None, temperature=None):
+        response = await openai.ChatCompletion.acreate(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature if temperature is None else temperature,
+            api_key=self.api_key,
+            api_base=self.api_base,
+        )
+        return response['choices'][0]['message']['content'].strip()
+
+
+class StubLLMClient(LLMClient):
+    """Offline backend that answers room prompts with canned, deterministic rooms.
+
+    Every ``- x,y,z`` line of the last message asks for one room, and the
+    coordinates pick its content, so the same prompt always gets the same
+    answer. ``latency`` simulates the time an API call takes, ``invalid_rate``
+    the share of rooms that come back unusable, and ``calls`` counts
+    completions, for tests and benchmarks.
+    """
+
+    PLACES = ('mossy cavern', 'ruined library', 'windswept courtyard', 'flooded crypt',
+              'quiet grove', 'abandoned forge', 'crystal gallery', 'narrow bridge')
+    DETAILS = ('Water drips steadily somewhere out of sight.',
+               'A faint smell of smoke hangs in the air.',
+               'Soft light filters in from above.',
+               'Your footsteps echo back at you.')
+    DIRECTIONS = ('north', 'south', 'east', 'west', 'up', 'down')
+
+    def __init__(self, latency: float = Settings.LLM_STUB_LATENCY, invalid_rate: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.calls = 0
+
+    async def complete(self, messages, max_tokens=None, temperature=None):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.answer(messages)
+
+    def answer(self, messages: Messages) -> str:
+        """The reply to a room prompt, without the simulated latency"""
+        rooms = []
+        for coordinates in ROOM_LINE.findall(messages[-1]['content']):
+            room = self.room(coordinates)
+            if self.invalid_rate and random.random() < self.invalid_rate:
+                room['description'] = ''
+            rooms.append(room)
+        return json.dumps({'rooms': rooms})
+
+    def room(self, coordinates: str) -> dict:
+        seed = hashlib.sha256(coordinates.encode()).digest()
+        place = self.PLACES[seed[0] % len(self.PLACES)]
+        exits = [direction for i, direction in enumerate(self.DIRECTIONS[:4]) if seed[1 + i] % 2]
+        return {
+            'coordinates': coordinates,
+            'description': f"You stand in a {place}. {self.DETAILS[seed[5] % len(self.DETAILS)]}",
+            'exits': exits or ['north'],
+            'npcs': [{'name': 'Wandering Scribe', 'description': 'A scribe mapping the halls.'}]
+            if seed[6] % 3 == 0 else [],
+            'items': [{'name': 'Old Lantern', 'description': 'A dented brass lantern.'}]
+            if seed[7] % 2 == 0 else [],
+        }
+
+
+def create_llm_client(backend: str = Settings.LLM_BACKEND, cache: bool = Settings.LLM_CACHE) -> LLMClient:
+    if backend == 'openai':
+        client = OpenAIClient()
+    elif backend == 'stub':
+        client = StubLLMClient()
+    else:
+        raise ValueError(f"Unknown LLM backend: {backend}")
+    from .worker_pool import LLMWorkerPool
+    client = LLMWorkerPool(client)
+    if cache:
+        # Outermost, so hits use neither a worker nor the rate limit
+        from .completion_cache import CachedLLMClient
+        client = CachedLLMClient(client)
+    return client
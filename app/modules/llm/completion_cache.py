@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiosqlite
+
+from .client import LLMClient, Messages
+from ..metrics import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = MetricsRegistry().counter(
+    'wordcraft_llm_cache_requests_total',
+    'Completion cache lookups by result (memory, disk or miss)',
+    labelnames=('result',)
+)
+CACHE_EVICTIONS = MetricsRegistry().counter(
+    'wordcraft_llm_cache_evictions_total',
+    'Cached completions evicted by tier and reason',
+    labelnames=('tier', 'reason')
+)
+CACHE_SAVED_SECONDS = MetricsRegistry().counter(
+    'wordcraft_llm_cache_saved_seconds_total',
+    'Completion time the original requests took, summed over cache hits'
+)
+CACHE_SAVED_TOKENS = MetricsRegistry().counter(
+    'wordcraft_llm_cache_saved_tokens_total',
+    'Estimated prompt and completion tokens not spent thanks to cache hits'
+)
+
+# Evict down to this share of the cap so a full cache doesn't evict on every write
+EVICTION_TARGET = 0.9
+# Fresh replies remembered until the caller accepts them; callers accept or
+# drop a reply right after parsing it, so only a handful are ever waiting
+MAX_UNACCEPTED = 256
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def cache_key(model: str, messages: Messages, **params: Any) -> str:
+    """Content address of a completion request"""
+    canonical = json.dumps({'model': model, 'messages': messages, 'params': params},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CompletionCache:
+    """Two tier store of completions: a memory LRU in front of a SQLite file.
+
+    Entries older than ``ttl`` are ignored and purged. The file is kept under
+    ``max_bytes`` of completion text by dropping the least recently used
+    entries. Each entry remembers how long the original request took and
+    roughly how many tokens it cost, so hits can be counted as savings.
+    Memory hits are answered directly; everything touching the file goes
+    through aiosqlite, so a slow disk or a locked file never blocks the event
+    loop. ``open`` copies the warm start file, purges and preloads, and is
+    called at startup rather than by the first request. If the file cannot
+    be opened the cache carries on with the memory tier alone.
+    """
+
+    def __init__(self, path: str = Settings.LLM_CACHE_PATH,
+                 memory_entries: int = Settings.LLM_CACHE_MEMORY_ENTRIES,
+                 max_bytes: int = Settings.LLM_CACHE_MAX_BYTES,
+                 ttl: float = Settings.LLM_CACHE_TTL,
+                 warm_from: str = Settings.LLM_CACHE_WARM_FROM):
+        self.path = path
+        self.memory_entries = max(0, memory_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.warm_from = warm_from
+        # Key -> (content, created_at, duration, tokens), least recently used first
+        self._memory: "OrderedDict[str, Tuple[str, float, float, int]]" = OrderedDict()
+
+        self.conn: Optional[aiosqlite.Connection] = None
+        self._opened = False
+        self._open_lock = asyncio.Lock()
+        # Keeps the size accounting of concurrent writes and evictions straight
+        self._write_lock = asyncio.Lock()
+        self._disk_bytes = 0
+
+        registry = MetricsRegistry()
+        registry.gauge('wordcraft_llm_cache_disk_bytes', 'Completion text held in the disk cache',
+                       func=lambda: self._disk_bytes)
+        registry.gauge('wordcraft_llm_cache_memory_entries', 'Completions held in the memory cache',
+                       func=lambda: len(self._memory))
+
+    async def open(self):
+        """Open the cache file if not already open"""
+        if self._opened:
+            return
+        async with self._open_lock:
+            if self._opened:
+                return
+            try:
+                self.conn = await aiosqlite.connect(self.path, timeout=5.0, isolation_level=None)
+                await self.conn.execute("PRAGMA journal_mode=WAL")
+                await self.conn.execute("PRAGMA synchronous=NORMAL")
+                await self.conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS completions (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        duration REAL NOT NULL,
+                        tokens INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_completions_last_used ON completions(last_used);
+                """)
+                if self.warm_from:
+                    await self._seed(self.warm_from)
+                self._disk_bytes = await self._total_size()
+                await self._purge_expired()
+                await self._preload()
+            except aiosqlite.Error as e:
+                logger.error(f"LLM cache file {self.path} could not be opened, caching in memory only: {e}")
+                if self.conn is not None:
+                    await self.conn.close()
+                    self.conn = None
+            self._opened = True
+
+    async def _total_size(self) -> int:
+        cursor = await self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions")
+        return (await cursor.fetchone())[0]
+
+    async def _seed(self, source: str):
+        """Copy an existing cache file into an empty cache"""
+        if os.path.abspath(source) == os.path.abspath(self.path):
+            return
+        cursor = await self.conn.execute("SELECT 1 FROM completions LIMIT 1")
+        if await cursor.fetchone():
+            return
+        if not os.path.exists(source):
+            logger.warning(f"LLM cache warm start file {source} does not exist")
+            return
+        src = await aiosqlite.connect(f'file:{source}?mode=ro', uri=True)
+        try:
+            await src.backup(self.conn)
+        finally:
+            await src.close()
+        logger.info(f"LLM cache warm started from {source}")
+
+    async def _preload(self):
+        """Fill the memory tier with the most recently used entries on disk"""
+        if not self.memory_entries:
+            return
+        cursor = await self.conn.execute(
+            "SELECT key, content, created_at, duration, tokens FROM completions "
+            "ORDER BY last_used DESC LIMIT ?",
+            (self.memory_entries,)
+        )
+        rows = await cursor.fetchall()
+        for key, content, created_at, duration, tokens in reversed(rows):
+            self._memory[key] = (content, created_at, duration, tokens)
+        if rows:
+            logger.info(f"Preloaded {len(rows)} cached completions into memory")
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._expired(entry[1], now):
+                del self._memory[key]
+                CACHE_EVICTIONS.labels('memory', 'expired').inc()
+            else:
+                self._memory.move_to_end(key)
+                self._hit('memory', entry)
+                return entry[0]
+
+        await self.open()
+        row = None
+        if self.conn is not None:
+            cursor = await self.conn.execute(
+                "SELECT content, created_at, duration, tokens FROM completions WHERE key = ?", (key,)
+            )
+            row = await cursor.fetchone()
+        if row is None or self._expired(row[1], now):
+            CACHE_REQUESTS.labels('miss').inc()
+            return None
+        await self.conn.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+        entry = tuple(row)
+        self._remember(key, entry)
+        self._hit('disk', entry)
+        return entry[0]
+
+    def _hit(self, tier: str, entry: Tuple[str, float, float, int]):
+        CACHE_REQUESTS.labels(tier).inc()
+        CACHE_SAVED_SECONDS.inc(entry[2])
+        CACHE_SAVED_TOKENS.inc(entry[3])
+
+    def _remember(self, key: str, entry: Tuple[str, float, float, int]):
+        if not self.memory_entries:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            CACHE_EVICTIONS.labels('memory', 'size').inc()
+
+    async def put(self, key: str, model: str, content: str, duration: float, tokens: int) -> None:
+        now = time.time()
+        self._remember(key, (content, now, duration, tokens))
+        await self.open()
+        if self.conn is None:
+            return
+        size = len(content.encode())
+        async with self._write_lock:
+            cursor = await self.conn.execute("SELECT size FROM completions WHERE key = ?", (key,))
+            previous = await cursor.fetchone()
+            await self.conn.execute(
+                "INSERT OR REPLACE INTO completions "
+                "(key, model, content, size, duration, tokens, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, content, size, duration, tokens, now, now)
+            )
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_bytes:
+                await self._evict()
+
+    async def _purge_expired(self):
+        cursor = await self.conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        if cursor.rowcount:
+            CACHE_EVICTIONS.labels('disk', 'expired').inc(cursor.rowcount)
+            self._disk_bytes = await self._total_size()
+
+    async def _evict(self):
+        await self._purge_expired()
+        target = self.max_bytes * EVICTION_TARGET
+        while self._disk_bytes > target:
+            cursor = await self.conn.execute(
+                "SELECT key, size FROM completions ORDER BY last_used LIMIT 256"
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if self._disk_bytes <= target:
+                    break
+                victims.append((key,))
+                self._disk_bytes -= size
+            await self.conn.executemany("DELETE FROM completions WHERE key = ?", victims)
+            CACHE_EVICTIONS.labels('disk', 'size').inc(len(victims))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'memory_entries': len(self._memory),
+            'disk_bytes': self._disk_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    async def close(self):
+        async with self._open_lock:
+            if self.conn is not None:
+                await self.conn.close()
+                self.conn = None
+
+
+class CachedLLMClient(LLMClient):
+    """LLM client that answers repeated requests from a CompletionCache.
+
+    A fresh reply is only written to the cache once the caller ``accept``\ s
+    it, so a reply that failed validation is asked for again next time
+    instead of being served from the cache until it expires.
+    """
+
+    def __init__(self, inner: LLMClient, cache: Optional[CompletionCache] = None):
+        super().__init__(model=inner.model, max_tokens=inner.max_tokens, temperature=inner.temperature)
+        self.inner = inner
+        self.cache = cache or CompletionCache()
+        # Key -> (content, duration, tokens) of replies not accepted yet, oldest first
+        self._unaccepted: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+
+    def _key(self, messages: Messages, max_tokens: Optional[int], temperature: Optional[float]) -> str:
+        return cache_key(self.model, messages, max_tokens=max_tokens or self.max_tokens,
+                         temperature=self.temperature if temperature is None else temperature)
+
+    async def complete(self, messages, max_tokens=None, temperature=None):
+        key = self._key(messages, max_tokens, temperature)
+        content = await self.cache.get(key)
+        if content is not None:
+            return content
+
+        started = time.perf_counter()
+        content = await self.inner.complete(messages, max_tokens=max_tokens or self.max_tokens,
+                                            temperature=self.temperature if temperature is None else temperature)
+        tokens = sum(estimate_tokens(message['content']) for message in messages) + estimate_tokens(content)
+        self._unaccepted[key] = (content, time.perf_counter() - started, tokens)
+        self._unaccepted.move_to_end(key)
+        while len(self._unaccepted) > MAX_UNACCEPTED:
+            self._unaccepted.popitem(last=False)
+        return content
+
+    async def accept(self, messages, content, max_tokens=None, temperature=None):
+        key = self._key(messages, max_tokens, temperature)
+        reply = self._unaccepted.pop(key, None)
+        # Nothing to do for a reply that came from the cache in the first place
+        if reply is None or reply[0] != content:
+            return
+        try:
+            await self.cache.put(key, self.model, *reply)
+        except aiosqlite.Error as e:
+            logger.warning(f"Caching a completion failed: {e}")
+
+    def available(self):
+        return self.inner.available()
+
+    async def start(self):
+        await self.inner.start()
+        await self.cache.open()
+
+    async def close(self):
+        await self.inner.close()
+        await self.cache.close()
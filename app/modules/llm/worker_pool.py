@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .client import LLMClient
+from ..metrics import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+LLM_CALL_DURATION = MetricsRegistry().histogram(
+    'wordcraft_llm_call_seconds',
+    'Duration of completion requests to the LLM backend by result',
+    labelnames=('result',)
+)
+LLM_QUEUE_WAIT = MetricsRegistry().histogram(
+    'wordcraft_llm_queue_wait_seconds',
+    'Time completion requests waited for a worker and a rate limit token'
+)
+LLM_REJECTED = MetricsRegistry().counter(
+    'wordcraft_llm_rejected_total',
+    'Completion requests not sent to the backend, by reason',
+    labelnames=('reason',)
+)
+BREAKER_TRIPS = MetricsRegistry().counter(
+    'wordcraft_llm_circuit_trips_total',
+    'Times the LLM circuit breaker opened'
+)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when a completion was refused or did not finish before its deadline"""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised while the circuit breaker is open"""
+
+
+class LLMBusyError(LLMUnavailableError):
+    """Raised when too many completion requests are already waiting"""
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    """Raised when a completion could not finish before its deadline"""
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend, then lets a single probe test recovery.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    every request is refused for ``reset_timeout`` seconds. It then turns half
+    open: one request is let through, and its success closes the breaker while
+    its failure opens it again.
+
+    ``allow`` hands out a token for every request it admits. Closed breakers
+    share one token; the half open probe gets its own, so only the probe
+    itself can give the probe up again with ``release``.
+    """
+    CLOSED = 'closed'
+    HALF_OPEN = 'half_open'
+    OPEN = 'open'
+    # Exported as a gauge value
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    # Token of requests admitted while the breaker was closed
+    PASS = object()
+
+    def __init__(self, failure_threshold: int = Settings.LLM_BREAKER_FAILURES,
+                 reset_timeout: float = Settings.LLM_BREAKER_RESET):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # Token of the half open probe in flight, if any
+        self._probe: Optional[object] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe = None
+        return self._state
+
+    def allow(self) -> Optional[object]:
+        """Token for a request that may go ahead, or None while requests are refused"""
+        state = self.state
+        if state == self.CLOSED:
+            return self.PASS
+        if state == self.HALF_OPEN and self._probe is None:
+            self._probe = object()
+            return self._probe
+        return None
+
+    def release(self, token: object) -> None:
+        """An admitted request ended; if it was the probe and recorded no outcome, allow another"""
+        if token is self._probe:
+            self._probe = None
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info("LLM circuit breaker closed")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe = None
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                BREAKER_TRIPS.inc()
+                logger.warning(f"LLM circuit breaker opened after {self._failures} failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per minute with bursts of ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 60.0 / rate if rate > 0 else 0.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self, deadline: float) -> None:
+        """Take a token, waiting for one if needed; fail fast if it can't come before deadline"""
+        if not self.interval:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+        self._updated = now
+        # Claim the token now so concurrent callers queue up behind each other
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+        wait = -self._tokens * self.interval
+        if now + wait > deadline:
+            self._tokens += 1
+            raise LLMTimeoutError("LLM rate limit would be exceeded before the deadline")
+        await asyncio.sleep(wait)
+
+
+class LLMWorkerPool(LLMClient):
+    """Runs completions of an inner client with a concurrency cap, a rate cap and deadlines.
+
+    At most ``concurrency`` requests are in flight and at most ``max_queue``
+    more may wait; beyond that requests fail fast with LLMBusyError. Requests
+    start no faster than ``rate_limit`` per minute. Each call, waiting included,
+    must finish within ``timeout`` seconds. Backend errors and timeouts feed a
+    CircuitBreaker; while it is open requests fail with CircuitOpenError
+    without reaching the backend, so callers can switch to a local fallback.
+    """
+
+    def __init__(self, inner: LLMClient,
+                 concurrency: int = Settings.LLM_CONCURRENCY,
+                 max_queue: int = Settings.LLM_MAX_QUEUE,
+                 rate_limit: float = Settings.LLM_RATE_LIMIT,
+                 timeout: float = Settings.LLM_TIMEOUT,
+                 breaker: Optional[CircuitBreaker] = None):
+        super().__init__(model=inner.model, max_tokens=inner.max_tokens, temperature=inner.temperature)
+        self.inner = inner
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.rate = RateLimiter(rate_limit, burst=self.concurrency)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._pending = 0
+        self._in_flight = 0
+
+        registry = MetricsRegistry()
+        registry.gauge('wordcraft_llm_in_flight', 'Completion requests being sent to the LLM backend',
+                       func=lambda: self._in_flight)
+        registry.gauge('wordcraft_llm_pending', 'Completion requests waiting for or holding an LLM worker',
+                       func=lambda: self._pending)
+        registry.gauge('wordcraft_llm_circuit_state', 'LLM circuit breaker state (0 closed, 1 half open, 2 open)',
+                       func=lambda: CircuitBreaker.STATE_VALUES[self.breaker.state])
+
+    async def complete(self, messages, max_tokens=None, temperature=None):
+        if self._pending >= self.concurrency + self.max_queue:
+            LLM_REJECTED.labels('busy').inc()
+            raise LLMBusyError("Too many LLM requests waiting")
+        token = self.breaker.allow()
+        if token is None:
+            LLM_REJECTED.labels('circuit_open').inc()
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+        self._pending += 1
+        deadline = time.monotonic() + self.timeout
+        try:
+            await self._wait_for_worker(deadline)
+            try:
+                return await self._call(messages, max_tokens, temperature, deadline)
+            finally:
+                self._slots.release()
+        finally:
+            self._pending -= 1
+            # A no-op once the call recorded its outcome; frees the probe
+            # if it gave up, timed out or was cancelled before that
+            self.breaker.release(token)
+
+    async def _wait_for_worker(self, deadline: float) -> None:
+        """Take a worker slot and a rate limit token, or raise LLMTimeoutError"""
+        queued = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            LLM_REJECTED.labels('timeout').inc()
+            raise LLMTimeoutError("Timed out waiting for an LLM worker")
+        try:
+            await self.rate.acquire(deadline)
+        except BaseException as e:
+            self._slots.release()
+            if isinstance(e, LLMTimeoutError):
+                LLM_REJECTED.labels('rate_limit').inc()
+            raise
+        LLM_QUEUE_WAIT.observe(time.perf_counter() - queued)
+
+    async def _call(self, messages, max_tokens, temperature, deadline: float) -> str:
+        """Send one request to the backend and record its outcome with the breaker"""
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            content = await asyncio.wait_for(
+                self.inner.complete(messages, max_tokens=max_tokens, temperature=temperature),
+                max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            LLM_CALL_DURATION.labels('timeout').observe(time.perf_counter() - started)
+            self.breaker.record_failure()
+            raise LLMTimeoutError(f"LLM request did not finish within {self.timeout:g}s")
+        except Exception:
+            LLM_CALL_DURATION.labels('error').observe(time.perf_counter() - started)
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._in_flight -= 1
+        LLM_CALL_DURATION.labels('ok').observe(time.perf_counter() - started)
+        self.breaker.record_success()
+        return content
+
+    def available(self):
+        # A half open breaker only lets a single probe through
+        return self.breaker.state == CircuitBreaker.CLOSED
+
+    async def start(self):
+        await self.inner.start()
+
+    async def accept(self, messages, content, max_tokens=None, temperature=None):
+        await self.inner.accept(messages, content, max_tokens=max_tokens, temperature=temperature)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pending': self._pending,
+            'in_flight': self._in_flight,
+            'concurrency': self.concurrency,
+            'max_queue': self.max_queue,
+            'circuit_state': self.breaker.state,
+        }
+
+    async def close(self):
+        await self.inner.close()
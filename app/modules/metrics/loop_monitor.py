@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional, Tuple
+
+from . import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = MetricsRegistry().histogram(
+    'wordcraft_event_loop_lag_seconds',
+    'Delay between when the lag probe was due and when it actually ran',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+LOOP_STALLS = MetricsRegistry().counter(
+    'wordcraft_event_loop_stalls_total',
+    'Times the event loop was blocked for longer than the lag threshold'
+)
+
+
+class LoopMonitor:
+    """Measures event loop scheduling lag and reports what blocked it.
+
+    A probe task sleeps for ``interval`` and records how late it woke up. A
+    watchdog thread checks the probe's heartbeat; if the loop has not ticked
+    for longer than ``threshold`` it samples the loop thread's stack while it is
+    still blocked and logs it together with the command being executed.
+    """
+
+    def __init__(self, interval: float = Settings.LOOP_MONITOR_INTERVAL,
+                 threshold: float = Settings.LOOP_LAG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        if Settings.ASYNCIO_DEBUG:
+            # Development aid: asyncio logs every callback slower than the threshold
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+            logger.info("asyncio debug mode enabled (slow callback threshold %.3fs)", self.threshold)
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _probe(self):
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            LOOP_LAG.observe(max(0.0, now - due))
+            self._heartbeat = now
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for <= self.threshold or heartbeat == reported:
+                continue
+            # Report each stall once, while the loop is still stuck in it
+            reported = heartbeat
+            LOOP_STALLS.inc()
+            self._report(blocked_for)
+
+    def _report(self, blocked_for: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        command, client_id = self._executing_command(frame)
+        stack = ''.join(traceback.format_stack(frame))
+        logger.warning(
+            "Event loop blocked for %.3fs while executing command %r for client %s:\n%s",
+            blocked_for, command, client_id, stack
+        )
+
+    @staticmethod
+    def _executing_command(frame) -> Tuple[Optional[str], Optional[str]]:
+        """Find CommandHandler.execute_command on the blocked stack and read its arguments"""
+        while frame is not None:
+            if frame.f_code.co_name == 'execute_command':
+                try:
+                    local_vars = frame.f_locals
+                    return local_vars.get('command_name'), local_vars.get('client_id')
+                except Exception:
+                    break
+            frame = frame.f_back
+        return None, None
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket
+
+from .websocket_message import WebSocketMessage
+from ...config.settings import Settings
+from ..metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Close code used when a client can't keep up with its outbound queue
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+OUTBOUND_DROPPED = MetricsRegistry().counter(
+    'wordcraft_outbound_dropped_total',
+    'Outbound frames dropped because a client queue was full'
+)
+SLOW_DISCONNECTS = MetricsRegistry().counter(
+    'wordcraft_slow_consumer_disconnects_total',
+    'Clients disconnected for not draining their outbound queue'
+)
+
+
+class ClientOutbox:
+    """Bounded outbound queue for one client, drained by its own writer task"""
+
+    def __init__(self, client_id: str, websocket: WebSocket, max_size: int):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(max_size)
+        self.dropped = 0
+        self._task = asyncio.create_task(self._drain(), name=f"outbox-{client_id}")
+
+    def offer(self, payload: str) -> bool:
+        """Queue an encoded frame without waiting. Returns False when full."""
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _drain(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug("Outbox writer for %s stopped: %s", self.client_id, e)
+
+    async def close(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class Broadcaster:
+    """Fan-out delivery of server messages to connected clients.
+
+    Every message is encoded once and the same text frame is queued for each
+    recipient. Each client has its own bounded queue and writer task, so a
+    stalled browser only ever delays itself. When a queue is full the frame is
+    dropped or the client is disconnected, depending on
+    Settings.OUTBOUND_OVERFLOW_POLICY.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, queue_size: int = Settings.OUTBOUND_QUEUE_SIZE,
+                 overflow_policy: str = Settings.OUTBOUND_OVERFLOW_POLICY):
+        if hasattr(self, 'initialized'):
+            return
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self._outboxes: Dict[str, ClientOutbox] = {}
+        # The loop only holds tasks weakly; keep closes alive until they finish
+        self._closing: Set[asyncio.Task] = set()
+        self.dropped = 0
+        self.slow_disconnects = 0
+        MetricsRegistry().gauge(
+            'wordcraft_outbound_queue_depth',
+            'Frames waiting in all client outbound queues',
+            func=lambda: sum(outbox.queue.qsize() for outbox in self._outboxes.values())
+        )
+        self.initialized = True
+
+    def register(self, client_id: str, websocket: WebSocket) -> None:
+        self._outboxes[client_id] = ClientOutbox(client_id, websocket, self.queue_size)
+
+    async def unregister(self, client_id: str) -> None:
+        outbox = self._outboxes.pop(client_id, None)
+        if outbox:
+            await outbox.close()
+
+    def _deliver(self, client_id: str, payload: str) -> bool:
+        outbox = self._outboxes.get(client_id)
+        if outbox is None:
+            return False
+        if outbox.offer(payload):
+            return True
+
+        self.dropped += 1
+        OUTBOUND_DROPPED.inc()
+        if self.overflow_policy == 'disconnect':
+            self._disconnect_slow(outbox)
+        return False
+
+    def _disconnect_slow(self, outbox: ClientOutbox) -> None:
+        if self._outboxes.pop(outbox.client_id, None) is None:
+            return
+        self.slow_disconnects += 1
+        SLOW_DISCONNECTS.inc()
+        logger.warning("Disconnecting slow consumer %s", outbox.client_id)
+
+        async def close():
+            await outbox.close()
+            try:
+                await outbox.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            except Exception:
+                pass
+
+        task = asyncio.create_task(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def send(self, client_id: str, message: WebSocketMessage) -> bool:
+        """Direct delivery to a single client"""
+        return self._deliver(client_id, message.to_json())
+
+    def send_many(self, client_ids: Iterable[str], message: WebSocketMessage,
+                  exclude: Optional[str] = None) -> int:
+        """Deliver to a set of clients (e.g. a room). Returns the number queued."""
+        payload = message.to_json()
+        delivered = 0
+        for client_id in list(client_ids):
+            if client_id != exclude and self._deliver(client_id, payload):
+                delivered += 1
+        return delivered
+
+    def relay(self, client_ids: Iterable[str], payload: str) -> int:
+        """Deliver an already encoded frame, e.g. one received from another worker"""
+        delivered = 0
+        for client_id in list(client_ids):
+            if self._deliver(client_id, payload):
+                delivered += 1
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'clients': len(self._outboxes),
+            'queued': sum(outbox.queue.qsize() for outbox in self._outboxes.values()),
+            'dropped': self.dropped,
+            'slow_disconnects': self.slow_disconnects,
+        }
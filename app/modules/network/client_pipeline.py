@@ -0,0 +1,77 @@
+import asyncio
+import logging
+
+from fastapi import WebSocket
+
+from .websocket_message import WebSocketMessage
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_MESSAGE = WebSocketMessage.constant(type='progress', message='Working...')
+BUSY_MESSAGE = WebSocketMessage.constant(
+    type='error',
+    message='Server busy: too many pending commands. Please wait for the previous ones to finish.'
+)
+
+
+class ClientPipeline:
+    """Per-connection reader/executor pair.
+
+    The reader keeps pulling frames off the socket into a bounded inbound queue
+    while a separate executor task runs the queued commands one at a time, so
+    replies stay in the order the client sent them. Frames arriving while the
+    queue is full are rejected immediately instead of piling up. Commands that
+    take longer than Settings.COMMAND_PROGRESS_DELAY get a progress frame so the
+    player knows the server is still working.
+    """
+
+    def __init__(self, client_id: str, websocket: WebSocket, manager,
+                 queue_size: int = Settings.INBOUND_QUEUE_SIZE,
+                 progress_delay: float = Settings.COMMAND_PROGRESS_DELAY):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.manager = manager
+        self.progress_delay = progress_delay
+        self.inbound: "asyncio.Queue[str]" = asyncio.Queue(queue_size)
+        self.shed = 0
+        self._touch = manager.connection_manager.touch
+
+    async def run(self):
+        """Read frames until the socket closes"""
+        executor = asyncio.create_task(self._execute(), name=f"executor-{self.client_id}")
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                self._touch(self.client_id)
+                logger.debug("Received message from %s: %s", self.client_id, message)
+                try:
+                    self.inbound.put_nowait(message)
+                except asyncio.QueueFull:
+                    self.shed += 1
+                    self.manager.send(self.client_id, BUSY_MESSAGE)
+        finally:
+            executor.cancel()
+            try:
+                await executor
+            except asyncio.CancelledError:
+                pass
+
+    async def _execute(self):
+        while True:
+            message = await self.inbound.get()
+            try:
+                task = asyncio.ensure_future(self.manager.handle_message(self.websocket, message))
+                done, _ = await asyncio.wait({task}, timeout=self.progress_delay)
+                if not done:
+                    self.manager.send(self.client_id, PROGRESS_MESSAGE)
+                response = await task
+                self.manager.send(self.client_id, response)
+                # Logins and moves may have put the player in another worker's zone
+                if self.manager.zone_router is not None:
+                    self.manager.zone_router.check(self.client_id)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            except Exception as e:
+                logger.error("Error handling message from %s: %s", self.client_id, e, exc_info=True)
@@ -0,0 +1,77 @@
+import logging
+from typing import Any, Dict, Optional
+
+from .broadcaster import Broadcaster
+from .message_bus import MessageBus, create_message_bus
+from .session_manager import SessionManager
+from .websocket_message import WebSocketMessage
+
+logger = logging.getLogger(__name__)
+
+
+class Cluster:
+    """Delivers chat and presence events to players on other worker processes.
+
+    Publishers deliver to their own worker's clients directly and then hand the
+    already encoded frame to the cluster, which relays it over the message bus.
+    Each receiving worker resolves the recipients against its own sessions.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, session_manager: Optional[SessionManager] = None,
+                 broadcaster: Optional[Broadcaster] = None,
+                 bus: Optional[MessageBus] = None):
+        if hasattr(self, 'initialized'):
+            return
+        self.session_manager = session_manager or SessionManager()
+        self.broadcaster = broadcaster or Broadcaster()
+        self.bus = bus or create_message_bus()
+        self.bus.subscribe(self._on_event)
+        self.initialized = True
+
+    async def start(self) -> None:
+        await self.session_manager.store.start()
+        await self.bus.start()
+
+    async def stop(self) -> None:
+        await self.bus.stop()
+        self.session_manager.store.close()
+
+    def publish_room(self, location: str, message: WebSocketMessage) -> None:
+        """Relay a message to players in a room on other workers"""
+        zones = self.session_manager.zones
+        if zones is not None and zones.owns(location):
+            # Everyone in a zone this worker owns is connected here
+            return
+        self.bus.publish({'kind': 'room', 'location': location, 'payload': message.to_json()})
+
+    def publish_all(self, message: WebSocketMessage) -> None:
+        """Relay a message to every player on other workers"""
+        self.bus.publish({'kind': 'all', 'payload': message.to_json()})
+
+    def send_to_user(self, username: str, worker_id: str, message: WebSocketMessage) -> bool:
+        """Relay a message to one player on the worker they are connected to.
+
+        Returns False when that worker's socket is gone, i.e. the player's
+        presence entry outlived the worker.
+        """
+        return self.bus.send(worker_id, {'kind': 'user', 'username': username, 'payload': message.to_json()})
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        kind = event.get('kind')
+        payload = event.get('payload')
+        if kind == 'room':
+            self.broadcaster.relay(self.session_manager.occupancy.in_room(event['location']), payload)
+        elif kind == 'all':
+            self.broadcaster.relay(self.session_manager.logged_in_client_ids(), payload)
+        elif kind == 'user':
+            client_id = self.session_manager.get_client_id_by_username(event['username'])
+            if client_id is not None:
+                self.broadcaster.relay((client_id,), payload)
+        else:
+            logger.warning("Unknown bus event kind: %s", kind)
@@ -2,10 +2,40 @@ from typing import Tuple
 from ..commands.command_registry import CommandRegistry
 from .session_manager import SessionManager
 from ..network.websocket_message import WebSocketMessage
+from ..metrics import MetricsRegistry
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+UNKNOWN_COMMAND = WebSocketMessage.constant(
+    type='error',
+    message='Unknown command. Type "help" for available commands.'
+)
+LOGIN_REQUIRED = WebSocketMessage.constant(
+    type='error',
+    message='You must be logged in to use this command.'
+)
+PERMISSION_DENIED = WebSocketMessage.constant(
+    type='error',
+    message="You don't have permission to use that command."
+)
+EXECUTION_ERROR = WebSocketMessage.constant(
+    type='error',
+    message='Error executing command'
+)
+
+COMMAND_DURATION = MetricsRegistry().histogram(
+    'wordcraft_command_duration_seconds',
+    'Time spent executing a command',
+    labelnames=('command',)
+)
+COMMAND_ERRORS = MetricsRegistry().counter(
+    'wordcraft_command_errors_total',
+    'Commands that raised (exception) or replied with an error (rejected)',
+    labelnames=('command', 'kind')
+)
+
 class CommandHandler:
     def __init__(self, session_manager: SessionManager):
         self.command_registry = CommandRegistry()
@@ -18,29 +48,29 @@ class CommandHandler:
         return command, args
 
     async def execute_command(self, command_name: str, args: str, client_id: str) -> WebSocketMessage:
+        started = time.perf_counter()
+        label = 'unknown'
         try:
-            command_class = self.command_registry.get_command(command_name)
-            if not command_class:
-                return WebSocketMessage(
-                    type='error',
-                    message=f'Unknown command. Type "help" for available commands.'
-                )
+            command, args = self.command_registry.resolve(command_name, args)
+            if not command:
+                COMMAND_ERRORS.labels(label, 'rejected').inc()
+                return UNKNOWN_COMMAND
+            label = command.name
 
             # Check login state from session
-            is_logged_in = self.session_manager.is_logged_in(client_id)
-            command = command_class()
-
-            if command.requires_login and not is_logged_in:
-                return WebSocketMessage(
-                    type='error',
-                    message='You must be logged in to use this command.'
-                )
+            if command.requires_login and not self.session_manager.is_logged_in(client_id):
+                return LOGIN_REQUIRED
+            if command.required_role and not self.session_manager.has_role(client_id, command.required_role):
+                return PERMISSION_DENIED
 
-            return await command.execute(args, client_id, self.session_manager)
+            response = await command.execute(args, client_id, self.session_manager)
+            if response.type == 'error':
+                COMMAND_ERRORS.labels(label, 'rejected').inc()
+            return response
 
         except Exception as e:
-            logger.error(f"Command execution error: {str(e)}", exc_info=True)
-            return WebSocketMessage(
-                type='error',
-                message='Error executing command'
-            )
\ No newline at end of file
+            COMMAND_ERRORS.labels(label, 'exception').inc()
+            logger.error("Command execution error: %s", e, exc_info=True)
+            return EXECUTION_ERROR
+        finally:
+            COMMAND_DURATION.labels(label).observe(time.perf_counter() - started)
\ No newline at end of file
@@ -1,24 +1,45 @@
 from fastapi import WebSocket
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
+        # Starlette websockets are unhashable mappings, so index them by identity
+        self._client_ids: Dict[int, str] = {}
+        # client_id -> monotonic time of the last frame received from the client
+        self._last_seen: Dict[str, float] = {}
 
     async def connect(self, websocket: WebSocket) -> str:
         await websocket.accept()
         client_id = f"{websocket.client.host}:{websocket.client.port}"
         self.active_connections[client_id] = websocket
-        logger.info(f"Client {client_id} connected")
+        self._client_ids[id(websocket)] = client_id
+        self._last_seen[client_id] = time.monotonic()
+        logger.info("Client %s connected", client_id)
         return client_id
 
     async def disconnect(self, client_id: str):
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-            logger.info(f"Client {client_id} disconnected")
+        websocket = self.active_connections.pop(client_id, None)
+        self._last_seen.pop(client_id, None)
+        if websocket is not None:
+            self._client_ids.pop(id(websocket), None)
+            logger.info("Client %s disconnected", client_id)
 
     def get_websocket(self, client_id: str) -> Optional[WebSocket]:
-        return self.active_connections.get(client_id)
\ No newline at end of file
+        return self.active_connections.get(client_id)
+
+    def get_client_id(self, websocket: WebSocket) -> Optional[str]:
+        return self._client_ids.get(id(websocket))
+
+    def touch(self, client_id: str) -> None:
+        """Record activity from a client"""
+        self._last_seen[client_id] = time.monotonic()
+
+    def idle_clients(self, idle_timeout: float) -> List[str]:
+        """Clients that have not sent anything for idle_timeout seconds"""
+        cutoff = time.monotonic() - idle_timeout
+        return [client_id for client_id, seen in self._last_seen.items() if seen < cutoff]
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from typing import Optional
+
+from ..metrics import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Close code for connections dropped after IDLE_TIMEOUT without input
+IDLE_CLOSE_CODE = 4000
+
+REAPED = MetricsRegistry().counter(
+    'wordcraft_reaped_total',
+    'Connections and sessions freed by the reaper',
+    labelnames=('reason',)
+)
+
+
+class ConnectionReaper:
+    """Background sweep that frees idle connections and orphaned sessions.
+
+    Half-open sockets are caught by the server's protocol level ping/pong; the
+    reaper handles clients that are still connected but have not sent anything
+    for ``idle_timeout`` seconds, and sessions whose connection is already gone.
+    """
+
+    def __init__(self, manager, idle_timeout: float = Settings.IDLE_TIMEOUT,
+                 interval: float = Settings.REAPER_INTERVAL):
+        self.manager = manager
+        self.idle_timeout = idle_timeout
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run(), name="connection-reaper")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error("Connection reaper failed: %s", e)
+
+    async def reap(self) -> int:
+        """Run one sweep, returning the number of connections and sessions freed"""
+        idle = self.manager.connection_manager.idle_clients(self.idle_timeout)
+        if idle:
+            await asyncio.gather(*(
+                self.manager.close_connection(client_id, IDLE_CLOSE_CODE, 'Idle timeout')
+                for client_id in idle
+            ))
+            REAPED.labels('idle').inc(len(idle))
+            logger.info("Disconnected %d idle clients", len(idle))
+
+        sessions = self.manager.session_manager
+        connections = self.manager.connection_manager.active_connections
+        orphans = [client_id for client_id in sessions.sessions if client_id not in connections]
+        for client_id in orphans:
+            sessions.end_session(client_id)
+        if orphans:
+            REAPED.labels('orphan').inc(len(orphans))
+            logger.warning("Ended %d sessions without a connection", len(orphans))
+        return len(idle) + len(orphans)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..metrics import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+BUS_PUBLISHED = MetricsRegistry().counter(
+    'wordcraft_bus_published_total',
+    'Events sent to other worker processes'
+)
+BUS_RECEIVED = MetricsRegistry().counter(
+    'wordcraft_bus_received_total',
+    'Events received from other worker processes'
+)
+BUS_DROPPED = MetricsRegistry().counter(
+    'wordcraft_bus_dropped_total',
+    'Events that could not be delivered to a worker process'
+)
+
+EventHandler = Callable[[Dict[str, Any]], None]
+
+
+class MessageBus:
+    """Fan-out of events to the other worker processes on this host.
+
+    Delivery to local clients is always done directly by the publisher, so in
+    single process mode there is nobody else to tell and this base class drops
+    everything it is given.
+    """
+
+    def __init__(self, worker_id: str = Settings.WORKER_ID):
+        self.worker_id = worker_id
+        self._handler: Optional[EventHandler] = None
+
+    def subscribe(self, handler: EventHandler) -> None:
+        self._handler = handler
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def send(self, worker_id: str, event: Dict[str, Any]) -> bool:
+        """Send an event to one worker; True if it was handed to that worker's socket"""
+        return False
+
+
+class UnixDatagramBus(MessageBus):
+    """Message bus over Unix datagram sockets, one per worker in a shared directory.
+
+    Each worker binds ``worker-<id>.sock`` and reads it from the event loop.
+    Publishing sends one datagram to every other socket in the directory without
+    waiting; if a peer's receive buffer is full the event is dropped for that
+    peer rather than stalling the publisher.
+    """
+
+    # Re-scan the directory for new or departed workers at most this often
+    PEER_REFRESH_INTERVAL = 1.0
+
+    def __init__(self, directory: str = Settings.BUS_DIR, worker_id: str = Settings.WORKER_ID):
+        super().__init__(worker_id)
+        self.directory = Path(directory)
+        self.path = self.directory / f'worker-{worker_id}.sock'
+        self._sock: Optional[socket.socket] = None
+        self._peers: List[str] = []
+        self._peers_refreshed = 0.0
+
+    async def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(str(self.path))
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+        self._refresh_peers()
+        logger.info("Message bus listening on %s", self.path)
+
+    async def stop(self):
+        if self._sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _refresh_peers(self):
+        own = str(self.path)
+        self._peers = [str(path) for path in self.directory.glob('worker-*.sock') if str(path) != own]
+        self._peers_refreshed = time.monotonic()
+
+    def publish(self, event):
+        if self._sock is None:
+            return
+        if time.monotonic() - self._peers_refreshed > self.PEER_REFRESH_INTERVAL:
+            self._refresh_peers()
+        data = json.dumps(event, separators=(',', ':')).encode()
+        for peer in self._peers:
+            try:
+                self._sock.sendto(data, peer)
+                BUS_PUBLISHED.inc()
+            except (BlockingIOError, ConnectionRefusedError, FileNotFoundError) as e:
+                BUS_DROPPED.inc()
+                logger.debug("Bus event to %s dropped: %s", peer, e)
+            except OSError as e:
+                BUS_DROPPED.inc()
+                logger.warning("Bus event to %s failed: %s", peer, e)
+
+    def send(self, worker_id, event):
+        if self._sock is None:
+            return False
+        data = json.dumps(event, separators=(',', ':')).encode()
+        peer = str(self.directory / f'worker-{worker_id}.sock')
+        try:
+            self._sock.sendto(data, peer)
+        except OSError as e:
+            BUS_DROPPED.inc()
+            logger.debug("Bus event to %s dropped: %s", peer, e)
+            return False
+        BUS_PUBLISHED.inc()
+        return True
+
+    def _on_readable(self):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.error("Message bus receive failed: %s", e)
+                return
+            BUS_RECEIVED.inc()
+            try:
+                event = json.loads(data)
+            except ValueError:
+                logger.warning("Discarding malformed bus event")
+                continue
+            if self._handler is not None:
+                try:
+                    self._handler(event)
+                except Exception as e:
+                    logger.error("Bus event handler failed: %s", e)
+
+
+def create_message_bus(backend: str = Settings.MESSAGE_BUS) -> MessageBus:
+    if backend == 'local':
+        return MessageBus()
+    if backend == 'unix':
+        return UnixDatagramBus()
+    raise ValueError(f"Unknown message bus backend: {backend}")
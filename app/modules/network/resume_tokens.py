@@ -0,0 +1,107 @@
+import logging
+import secrets
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import jwt
+
+from ..roles import Role
+from ..database.sqlite_handler import SQLiteHandler
+from ..metrics import MetricsRegistry
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_TYPE = 'resume'
+ALGORITHM = 'HS256'
+
+RESUMES = MetricsRegistry().counter(
+    'wordcraft_session_resumes_total',
+    'Resume token handshakes by result',
+    labelnames=('result',)
+)
+
+
+class ResumeTokens:
+    """Signed, short-lived tokens that let a reconnecting client restore its session.
+
+    A token carries the username, roles and location of a logged in session and
+    is checked with an HMAC instead of a bcrypt password verification, so tokens
+    survive a server restart as long as SESSION_SECRET is stable. Logging out
+    revokes every token issued to that user before it; the revocation time is
+    stored with the player, so it also survives restarts and holds on every
+    worker sharing the database.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, secret: Optional[str] = None, ttl: int = Settings.SESSION_TOKEN_TTL,
+                 db: Optional[SQLiteHandler] = None):
+        if hasattr(self, 'initialized'):
+            return
+        self.db = db or SQLiteHandler()
+        self.secret = secret or Settings.SESSION_SECRET
+        if not self.secret:
+            logger.warning("SESSION_SECRET is not set; resume tokens will not survive a restart")
+            self.secret = secrets.token_hex(32)
+        self.ttl = ttl
+        self.initialized = True
+
+    def issue(self, username: str, roles: Iterable[Role], location: Optional[str]) -> str:
+        now = time.time()
+        claims = {
+            'typ': TOKEN_TYPE,
+            'sub': username,
+            'roles': sorted(role.value for role in roles),
+            'loc': location,
+            'iat': int(now),
+            'exp': int(now) + self.ttl,
+            # Sub-second issue time so a logout and re-login within one second
+            # still orders correctly against the revocation time
+            'ts': now,
+        }
+        return jwt.encode(claims, self.secret, algorithm=ALGORITHM)
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims of a valid token, or None if it is malformed, expired or revoked"""
+        try:
+            claims = jwt.decode(token, self.secret, algorithms=[ALGORITHM],
+                                options={'require': ['exp', 'iat', 'sub']})
+        except jwt.ExpiredSignatureError:
+            RESUMES.labels('expired').inc()
+            return None
+        except jwt.InvalidTokenError as e:
+            logger.debug("Rejected resume token: %s", e)
+            RESUMES.labels('invalid').inc()
+            return None
+
+        if claims.get('typ') != TOKEN_TYPE:
+            RESUMES.labels('invalid').inc()
+            return None
+        try:
+            revoked_at = await self.db.get_sessions_revoked_at(claims['sub'])
+        except Exception as e:
+            # Fail closed; the player can still log in with a password
+            logger.error(f"Checking resume token revocation for {claims['sub']} failed: {e}")
+            RESUMES.labels('error').inc()
+            return None
+        if revoked_at is None or claims.get('ts', 0) <= revoked_at:
+            # Revoked, or the player no longer exists
+            RESUMES.labels('revoked').inc()
+            return None
+
+        try:
+            claims['roles'] = {Role(value) for value in claims.get('roles', ())}
+        except ValueError:
+            RESUMES.labels('invalid').inc()
+            return None
+        RESUMES.labels('ok').inc()
+        return claims
+
+    async def revoke(self, username: str) -> None:
+        """Invalidate every token issued to a user so far"""
+        await self.db.revoke_sessions(username, time.time())
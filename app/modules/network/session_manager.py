@@ -1,27 +1,57 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
 import logging
 from ...modules.roles import Role
+from ...config.settings import Settings
+from ..world.occupancy import OccupancyIndex, format_coordinates, parse_coordinates
+from .session_store import SessionStore, create_session_store
+from ..world.zones import ZoneMap
 
 logger = logging.getLogger(__name__)
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, store: Optional[SessionStore] = None):
         self.sessions: Dict[str, Dict[str, Any]] = {}
+        # Lowercase username -> client_id for logged in sessions
+        self._clients_by_username: Dict[str, str] = {}
+        self.occupancy = OccupancyIndex(Settings.OCCUPANCY_BUCKET_SIZE)
+        # Presence shared with other worker processes, a no-op when running alone
+        self.store = store or create_session_store()
+        # Zones owned by this worker; players in them are always local
+        self.zones: Optional[ZoneMap] = ZoneMap.from_settings()
 
-    def create_session(self, client_id: str, username: str) -> None:
-        """Create new session for client with Player role"""
+    def create_session(self, client_id: str, username: Optional[str], location: Optional[str] = None,
+                       roles: Optional[Set[Role]] = None) -> None:
+        """Create new session for client, with Player role when a username is given"""
+        self._unindex(client_id)
+        if roles is None:
+            roles = {Role.PLAYER} if username else {Role.ANONYMOUS}
         self.sessions[client_id] = {
             'username': username,
-            'roles': {Role.PLAYER},
-            'logged_in': True
+            'roles': set(roles),
+            'logged_in': bool(username),
+            'location': None
         }
-        logger.info(f"Session created for client {client_id}")
+        if username:
+            self._clients_by_username[username.lower()] = client_id
+            self.set_location(client_id, location or '0,0,0')
+            self.store.put(username, client_id, self.sessions[client_id]['location'], roles)
+        logger.info("Session created for client %s", client_id)
 
     def end_session(self, client_id: str) -> None:
         """End client session and cleanup"""
         if client_id in self.sessions:
+            self._unindex(client_id)
             del self.sessions[client_id]
-            logger.info(f"Session ended for client {client_id}")
+            logger.info("Session ended for client %s", client_id)
+
+    def _unindex(self, client_id: str) -> None:
+        self.occupancy.remove(client_id)
+        session = self.sessions.get(client_id)
+        if session and session.get('username'):
+            key = session['username'].lower()
+            if self._clients_by_username.get(key) == client_id:
+                del self._clients_by_username[key]
+            self.store.remove(session['username'], client_id)
 
     def get_session(self, client_id: str) -> Optional[Dict[str, Any]]:
         """Get session data for client"""
@@ -29,7 +59,8 @@ class SessionManager:
 
     def is_logged_in(self, client_id: str) -> bool:
         """Check if client is logged in"""
-        return client_id in self.sessions
+        session = self.sessions.get(client_id)
+        return bool(session and session['logged_in'])
 
     def has_role(self, client_id: str, role: Role) -> bool:
         """Check if client has specific role"""
@@ -42,4 +73,55 @@ class SessionManager:
         session = self.get_session(client_id)
         if session:
             return session.get('username')
-        return None
\ No newline at end of file
+        return None
+
+    def logged_in_count(self) -> int:
+        return len(self._clients_by_username)
+
+    def logged_in_client_ids(self) -> List[str]:
+        """Client ids of every logged in session on this worker"""
+        return list(self._clients_by_username.values())
+
+    def get_client_id_by_username(self, username: str) -> Optional[str]:
+        """Get the client_id of a logged in user (case-insensitive)"""
+        return self._clients_by_username.get(username.lower())
+
+
+    def set_location(self, client_id: str, location) -> None:
+        """Move a logged in client to a room, keeping the occupancy index in sync"""
+        session = self.sessions.get(client_id)
+        if not session or not session['logged_in']:
+            return
+        coordinates = parse_coordinates(location)
+        session['location'] = format_coordinates(coordinates)
+        self.occupancy.move(client_id, coordinates)
+        self.store.move(session['username'], client_id, session['location'])
+
+    def get_location(self, client_id: str) -> Optional[str]:
+        session = self.get_session(client_id)
+        if session:
+            return session.get('location')
+        return None
+
+    async def get_players_in_room(self, location, exclude: Optional[str] = None) -> List[str]:
+        """Usernames of players in a room on any worker, optionally excluding one client"""
+        players = [
+            self.sessions[cid]['username']
+            for cid in self.occupancy.in_room(location)
+            if cid != exclude
+        ]
+        if self.zones is None or not self.zones.owns(location):
+            players.extend(await self.store.remote_in_room(location))
+        return players
+
+    async def find_remote_player(self, username: str) -> Optional[Dict[str, Any]]:
+        """Presence entry of a player logged in on another worker"""
+        return await self.store.lookup(username)
+
+    def get_players_nearby(self, location, radius: int, exclude: Optional[str] = None) -> List[str]:
+        """Usernames of players within radius rooms of a location"""
+        return [
+            self.sessions[cid]['username']
+            for cid in self.occupancy.clients_within(location, radius)
+            if cid != exclude
+        ]
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..roles import Role
+from ..world.occupancy import format_coordinates, parse_coordinates
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Directory of logged in players shared between worker processes.
+
+    SessionManager keeps the authoritative sessions for its own connections and
+    writes presence through to the store so other workers can find players that
+    are not connected to them. This base class is the single process store: every
+    player is local, so there is nothing to share and every call is a no-op.
+    """
+
+    def __init__(self, worker_id: str = Settings.WORKER_ID):
+        self.worker_id = worker_id
+
+    async def start(self) -> None:
+        pass
+
+    def put(self, username: str, client_id: str, location: Optional[str], roles: Iterable[Role]) -> None:
+        pass
+
+    def move(self, username: str, client_id: str, location: Optional[str]) -> None:
+        pass
+
+    def remove(self, username: str, client_id: str) -> None:
+        pass
+
+    async def lookup(self, username: str) -> Optional[Dict[str, Any]]:
+        """Presence entry for a player connected to another worker"""
+        return None
+
+    async def remote_in_room(self, location: str) -> List[str]:
+        """Usernames in a room that are connected to other workers"""
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """Presence table in a local SQLite database in WAL mode, shared by every worker.
+
+    Writes go to a single background thread, in order, and reads to another,
+    so a worker waiting on the database never stalls its event loop. In WAL
+    mode reads don't wait for writers; if the database is locked anyway they
+    give up after READ_TIMEOUT and answer without remote players.
+
+    Each worker refreshes the ``updated_at`` of its rows every ``heartbeat``
+    seconds. Rows older than ``ttl`` are ignored, so the players of a crashed
+    worker disappear without waiting for that worker to restart; they are
+    deleted once they are PURGE_AFTER times older, so a worker whose loop was
+    only stalled gets its players back on its next heartbeat.
+    """
+
+    # Seconds a read may wait for the database lock
+    READ_TIMEOUT = 0.1
+    # Rows this many TTLs old are deleted by whichever worker notices first
+    PURGE_AFTER = 10
+
+    def __init__(self, path: str = Settings.SESSION_STORE_PATH, worker_id: str = Settings.WORKER_ID,
+                 heartbeat: float = Settings.PRESENCE_HEARTBEAT, ttl: float = Settings.PRESENCE_TTL):
+        super().__init__(worker_id)
+        self.path = path
+        self.heartbeat = heartbeat
+        self.ttl = ttl
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        # Used only from the writer thread once it exists
+        self._writer = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript("""
+            CREATE TABLE IF NOT EXISTS presence (
+                username TEXT PRIMARY KEY COLLATE NOCASE,
+                worker TEXT NOT NULL,
+                client_id TEXT NOT NULL,
+                location TEXT,
+                roles TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_presence_location ON presence(location);
+            CREATE INDEX IF NOT EXISTS idx_presence_worker ON presence(worker);
+        """)
+        cleared = self._writer.execute("DELETE FROM presence WHERE worker = ?", (worker_id,)).rowcount
+        if cleared:
+            logger.info("Cleared %d stale presence rows for worker %s", cleared, worker_id)
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f'session-store-{worker_id}'
+        )
+        # Used only from the reader thread
+        self.conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, timeout=self.READ_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._reader: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f'session-store-reader-{worker_id}'
+        )
+
+    async def start(self):
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="presence-heartbeat")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            now = time.time()
+            self._write("UPDATE presence SET updated_at = ? WHERE worker = ?", (now, self.worker_id))
+            self._write("DELETE FROM presence WHERE updated_at < ?", (now - self.ttl * self.PURGE_AFTER,))
+
+    def _write(self, sql: str, params: tuple) -> None:
+        # Connections may still be closing after the store has shut down
+        if self._executor is None:
+            return
+        self._executor.submit(self._run_write, sql, params)
+
+    def _run_write(self, sql: str, params: tuple) -> None:
+        try:
+            self._writer.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.error("Presence write failed: %s", e)
+
+    async def _read(self, sql: str, params: tuple) -> List[tuple]:
+        if self._reader is None:
+            return []
+        return await asyncio.get_running_loop().run_in_executor(self._reader, self._run_read, sql, params)
+
+    def _run_read(self, sql: str, params: tuple) -> List[tuple]:
+        try:
+            return self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            # Locked or busy; answering without remote players beats making the player wait
+            logger.warning("Presence read failed: %s", e)
+            return []
+
+    def put(self, username, client_id, location, roles):
+        self._write(
+            "INSERT OR REPLACE INTO presence (username, worker, client_id, location, roles, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (username, self.worker_id, client_id, location,
+             json.dumps(sorted(role.value for role in roles)), time.time())
+        )
+
+    def move(self, username, client_id, location):
+        self._write(
+            "UPDATE presence SET location = ?, updated_at = ? "
+            "WHERE username = ? AND worker = ? AND client_id = ?",
+            (location, time.time(), username, self.worker_id, client_id)
+        )
+
+    def remove(self, username, client_id):
+        # Only drop the row if this connection still owns it; the player may
+        # have logged in again on another worker in the meantime
+        self._write(
+            "DELETE FROM presence WHERE username = ? AND worker = ? AND client_id = ?",
+            (username, self.worker_id, client_id)
+        )
+
+    async def lookup(self, username):
+        rows = await self._read(
+            "SELECT username, worker, client_id, location, roles FROM presence "
+            "WHERE username = ? AND worker != ? AND updated_at >= ?",
+            (username, self.worker_id, time.time() - self.ttl)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            'username': row[0],
+            'worker': row[1],
+            'client_id': row[2],
+            'location': row[3],
+            'roles': {Role(value) for value in json.loads(row[4])},
+        }
+
+    async def remote_in_room(self, location):
+        rows = await self._read(
+            "SELECT username FROM presence WHERE location = ? AND worker != ? AND updated_at >= ?",
+            (format_coordinates(parse_coordinates(location)), self.worker_id, time.time() - self.ttl)
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        if self._executor is None:
+            return
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        self._write("DELETE FROM presence WHERE worker = ?", (self.worker_id,))
+        executor, self._executor = self._executor, None
+        reader, self._reader = self._reader, None
+        # Let queued writes, including the delete above, and reads finish first
+        executor.shutdown(wait=True)
+        reader.shutdown(wait=True)
+        self._writer.close()
+        self.conn.close()
+        self.conn = None
+
+
+def create_session_store(backend: str = Settings.SESSION_STORE) -> SessionStore:
+    if backend == 'memory':
+        return SessionStore()
+    if backend == 'sqlite':
+        return SQLiteSessionStore()
+    raise ValueError(f"Unknown session store backend: {backend}")
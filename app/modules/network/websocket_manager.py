@@ -1,15 +1,24 @@
-from typing import Optional
+import asyncio
+from typing import List, Optional
 
 from fastapi import WebSocket
 from .connection_manager import ConnectionManager
 from .session_manager import SessionManager
 from .command_handler import CommandHandler
+from .broadcaster import Broadcaster
+from .cluster import Cluster
+from .zone_router import ZoneRouter
 from .websocket_message import WebSocketMessage
 from ..constants import WELCOME_MESSAGE
+from ..metrics import MetricsRegistry, resident_bytes
+from ...config.settings import Settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+WELCOME = WebSocketMessage.constant(type='welcome', message=WELCOME_MESSAGE)
+CONNECTION_ERROR = WebSocketMessage.constant(type='error', message='Connection error')
+
 class WebSocketManager:
     _instance = None
 
@@ -23,13 +32,25 @@ class WebSocketManager:
             self.connection_manager = ConnectionManager()
             self.session_manager = SessionManager()
             self.command_handler = CommandHandler(self.session_manager)
+            self.broadcaster = Broadcaster()
+            self.cluster = Cluster(self.session_manager, self.broadcaster)
+            self.zone_router: Optional[ZoneRouter] = None
+            if self.session_manager.zones is not None:
+                self.zone_router = ZoneRouter(self.session_manager.zones, self.session_manager, self.broadcaster)
+            registry = MetricsRegistry()
+            registry.gauge('wordcraft_active_connections', 'Open websocket connections',
+                           func=lambda: len(self.connection_manager.active_connections))
+            registry.gauge('wordcraft_active_sessions', 'Logged in player sessions',
+                           func=self.session_manager.logged_in_count)
+            registry.gauge('wordcraft_process_resident_bytes', 'Resident memory of this process',
+                           func=resident_bytes)
             self.initialized = True
 
     async def connect(self, websocket: WebSocket) -> str:
         client_id = await self.connection_manager.connect(websocket)
         self.session_manager.create_session(client_id, None)
-        welcome = WebSocketMessage(type='welcome', message=WELCOME_MESSAGE)
-        await websocket.send_json(welcome.to_dict())
+        self.broadcaster.register(client_id, websocket)
+        self.broadcaster.send(client_id, WELCOME)
         return client_id
 
     async def disconnect(self, websocket: WebSocket):
@@ -37,25 +58,56 @@ class WebSocketManager:
         if client_id:
             await self.connection_manager.disconnect(client_id)
             self.session_manager.end_session(client_id)
+            await self.broadcaster.unregister(client_id)
+
+    async def close_connection(self, client_id: str, code: int = 1000, reason: Optional[str] = None) -> None:
+        """Close a client's socket and free its connection and session state"""
+        websocket = self.connection_manager.get_websocket(client_id)
+        if websocket is None:
+            return
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception as e:
+            # Already closed, or the peer is gone and the close frame can't be sent
+            logger.debug("Close of %s failed: %s", client_id, e)
+        finally:
+            await self.disconnect(websocket)
+
+    async def close_all(self, code: int = 1001, reason: Optional[str] = 'Server shutting down',
+                        timeout: float = Settings.SHUTDOWN_TIMEOUT) -> int:
+        """Close every connection concurrently, giving up on stragglers after timeout"""
+        client_ids: List[str] = list(self.connection_manager.active_connections)
+        if not client_ids:
+            return 0
+        tasks = [asyncio.create_task(self.close_connection(client_id, code, reason)) for client_id in client_ids]
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        # State of connections that did not close in time is freed regardless
+        for client_id in client_ids:
+            websocket = self.connection_manager.get_websocket(client_id)
+            if websocket is not None:
+                await self.disconnect(websocket)
+        logger.info("Closed %d connections (%d timed out)", len(client_ids), len(pending))
+        return len(client_ids)
+
+    def send(self, client_id: str, message: WebSocketMessage) -> bool:
+        """Queue a message on the client's outbound queue"""
+        return self.broadcaster.send(client_id, message)
 
     async def handle_message(self, websocket: WebSocket, message: str) -> WebSocketMessage:
         client_id = self._get_client_id(websocket)
         if not client_id:
-            return WebSocketMessage(type='error', message='Connection error')
+            return CONNECTION_ERROR
 
         command_name, args = self.command_handler.parse_command(message)
-        is_logged_in = self.session_manager.is_logged_in(client_id)
-        
-        return await self.command_handler.execute_command(command_name, args, is_logged_in)
+        return await self.command_handler.execute_command(command_name, args, client_id)
 
     def get_websocket_by_username(self, username: str) -> Optional[WebSocket]:
-        for client_id, websocket in self.connection_manager.active_connections.items():
-            if self.session_manager.get_username(client_id) == username:
-                return websocket
-        return None
-
-    def _get_client_id(self, websocket: WebSocket) -> str:
-        for cid, ws in self.connection_manager.active_connections.items():
-            if ws == websocket:
-                return cid
-        return None
\ No newline at end of file
+        client_id = self.session_manager.get_client_id_by_username(username)
+        if client_id is None:
+            return None
+        return self.connection_manager.get_websocket(client_id)
+
+    def _get_client_id(self, websocket: WebSocket) -> Optional[str]:
+        return self.connection_manager.get_client_id(websocket)
\ No newline at end of file
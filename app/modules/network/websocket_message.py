@@ -1,11 +1,73 @@
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Reused encoder, json.dumps builds a new one whenever options are passed
+_json_encoder = json.JSONEncoder(separators=(',', ':'))
+_json_dumps = _json_encoder.encode
+
+
+def _orjson_dumps(payload: Any) -> str:
+    return orjson.dumps(payload).decode()
+
+
+_dumps: Callable[[Any], str] = _orjson_dumps if orjson is not None else _json_dumps
+
+
+def set_serializer(dumps: Optional[Callable[[Any], Union[str, bytes]]]) -> None:
+    """Replace the JSON serializer used for outgoing frames.
+
+    ``dumps`` may return str or bytes (bytes are decoded as UTF-8, since the web
+    client expects text frames). Passing None restores the stdlib json encoder.
+    """
+    global _dumps
+    if dumps is None:
+        _dumps = _json_dumps
+        return
+
+    def encode(payload: Any) -> str:
+        encoded = dumps(payload)
+        return encoded.decode() if isinstance(encoded, bytes) else encoded
+
+    _dumps = encode
+
+
 class WebSocketMessage:
+    __slots__ = ('type', 'message', 'data', '_encoded')
+
     def __init__(self, type: str, message: str, data: Optional[Dict[str, Any]] = None):
-        self.type = type
-        self.message = message
-        self.data = data if data else {}
+        # Bypass the frozen check in __setattr__, a new message is never frozen
+        set_attr = object.__setattr__
+        set_attr(self, 'type', type)
+        set_attr(self, 'message', message)
+        set_attr(self, 'data', data if data else {})
+        set_attr(self, '_encoded', None)
+
+    def __setattr__(self, name: str, value: Any):
+        if self._encoded is not None:
+            raise AttributeError(f"Cannot modify frozen WebSocketMessage ({name})")
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def constant(cls, type: str, message: str, data: Optional[Dict[str, Any]] = None) -> 'WebSocketMessage':
+        """Build an immutable message whose encoded frame is computed once"""
+        return cls(type=type, message=message, data=data).freeze()
+
+    def freeze(self) -> 'WebSocketMessage':
+        """Encode the message now and cache the frame. The message can't change afterwards."""
+        if self._encoded is None:
+            encoded = _dumps(self.to_dict())
+            object.__setattr__(self, '_encoded', encoded)
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return self._encoded is not None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WebSocketMessage':
@@ -14,17 +76,20 @@ class WebSocketMessage:
             message=data.get('message', ''),
             data=data.get('data', {})
         )
-    
+
     @classmethod
     def from_json(cls, json_str: str) -> 'WebSocketMessage':
         return cls.from_dict(json.loads(json_str))
-    
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'type': self.type,
             'message': self.message,
             'data': self.data
         }
-    
+
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
\ No newline at end of file
+        encoded = self._encoded
+        if encoded is not None:
+            return encoded
+        return _dumps(self.to_dict())
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from typing import Optional
+
+import websockets
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+from ..metrics import MetricsRegistry
+from ..world.zones import ZoneMap
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to the client when the owning worker can't be reached
+OWNER_UNAVAILABLE_CLOSE_CODE = 1013
+
+RELAYS = MetricsRegistry().counter(
+    'wordcraft_zone_relays_total',
+    'Connections for another worker\'s zone relayed to it, by result',
+    labelnames=('result',)
+)
+
+
+class ZoneRelay:
+    """Forwards a handed off connection that landed on the wrong worker.
+
+    Clients reconnect after a handoff through the public port with the owning
+    worker as a hint (``/ws?worker=<id>``). The kernel spreads connections on
+    the shared port over all workers, so when another worker accepts it, that
+    worker opens a websocket to the owner's zone port on the loopback
+    interface and copies frames both ways until either side closes. This
+    keeps handoffs working behind a single exposed port, a proxy or TLS
+    termination, at the cost of one extra local hop.
+    """
+
+    def __init__(self, zones: ZoneMap, host: str = '127.0.0.1'):
+        self.zones = zones
+        self.host = host
+        self.active = 0
+        MetricsRegistry().gauge('wordcraft_zone_relays_active', 'Connections being relayed to another worker',
+                                func=lambda: self.active)
+
+    def target(self, hint: Optional[str]) -> Optional[int]:
+        """The worker to relay to, or None if this worker should serve the connection"""
+        try:
+            worker = int(hint)
+        except (TypeError, ValueError):
+            return None
+        if worker == self.zones.worker or not 0 <= worker < self.zones.workers:
+            return None
+        return worker
+
+    async def maybe_relay(self, websocket: WebSocket) -> bool:
+        """Relay a connection whose ``worker`` hint names another worker.
+
+        Returns True if the connection was relayed (or refused because the
+        owner was unreachable) and False if this worker should serve it.
+        """
+        worker = self.target(websocket.query_params.get('worker'))
+        if worker is None:
+            return False
+        await self.relay(websocket, worker)
+        return True
+
+    async def relay(self, websocket: WebSocket, worker: int) -> None:
+        url = f'ws://{self.host}:{self.zones.port_of(worker)}/ws?worker={worker}'
+        try:
+            # The client's own pings keep the pair alive; the owner pings through us
+            upstream = await websockets.connect(url, ping_interval=None, max_size=None)
+        except (OSError, websockets.InvalidHandshake) as e:
+            logger.warning("Relay to worker %s failed: %s", worker, e)
+            RELAYS.labels('unavailable').inc()
+            await websocket.close(code=OWNER_UNAVAILABLE_CLOSE_CODE)
+            return
+
+        await websocket.accept()
+        RELAYS.labels('ok').inc()
+        self.active += 1
+        try:
+            tasks = {
+                asyncio.create_task(self._client_to_owner(websocket, upstream)),
+                asyncio.create_task(self._owner_to_client(upstream, websocket)),
+            }
+            _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self.active -= 1
+            await upstream.close()
+            try:
+                await websocket.close(code=upstream.close_code or 1000)
+            except RuntimeError:
+                # The client already closed
+                pass
+
+    @staticmethod
+    async def _client_to_owner(websocket: WebSocket, upstream) -> None:
+        try:
+            while True:
+                message = await websocket.receive()
+                if message['type'] == 'websocket.disconnect':
+                    return
+                if message.get('text') is not None:
+                    await upstream.send(message['text'])
+                elif message.get('bytes') is not None:
+                    await upstream.send(message['bytes'])
+        except (WebSocketDisconnect, websockets.ConnectionClosed):
+            pass
+
+    @staticmethod
+    async def _owner_to_client(upstream, websocket: WebSocket) -> None:
+        try:
+            async for message in upstream:
+                if isinstance(message, str):
+                    await websocket.send_text(message)
+                else:
+                    await websocket.send_bytes(message)
+        except (WebSocketDisconnect, websockets.ConnectionClosed, RuntimeError):
+            pass
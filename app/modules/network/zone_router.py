@@ -0,0 +1,69 @@
+import logging
+
+from .broadcaster import Broadcaster
+from .resume_tokens import ResumeTokens
+from .session_manager import SessionManager
+from .websocket_message import WebSocketMessage
+from ..metrics import MetricsRegistry
+from ..world.occupancy import format_coordinates
+from ..world.zones import ZoneMap
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+HANDOFFS = MetricsRegistry().counter(
+    'wordcraft_zone_handoffs_total',
+    'Players handed off to the worker that owns their zone'
+)
+
+
+class ZoneRouter:
+    """Hands players off to the worker that owns the zone they are in.
+
+    A live websocket cannot move between processes, so the handoff is a
+    redirect: the client gets a fresh resume token and the owning worker's id,
+    reconnects and resumes its session. With ``handoff`` 'relay' it reconnects
+    through the public port with the worker as a hint (see ZoneRelay); with
+    'direct' it is also given the owner's zone port to connect to. The session
+    on this worker ends immediately so the player is only ever present in one
+    zone owner.
+    """
+
+    def __init__(self, zones: ZoneMap, session_manager: SessionManager, broadcaster: Broadcaster,
+                 handoff: str = Settings.ZONE_HANDOFF):
+        if handoff not in ('relay', 'direct'):
+            raise ValueError(f"Unknown zone handoff mode: {handoff}")
+        self.zones = zones
+        self.handoff = handoff
+        self.session_manager = session_manager
+        self.broadcaster = broadcaster
+        self.handoffs = 0
+
+    def check(self, client_id: str) -> bool:
+        """Hand the client off if its room is owned by another worker"""
+        session = self.session_manager.get_session(client_id)
+        if not session or not session['logged_in'] or not session['location']:
+            return False
+        location = session['location']
+        owner = self.zones.owner_of(location)
+        if owner == self.zones.worker:
+            return False
+
+        username = session['username']
+        data = {
+            'resume_token': ResumeTokens().issue(username, session['roles'], location),
+            'worker': owner,
+            'zone': format_coordinates(self.zones.zone_of(location)),
+        }
+        if self.handoff == 'direct':
+            data['port'] = self.zones.port_of(owner)
+        self.broadcaster.send(client_id, WebSocketMessage(
+            type='handoff',
+            message='You travel on into another region of the world...',
+            data=data
+        ))
+        self.session_manager.end_session(client_id)
+        self.handoffs += 1
+        HANDOFFS.inc()
+        logger.debug("Handed %s off to worker %s for %s", username, owner, location)
+        return True
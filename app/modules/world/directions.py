@@ -0,0 +1,17 @@
+from .occupancy import format_coordinates, parse_coordinates
+
+# Direction -> coordinate offset, matching the starting room's exits
+DIRECTIONS = {
+    'north': (0, 1, 0),
+    'south': (0, -1, 0),
+    'east': (1, 0, 0),
+    'west': (-1, 0, 0),
+    'up': (0, 0, 1),
+    'down': (0, 0, -1),
+}
+
+
+def neighbour(coordinates: str, direction: str) -> str:
+    x, y, z = parse_coordinates(coordinates)
+    dx, dy, dz = DIRECTIONS[direction]
+    return format_coordinates((x + dx, y + dy, z + dz))
@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[int, int, int]
+
+
+def parse_coordinates(coordinates: Union[str, Iterable[int]]) -> Coordinates:
+    """Normalise 'x,y,z' strings and (x, y, z) sequences to an int tuple"""
+    if isinstance(coordinates, str):
+        coordinates = coordinates.split(',')
+    x, y, z = (int(c) for c in coordinates)
+    return x, y, z
+
+
+def format_coordinates(coordinates: Coordinates) -> str:
+    return f"{coordinates[0]},{coordinates[1]},{coordinates[2]}"
+
+
+class OccupancyIndex:
+    """In-memory index of which clients are in which room.
+
+    Only occupied rooms are stored, so memory grows with the number of rooms
+    that currently hold players rather than with the size of the world. Rooms
+    are additionally grouped into cubic buckets of ``bucket_size`` rooms per
+    side so neighbourhood queries only visit nearby occupied rooms.
+    """
+
+    def __init__(self, bucket_size: int = 8):
+        self.bucket_size = max(1, bucket_size)
+        self._rooms: Dict[Coordinates, Set[str]] = {}
+        self._locations: Dict[str, Coordinates] = {}
+        self._buckets: Dict[Coordinates, Set[Coordinates]] = {}
+
+    def _bucket(self, room: Coordinates) -> Coordinates:
+        size = self.bucket_size
+        return room[0] // size, room[1] // size, room[2] // size
+
+    def move(self, client_id: str, coordinates) -> None:
+        """Place a client in a room, removing it from its previous room"""
+        room = parse_coordinates(coordinates)
+        previous = self._locations.get(client_id)
+        if previous == room:
+            return
+        if previous is not None:
+            self._discard(client_id, previous)
+
+        occupants = self._rooms.get(room)
+        if occupants is None:
+            occupants = self._rooms[room] = set()
+            self._buckets.setdefault(self._bucket(room), set()).add(room)
+        occupants.add(client_id)
+        self._locations[client_id] = room
+
+    def remove(self, client_id: str) -> None:
+        """Remove a client from the index entirely"""
+        room = self._locations.pop(client_id, None)
+        if room is not None:
+            self._discard(client_id, room)
+
+    def _discard(self, client_id: str, room: Coordinates) -> None:
+        occupants = self._rooms.get(room)
+        if not occupants:
+            return
+        occupants.discard(client_id)
+        if not occupants:
+            del self._rooms[room]
+            bucket_key = self._bucket(room)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(room)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def location_of(self, client_id: str) -> Optional[Coordinates]:
+        return self._locations.get(client_id)
+
+    def in_room(self, coordinates) -> Set[str]:
+        """Clients in exactly this room. The returned set must not be mutated."""
+        return self._rooms.get(parse_coordinates(coordinates), frozenset())
+
+    def within(self, coordinates, radius: int) -> Dict[Coordinates, Set[str]]:
+        """Occupied rooms (and their clients) within ``radius`` rooms on every axis"""
+        cx, cy, cz = parse_coordinates(coordinates)
+        radius = max(0, radius)
+        low = self._bucket((cx - radius, cy - radius, cz - radius))
+        high = self._bucket((cx + radius, cy + radius, cz + radius))
+
+        span = (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        if span <= len(self._buckets):
+            candidates = (
+                self._buckets.get((bx, by, bz), ())
+                for bx in range(low[0], high[0] + 1)
+                for by in range(low[1], high[1] + 1)
+                for bz in range(low[2], high[2] + 1)
+            )
+        else:
+            # Fewer occupied buckets than the query would touch, scan those instead
+            candidates = self._buckets.values()
+
+        result = {}
+        for bucket in candidates:
+            for room in bucket:
+                if (abs(room[0] - cx) <= radius and abs(room[1] - cy) <= radius
+                        and abs(room[2] - cz) <= radius):
+                    result[room] = self._rooms[room]
+        return result
+
+    def clients_within(self, coordinates, radius: int) -> Set[str]:
+        clients = set()
+        for occupants in self.within(coordinates, radius).values():
+            clients.update(occupants)
+        return clients
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'clients': len(self._locations),
+            'occupied_rooms': len(self._rooms),
+            'occupied_buckets': len(self._buckets),
+        }
@@ -0,0 +1,312 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..database.db_connection import DatabaseConnection
+from ..generators.room import Room
+from ..metrics import MetricsRegistry
+from .occupancy import format_coordinates, parse_coordinates
+from .zones import ZoneMap
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+ROOM_CACHE_REQUESTS = MetricsRegistry().counter(
+    'wordcraft_room_cache_requests_total',
+    'Room lookups by cache result',
+    labelnames=('result',)
+)
+ROOM_CACHE_EVICTIONS = MetricsRegistry().counter(
+    'wordcraft_room_cache_evictions_total',
+    'Rooms evicted from the cache to stay under the memory cap'
+)
+ROOM_FLUSH_DURATION = MetricsRegistry().histogram(
+    'wordcraft_room_flush_seconds',
+    'Time taken to write a batch of dirty rooms'
+)
+ROOMS_FLUSHED = MetricsRegistry().counter(
+    'wordcraft_rooms_flushed_total',
+    'Dirty rooms written back to the database'
+)
+
+# Rough fixed cost of a cached Room, its lists and the cache entry itself,
+# added to the serialized size when accounting against the memory cap
+ROOM_OVERHEAD_BYTES = 1024
+
+SELECT_ROOM = "SELECT coordinates, description, exits, npcs, items, placeholder FROM rooms WHERE coordinates = ?"
+# First writer wins, another worker may have stored the same coordinates,
+# except that a generated room replaces a placeholder
+INSERT_ROOM = (
+    "INSERT INTO rooms (coordinates, description, exits, npcs, items, placeholder) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(coordinates) DO UPDATE SET description = excluded.description, "
+    "exits = excluded.exits, npcs = excluded.npcs, items = excluded.items, placeholder = 0 "
+    "WHERE rooms.placeholder = 1 AND excluded.placeholder = 0"
+)
+# Leaves the row alone if its placeholder was replaced since it was loaded
+UPDATE_ROOM = (
+    "UPDATE rooms SET description = ?, exits = ?, npcs = ?, items = ? "
+    "WHERE coordinates = ? AND placeholder = ?"
+)
+
+RoomRow = Tuple[str, str, str, str, str, int]
+
+
+def _room_row(room: Room) -> RoomRow:
+    data = room.to_dict()
+    return (
+        data['coordinates'],
+        data['description'],
+        json.dumps(data['exits']),
+        json.dumps(data['npcs']),
+        json.dumps(data['items']),
+        int(data['placeholder']),
+    )
+
+
+def _row_size(row: RoomRow) -> int:
+    return sum(len(field) for field in row[:5]) + ROOM_OVERHEAD_BYTES
+
+
+def _row_room(row) -> Room:
+    return Room.from_dict({
+        'coordinates': row[0],
+        'description': row[1],
+        'exits': json.loads(row[2]),
+        'npcs': json.loads(row[3]),
+        'items': json.loads(row[4]),
+        'placeholder': bool(row[5]),
+    })
+
+
+class RoomStore:
+    """LRU cache of rooms in front of the rooms table, with write-behind persistence.
+
+    Lookups are served from memory and fall through to a pooled reader on a
+    miss; concurrent misses for the same room share one query. New rooms are
+    written through by ``create``, which never replaces a stored row: when
+    another worker stored the same coordinates first, its room is read back
+    and used instead, so every worker serves the same room. Changes to rooms
+    are only recorded in memory: callers ``mark_dirty`` a cached room they
+    modified, and a background task updates every dirty room in one
+    executemany transaction each ROOM_FLUSH_INTERVAL. Only rows this store
+    loaded or created are ever updated. Dirty rooms are never evicted, so the
+    cache can briefly exceed its cap until the next flush.
+
+    In zone mode the cache is per zone owner: only the worker owning a zone has
+    players in it, so each room has a single writer, and only rooms in owned
+    zones are cached. Rooms in other zones are read through on every lookup,
+    since their owner may change them at any time.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, db: Optional[DatabaseConnection] = None,
+                 max_bytes: int = Settings.ROOM_CACHE_MAX_BYTES,
+                 flush_interval: float = Settings.ROOM_FLUSH_INTERVAL):
+        if hasattr(self, 'initialized'):
+            return
+        self.db = db or DatabaseConnection()
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.zones = ZoneMap.from_settings()
+
+        # Coordinates -> (room, accounted size), least recently used first
+        self._cache: "OrderedDict[str, Tuple[Room, int]]" = OrderedDict()
+        self._bytes = 0
+        self._dirty: Set[str] = set()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._flushes = 0
+        self._flush_failures = 0
+        self._last_flush_seconds = 0.0
+
+        registry = MetricsRegistry()
+        registry.gauge('wordcraft_room_cache_bytes', 'Estimated memory held by cached rooms',
+                       func=lambda: self._bytes)
+        registry.gauge('wordcraft_room_cache_entries', 'Rooms held in the cache',
+                       func=lambda: len(self._cache))
+        registry.gauge('wordcraft_room_cache_dirty', 'Cached rooms waiting to be written',
+                       func=lambda: len(self._dirty))
+        self.initialized = True
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run(), name="room-flusher")
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still dirty"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._dirty:
+            logger.error(f"{len(self._dirty)} rooms could not be saved on shutdown")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Room flush failed: {e}")
+
+    @staticmethod
+    def _key(coordinates) -> str:
+        return format_coordinates(parse_coordinates(coordinates))
+
+    async def get(self, coordinates) -> Optional[Room]:
+        """Room at coordinates, or None if it has never been stored"""
+        key = self._key(coordinates)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self._hits += 1
+            ROOM_CACHE_REQUESTS.labels('hit').inc()
+            return entry[0]
+
+        self._misses += 1
+        ROOM_CACHE_REQUESTS.labels('miss').inc()
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            room = await self._load(key)
+            # A create() may have raced the query; the in-memory room is newer
+            if key in self._cache:
+                room = self._cache[key][0]
+            elif room is not None and self._owns(key):
+                self._insert(key, room, _row_size(_room_row(room)))
+            future.set_result(room)
+            return room
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; retrieve it so an unwaited future is not reported
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+
+    def _owns(self, key: str) -> bool:
+        return self.zones is None or self.zones.owns(key)
+
+    async def _load(self, key: str) -> Optional[Room]:
+        async with self.db.reader() as conn:
+            cursor = await conn.execute(SELECT_ROOM, (key,))
+            row = await cursor.fetchone()
+        return _row_room(row) if row is not None else None
+
+    async def create(self, rooms: List[Room]) -> Dict[str, Room]:
+        """Store new rooms in one transaction, keeping any stored first elsewhere.
+
+        Returns the room now stored at each of the coordinates, which is the
+        given room unless another worker created that room first. A stored
+        placeholder is replaced by a given room that is not one.
+        """
+        rows = [_room_row(room) for room in rooms]
+        stored: Dict[str, Room] = {}
+        async with self.db.writer() as conn:
+            for row, room in zip(rows, rooms):
+                cursor = await conn.execute(INSERT_ROOM, row)
+                if cursor.rowcount:
+                    stored[row[0]] = room
+                    continue
+                cursor = await conn.execute(SELECT_ROOM, (row[0],))
+                stored[row[0]] = _row_room(await cursor.fetchone())
+            await conn.commit()
+        for key, room in stored.items():
+            if self._owns(key):
+                self._insert(key, room, _row_size(_room_row(room)))
+        return stored
+
+    def mark_dirty(self, coordinates) -> None:
+        """Schedule a cached room that was modified in place to be written"""
+        key = self._key(coordinates)
+        entry = self._cache.get(key)
+        if entry is None:
+            raise KeyError(f"Room {key} is not cached")
+        self._dirty.add(key)
+        self._insert(key, entry[0], _row_size(_room_row(entry[0])))
+
+    def _insert(self, key: str, room: Room, size: int):
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._cache[key] = (room, size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        for key in list(self._cache):
+            if self._bytes <= self.max_bytes:
+                break
+            if key in self._dirty:
+                continue
+            _, size = self._cache.pop(key)
+            self._bytes -= size
+            self._evictions += 1
+            ROOM_CACHE_EVICTIONS.inc()
+
+    async def flush(self) -> int:
+        """Write every dirty room in one transaction, returning how many were written"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch = self._dirty
+            self._dirty = set()
+            # Serialize now; rooms changed after this point are marked dirty again.
+            # UPDATE_ROOM takes the coordinates and placeholder flag last
+            rows = [_room_row(self._cache[key][0]) for key in batch if key in self._cache]
+            rows = [(*row[1:5], row[0], row[5]) for row in rows]
+            started = time.perf_counter()
+            try:
+                async with self.db.writer() as conn:
+                    await conn.executemany(UPDATE_ROOM, rows)
+                    await conn.commit()
+            except Exception:
+                self._flush_failures += 1
+                self._dirty |= batch
+                raise
+            elapsed = time.perf_counter() - started
+            ROOM_FLUSH_DURATION.observe(elapsed)
+            ROOMS_FLUSHED.inc(len(rows))
+            self._flushes += 1
+            self._last_flush_seconds = elapsed
+            self._evict()
+            return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current cache and flush statistics"""
+        lookups = self._hits + self._misses
+        return {
+            'entries': len(self._cache),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'dirty': len(self._dirty),
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'flushes': self._flushes,
+            'flush_failures': self._flush_failures,
+            'last_flush_seconds': self._last_flush_seconds,
+        }
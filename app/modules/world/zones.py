@@ -0,0 +1,46 @@
+from typing import Optional
+import logging
+
+from .occupancy import Coordinates, parse_coordinates
+from ...config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class ZoneMap:
+    """Partition of the coordinate world into cubic zones owned by worker processes.
+
+    Each zone is ``zone_size`` rooms per side and is assigned to exactly one
+    worker by a fixed spatial hash, so every process computes the same owner
+    without coordination. A player whose room lies in a zone owned by another
+    worker is handed off to that worker (see ZoneRouter).
+    """
+
+    def __init__(self, zone_size: int, workers: int, worker: int, port_base: int):
+        self.zone_size = max(1, zone_size)
+        self.workers = max(1, workers)
+        self.worker = worker
+        self.port_base = port_base
+
+    @classmethod
+    def from_settings(cls) -> Optional['ZoneMap']:
+        """The configured zone map, or None when zone mode is off"""
+        if not Settings.ZONE_MODE or Settings.WORKERS < 2:
+            return None
+        return cls(Settings.ZONE_SIZE, Settings.WORKERS, int(Settings.WORKER_ID), Settings.ZONE_PORT_BASE)
+
+    def zone_of(self, location) -> Coordinates:
+        x, y, z = parse_coordinates(location)
+        size = self.zone_size
+        return x // size, y // size, z // size
+
+    def owner_of(self, location) -> int:
+        zx, zy, zz = self.zone_of(location)
+        # Spatial hash so neighbouring zones spread over different workers
+        return ((zx * 73856093) ^ (zy * 19349663) ^ (zz * 83492791)) % self.workers
+
+    def owns(self, location) -> bool:
+        return self.owner_of(location) == self.worker
+
+    def port_of(self, worker: int) -> int:
+        return self.port_base + worker
@@ -1,14 +1,24 @@
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from ..modules.network.websocket_manager import WebSocketManager
+from ..modules.network.client_pipeline import ClientPipeline
+from ..modules.network.connection_reaper import ConnectionReaper
+from ..modules.network.resume_tokens import ResumeTokens
+from ..modules.network.zone_relay import ZoneRelay
 from ..config.settings import Settings
 from ..config.logging_config import setup_logging
 from ..modules.database.sqlite_handler import SQLiteHandler
+from ..modules.commands.command_registry import CommandRegistry
+from ..modules.database.password_hasher import PasswordHasher
+from .static_cache import StaticAssetCache
+from ..modules.metrics import MetricsRegistry
+from ..modules.metrics.loop_monitor import LoopMonitor
+from ..modules.world.room_store import RoomStore
+from ..modules.generators.generation_pipeline import RoomGenerationPipeline
 from contextlib import asynccontextmanager
 from typing import Optional
-from starlette.staticfiles import StaticFiles
 
 logger = setup_logging()
 
@@ -26,17 +36,44 @@ class GameServer:
             raise RuntimeError("Use GameServer.get_instance()")
             
         self.app = FastAPI()
-        self.websocket_manager = WebSocketManager()
         self.db = SQLiteHandler()
+        self.rooms = RoomStore(self.db.db)
+        self.generation = RoomGenerationPipeline(self.rooms)
+        ResumeTokens(db=self.db)
+        # Commands are created once and share the server's database pool
+        CommandRegistry(self.db)
+        self.websocket_manager = WebSocketManager()
+        self.static_assets = StaticAssetCache(Settings.WEB_DIR)
+        self.loop_monitor = LoopMonitor()
+        self.reaper = ConnectionReaper(self.websocket_manager)
+        zones = self.websocket_manager.session_manager.zones
+        # Handed off clients landing on the wrong worker are relayed to the owner
+        self.zone_relay = ZoneRelay(zones) if zones and Settings.ZONE_HANDOFF == 'relay' else None
         self._setup_app()
 
     def _setup_app(self):
         @asynccontextmanager
         async def lifespan(app: FastAPI):
+            if Settings.WEB_DIR.exists():
+                self.static_assets.load()
+            else:
+                logger.error(f"Web directory not found: {Settings.WEB_DIR}")
             await self.db.init_db()
             logger.info("Database initialized")
+            await self.rooms.start()
+            await self.generation.start()
+            await self.websocket_manager.cluster.start()
+            await self.loop_monitor.start()
+            await self.reaper.start()
             yield
+            await self.reaper.stop()
+            await self.websocket_manager.close_all()
+            await self.loop_monitor.stop()
+            await self.websocket_manager.cluster.stop()
+            await self.generation.stop()
+            await self.rooms.stop()
             await self.db.close()
+            PasswordHasher().shutdown()
 
         self.app = FastAPI(lifespan=lifespan)
         self._setup_routes()
@@ -50,44 +87,145 @@ class GameServer:
             allow_methods=["GET", "POST", "OPTIONS"],
             allow_headers=["*"],
         )
-        # Serve static files from app/static directory
-        # self.app.mount("/built", StaticFiles(directory="web/built"), name="built")
-    
-    
+
     def _setup_routes(self):
+        @self.app.get("/metrics")
+        async def metrics():
+            return PlainTextResponse(
+                MetricsRegistry().render(),
+                media_type="text/plain; version=0.0.4"
+            )
+
         @self.app.get("/")
-        async def serve_index():
-            if not Settings.WEB_DIR.exists():
-                logger.error(f"Web directory not found: {Settings.WEB_DIR}")
-                return {"error": "Web directory not found"}, 404
-            return FileResponse(Settings.WEB_DIR / "index.html")
+        async def serve_index(request: Request):
+            index = self.static_assets.index
+            if index is None:
+                return JSONResponse({"error": "Web directory not found"}, status_code=404)
+            return self.static_assets.response(request, index)
 
         @self.app.get("/{filename}")
-        async def serve_static(filename: str):
-            file_path = Settings.WEB_DIR / filename
-            if file_path.exists():
-                return FileResponse(file_path)
-            return FileResponse(Settings.WEB_DIR / "index.html")
+        async def serve_static(filename: str, request: Request):
+            # Unknown paths fall back to the client's index page
+            asset = self.static_assets.get(filename) or self.static_assets.index
+            if asset is None:
+                return JSONResponse({"error": "Web directory not found"}, status_code=404)
+            return self.static_assets.response(request, asset)
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
-            client_id = await self.websocket_manager.connect(websocket)
-            logger.info(f"New websocket connection: {client_id}")
-            
-            try:
-                while True:
-                    message = await websocket.receive_text()
-                    logger.debug(f"Received message from {client_id}: {message}")
-                    response = await self.websocket_manager.handle_message(websocket, message)
-                    await websocket.send_json(response.to_dict())
-            except Exception as e:
-                logger.error(f"WebSocket error for {client_id}: {str(e)}")
-            finally:
-                await self.websocket_manager.disconnect(websocket)
+            if self.zone_relay and await self.zone_relay.maybe_relay(websocket):
+                return
+            await self._serve_client(websocket)
+
+    async def _serve_client(self, websocket: WebSocket):
+        client_id = await self.websocket_manager.connect(websocket)
+        logger.info("New websocket connection: %s", client_id)
+        pipeline = ClientPipeline(client_id, websocket, self.websocket_manager)
+
+        try:
+            await pipeline.run()
+        except WebSocketDisconnect as e:
+            logger.debug("Client %s disconnected (code %s)", client_id, e.code)
+        except Exception as e:
+            logger.error("WebSocket error for %s: %s", client_id, e)
+        finally:
+            await self.websocket_manager.disconnect(websocket)
 
     @staticmethod
     def start():
         import uvicorn
+        if Settings.WORKERS > 1:
+            GameServer._start_workers()
+            return
         logger.info(f"Starting server on http://{Settings.HOST}:{Settings.PORT}")
         server = GameServer.get_instance()
-        uvicorn.run(server.app, host=Settings.HOST, port=Settings.PORT)
\ No newline at end of file
+        uvicorn.run(server.app, host=Settings.HOST, port=Settings.PORT, **GameServer._ws_options())
+
+    @staticmethod
+    def _ws_options():
+        return {
+            'ws_ping_interval': Settings.WS_PING_INTERVAL,
+            'ws_ping_timeout': Settings.WS_PING_TIMEOUT,
+            'ws_per_message_deflate': Settings.WS_PER_MESSAGE_DEFLATE,
+        }
+
+    @staticmethod
+    def _log_worker_layout():
+        logger.info(
+            f"Starting {Settings.WORKERS} workers on http://{Settings.HOST}:{Settings.PORT} "
+            f"(session store: {Settings.SESSION_STORE}, message bus: {Settings.MESSAGE_BUS})"
+        )
+        if not Settings.ZONE_MODE:
+            return
+        logger.info(
+            f"Zone mode: {Settings.ZONE_SIZE}-room zones, {Settings.ZONE_HANDOFF} handoffs, worker ports "
+            f"{Settings.ZONE_PORT_BASE}-{Settings.ZONE_PORT_BASE + Settings.WORKERS - 1}"
+        )
+        if Settings.ZONE_HANDOFF == 'direct':
+            logger.warning(
+                "ZONE_HANDOFF=direct: clients must reach the worker ports directly; behind a "
+                "single exposed port, proxy or TLS front end use ZONE_HANDOFF=relay"
+            )
+
+    @staticmethod
+    def _start_workers():
+        """Run Settings.WORKERS processes that all accept on the same port"""
+        import multiprocessing
+        import os
+        import secrets
+        import signal
+
+        GameServer._log_worker_layout()
+        # Resume tokens must verify on whichever worker a client reconnects to
+        if not Settings.SESSION_SECRET:
+            os.environ['SESSION_SECRET'] = secrets.token_hex(32)
+
+        # Spawned rather than forked so no threads or event loop state leak into workers
+        context = multiprocessing.get_context('spawn')
+        workers = []
+        for worker_id in range(Settings.WORKERS):
+            os.environ['WORKER_ID'] = str(worker_id)
+            worker = context.Process(target=_run_worker, name=f"worker-{worker_id}")
+            worker.start()
+            workers.append(worker)
+
+        def terminate(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        signal.signal(signal.SIGTERM, terminate)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            terminate(signal.SIGINT, None)
+            for worker in workers:
+                worker.join()
+
+
+def _run_worker():
+    """Entry point of one worker process started by GameServer._start_workers"""
+    import os
+    import socket
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Every worker binds its own listening socket and the kernel spreads
+    # incoming connections between them
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((Settings.HOST, Settings.PORT))
+    sockets = [sock]
+    if Settings.ZONE_MODE:
+        # Dedicated port that zone handoffs reach this worker on. Relayed
+        # handoffs only come from other workers, so it stays on loopback
+        zone_host = '127.0.0.1' if Settings.ZONE_HANDOFF == 'relay' else Settings.HOST
+        zone_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        zone_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        zone_sock.bind((zone_host, Settings.ZONE_PORT_BASE + int(Settings.WORKER_ID)))
+        sockets.append(zone_sock)
+
+    logger.info(f"Worker {Settings.WORKER_ID} accepting connections (pid {os.getpid()})")
+    server = GameServer.get_instance()
+    uvicorn.Server(uvicorn.Config(server.app, **GameServer._ws_options())).run(sockets=sockets)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Files whose name carries a content hash (e.g. script.3f9a1c2b.js) never change
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Compressing tiny or already compressed files isn't worth the CPU
+COMPRESS_MIN_SIZE = 256
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+class StaticAsset:
+    __slots__ = ('path', 'media_type', 'etag', 'cache_control', 'variants')
+
+    def __init__(self, path: str, body: bytes, media_type: str, immutable: bool):
+        self.path = path
+        self.media_type = media_type
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        # Content-Encoding -> body, identity always present
+        self.variants: Dict[str, bytes] = {'identity': body}
+
+        if len(body) >= COMPRESS_MIN_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants['gzip'] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants['br'] = compressed
+
+    def etag_for(self, encoding: str) -> str:
+        # Each encoding is a different representation and needs its own strong ETag
+        if encoding == 'identity':
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == '*':
+            return True
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag.strip('"').split('-')[0] == self.etag:
+                return True
+        return False
+
+
+class StaticAssetCache:
+    """In-memory copy of the built web client.
+
+    Files are read and compressed once at startup. Responses carry content-hash
+    ETags so reloads are answered with 304s, and the smallest variant the
+    browser accepts is served.
+    """
+
+    def __init__(self, root: Path, index: str = "index.html"):
+        self.root = Path(root)
+        self.index_name = index
+        self._assets: Dict[str, StaticAsset] = {}
+
+    def load(self) -> None:
+        assets = {}
+        total = 0
+        for file_path in sorted(self.root.rglob('*')):
+            if not file_path.is_file():
+                continue
+            relative = file_path.relative_to(self.root).as_posix()
+            body = file_path.read_bytes()
+            media_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+            assets[relative] = StaticAsset(
+                relative, body, media_type,
+                immutable=bool(HASHED_NAME.search(file_path.name))
+            )
+            total += len(body)
+        self._assets = assets
+        logger.info(f"Loaded {len(assets)} static assets ({total} bytes) from {self.root}")
+
+    @property
+    def index(self) -> Optional[StaticAsset]:
+        return self._assets.get(self.index_name)
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self._assets.get(path)
+
+    def response(self, request: Request, asset: StaticAsset) -> Response:
+        encoding = self._choose_encoding(request.headers.get('accept-encoding', ''), asset)
+        headers = {
+            'ETag': asset.etag_for(encoding),
+            'Cache-Control': asset.cache_control,
+            'Vary': 'Accept-Encoding',
+        }
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and asset.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str, asset: StaticAsset) -> str:
+        if len(asset.variants) == 1 or not accept_encoding:
+            return 'identity'
+        accepted = set()
+        for part in accept_encoding.lower().split(','):
+            name, _, params = part.strip().partition(';')
+            if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(name.strip())
+        for encoding in ('br', 'gzip'):
+            if encoding in asset.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
@@ -0,0 +1,219 @@
+"""Room generation throughput as the batch size grows.
+
+Run from the project root (needs the openai package from requirements.txt):
+
+    python -m benchmarks.bench_batch_generation --rooms 64 --batch-sizes 1 2 4 8
+
+Starts a fake OpenAI compatible completion server on localhost and points
+the real OpenAIClient at it, then generates the same number of rooms through
+RoomGenerationPipeline once per batch size. The fake server answers with the
+stub backend's rooms after a simulated delay of a fixed per-request overhead,
+plus a cost per prompt token, plus a cost per generated room. That is the
+shape that makes batching pay off: the overhead and the long instructions
+are paid once per request instead of once per room.
+
+Reports rooms per second, completion requests, prompt tokens per room and
+per-room latency for each batch size. --invalid-rate makes the server spoil
+a share of rooms so the per-room retries show up in the request counts.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.modules.database.db_connection import DatabaseConnection
+from app.modules.generators.generation_pipeline import PLAYER, RoomGenerationPipeline
+from app.modules.generators.room_generator import RoomGenerator
+from app.modules.llm.client import OpenAIClient, StubLLMClient
+from app.modules.world.room_store import RoomStore
+from benchmarks.load_ws import git_commit, summarize
+
+
+def count_tokens(text: str) -> int:
+    # Close enough to a BPE tokenizer for relative comparisons
+    return max(1, len(text) // 4)
+
+
+class FakeCompletionServer:
+    """OpenAI style /v1/chat/completions endpoint with a simple latency model"""
+
+    def __init__(self, overhead: float, per_prompt_token: float, per_room: float, invalid_rate: float):
+        self.stub = StubLLMClient(invalid_rate=invalid_rate)
+        self.overhead = overhead
+        self.per_prompt_token = per_prompt_token
+        self.per_room = per_room
+        self.lock = threading.Lock()
+        self.reset()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                reply = server.complete(body)
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.httpd.server_address[1]}/v1'
+
+    def reset(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def complete(self, body: dict) -> dict:
+        content = self.stub.answer(body['messages'])
+        prompt_tokens = sum(count_tokens(message['content']) for message in body['messages'])
+        completion_tokens = count_tokens(content)
+        rooms = len(json.loads(content)['rooms'])
+        time.sleep(self.overhead + prompt_tokens * self.per_prompt_token + rooms * self.per_room)
+        with self.lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return {
+            'id': f'chatcmpl-{self.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def run_batch_size(options, server: FakeCompletionServer, batch_size: int, db_path: str) -> dict:
+    # Fresh singletons so every batch size starts from an empty cache
+    RoomStore._instance = None
+    RoomGenerationPipeline._instance = None
+    store = RoomStore(DatabaseConnection(db_path))
+    llm = OpenAIClient(api_key='bench', api_base=server.url)
+    pipeline = RoomGenerationPipeline(
+        store, RoomGenerator(llm, retries=options.retries),
+        workers=options.workers, prefetch_budget=0,
+        batch_size=batch_size, batch_window=options.window,
+    )
+    server.reset()
+    await pipeline.start()
+
+    latencies = []
+    failures = 0
+
+    async def generate(key: str):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            await pipeline.request(key, PLAYER)
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            failures += 1
+
+    started = time.perf_counter()
+    # Offset per batch size so no batch size reuses another's rooms
+    await asyncio.gather(*(generate(f'{i + 1},{batch_size * 1000},0') for i in range(options.rooms)))
+    elapsed = time.perf_counter() - started
+    await pipeline.stop()
+
+    return {
+        'batch_size': batch_size,
+        'elapsed_seconds': elapsed,
+        'rooms_per_second': len(latencies) / elapsed,
+        'rooms_failed': failures,
+        'requests': server.requests,
+        'prompt_tokens_per_room': server.prompt_tokens / options.rooms,
+        'completion_tokens': server.completion_tokens,
+        'latency': summarize(latencies),
+    }
+
+
+async def run(options) -> dict:
+    server = FakeCompletionServer(options.overhead, options.per_prompt_token, options.per_room, options.invalid_rate)
+    server.start()
+    workdir = tempfile.TemporaryDirectory(prefix='wordcraft-bench-')
+    try:
+        results = [
+            await run_batch_size(options, server, batch_size, f'{workdir.name}/rooms.db')
+            for batch_size in options.batch_sizes
+        ]
+    finally:
+        server.stop()
+        workdir.cleanup()
+    return {
+        'commit': git_commit(),
+        'config': {
+            'rooms': options.rooms,
+            'workers': options.workers,
+            'window': options.window,
+            'overhead': options.overhead,
+            'per_prompt_token': options.per_prompt_token,
+            'per_room': options.per_room,
+            'invalid_rate': options.invalid_rate,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rooms', type=int, default=64)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--workers', type=int, default=4, help="concurrent completion requests")
+    parser.add_argument('--window', type=float, default=0.02, help="batching window in seconds")
+    parser.add_argument('--retries', type=int, default=1)
+    parser.add_argument('--overhead', type=float, default=0.3, help="seconds per request")
+    parser.add_argument('--per-prompt-token', type=float, default=0.0002, help="seconds per prompt token")
+    parser.add_argument('--per-room', type=float, default=0.1, help="seconds per generated room")
+    parser.add_argument('--invalid-rate', type=float, default=0.0)
+    parser.add_argument('--output', help="write the JSON report to this file")
+    options = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(options))
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+
+    print(f"{'batch':>5} {'rooms/s':>8} {'requests':>8} {'failed':>6} {'prompt tok/room':>15} "
+          f"{'p50 ms':>8} {'p95 ms':>8}")
+    for result in report['results']:
+        latency = result['latency']
+        print(f"{result['batch_size']:>5} {result['rooms_per_second']:>8.2f} {result['requests']:>8} "
+              f"{result['rooms_failed']:>6} {result['prompt_tokens_per_room']:>15.0f} "
+              f"{latency['p50_ms']:>8.0f} {latency['p95_ms']:>8.0f}")
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
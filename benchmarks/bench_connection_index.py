@@ -0,0 +1,93 @@
+"""Connection lookup cost versus number of connected clients.
+
+Run from the project root:
+
+    python -m benchmarks.bench_connection_index
+
+Each size connects N fake websockets (logged in as distinct users) to a fresh
+WebSocketManager and times the per-message lookups. With the indexed registry
+the cost per lookup should stay flat as N grows.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Mapping
+
+from app.modules.network.websocket_manager import WebSocketManager
+
+
+class FakeClient:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+
+class FakeWebSocket(Mapping):
+    """Mimics starlette's WebSocket: an unhashable mapping over its scope"""
+
+    def __init__(self, port: int):
+        self.client = FakeClient("127.0.0.1", port)
+        self._scope = {"type": "websocket", "client": ("127.0.0.1", port)}
+
+    def __getitem__(self, key):
+        return self._scope[key]
+
+    def __iter__(self):
+        return iter(self._scope)
+
+    def __len__(self):
+        return len(self._scope)
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        pass
+
+    async def send_text(self, data):
+        pass
+
+
+async def run_size(size: int, lookups: int):
+    WebSocketManager._instance = None
+    manager = WebSocketManager()
+    sockets = []
+    for port in range(size):
+        websocket = FakeWebSocket(port)
+        client_id = await manager.connection_manager.connect(websocket)
+        manager.session_manager.create_session(client_id, f"user{port}")
+        sockets.append(websocket)
+
+    picks = [random.randrange(size) for _ in range(lookups)]
+
+    started = time.perf_counter()
+    for i in picks:
+        manager._get_client_id(sockets[i])
+    client_id_ns = (time.perf_counter() - started) / lookups * 1e9
+
+    started = time.perf_counter()
+    for i in picks:
+        manager.get_websocket_by_username(f"USER{i}")
+    username_ns = (time.perf_counter() - started) / lookups * 1e9
+
+    for websocket in sockets:
+        await manager.disconnect(websocket)
+    assert not manager.connection_manager.active_connections
+    return client_id_ns, username_ns
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--lookups", type=int, default=20000)
+    options = parser.parse_args()
+
+    print(f"{'clients':>8} {'client_id ns/op':>16} {'username ns/op':>16}")
+    for size in options.sizes:
+        client_id_ns, username_ns = await run_size(size, options.lookups)
+        print(f"{size:>8} {client_id_ns:>16.0f} {username_ns:>16.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""Per-connection memory cost of idle websocket clients.
+
+Run from the project root:
+
+    python -m benchmarks.bench_connection_memory --connections 10000 --step 2000
+    python -m benchmarks.bench_connection_memory --compare-deflate
+
+Starts a GameServer in a subprocess, opens idle connections in steps and
+samples the server's resident memory after each step. The report gives the
+bytes per connection from a least-squares fit over the steps, which is the
+number to use when sizing hosts. --compare-deflate runs the measurement with
+permessage-deflate enabled and disabled, since each compressor keeps its own
+zlib state per socket.
+
+Both ends share the file descriptor limit of this host; the benchmark raises
+its own soft RLIMIT_NOFILE to the hard limit and passes it on to the server.
+"""
+import argparse
+import asyncio
+import json
+import resource
+import sys
+from typing import List, Tuple
+
+import websockets
+
+from benchmarks.load_ws import ServerProcess, git_commit, read_rss
+
+
+def raise_fd_limit(wanted: int) -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard if hard != resource.RLIM_INFINITY else max(soft, wanted)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+async def open_connections(port: int, count: int, sockets: list, concurrency: int, deflate: bool):
+    semaphore = asyncio.Semaphore(concurrency)
+    compression = 'deflate' if deflate else None
+
+    async def open_one():
+        async with semaphore:
+            ws = await websockets.connect(f'ws://127.0.0.1:{port}/ws', compression=compression)
+            await ws.recv()
+            sockets.append(ws)
+
+    await asyncio.gather(*(open_one() for _ in range(count)))
+
+
+def fit_slope(points: List[Tuple[int, int]]) -> float:
+    """Least-squares slope of RSS against connection count"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+async def measure(options, deflate: bool) -> dict:
+    server = ServerProcess(options.port, {
+        'WS_PER_MESSAGE_DEFLATE': 'true' if deflate else 'false',
+        # Keep the reaper and pings out of the measurement window
+        'IDLE_TIMEOUT': '3600',
+        'WS_PING_INTERVAL': '3600',
+    })
+    server.start()
+    sockets = []
+    points: List[Tuple[int, int]] = []
+    try:
+        await asyncio.sleep(options.settle)
+        points.append((0, read_rss(server.pid) or 0))
+        while len(sockets) < options.connections:
+            step = min(options.step, options.connections - len(sockets))
+            await open_connections(options.port, step, sockets, options.concurrency, deflate)
+            await asyncio.sleep(options.settle)
+            points.append((len(sockets), read_rss(server.pid) or 0))
+            print(f"deflate={'on' if deflate else 'off'} {len(sockets):>6} connections "
+                  f"rss {points[-1][1] / 2 ** 20:8.1f} MiB", file=sys.stderr)
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+        server.stop()
+
+    return {
+        'deflate': deflate,
+        'samples': [{'connections': x, 'rss_bytes': y} for x, y in points],
+        'bytes_per_connection': fit_slope(points),
+    }
+
+
+async def run(options) -> dict:
+    modes = [True, False] if options.compare_deflate else [options.deflate]
+    results = []
+    for deflate in modes:
+        results.append(await measure(options, deflate))
+        # Let the port and the previous server's sockets drain
+        await asyncio.sleep(1)
+    return {
+        'commit': git_commit(),
+        'config': {'connections': options.connections, 'step': options.step},
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--step', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=100, help="connections opened at once")
+    parser.add_argument('--settle', type=float, default=1.0, help="seconds to wait before sampling RSS")
+    parser.add_argument('--port', type=int, default=5197)
+    parser.add_argument('--no-deflate', dest='deflate', action='store_false')
+    parser.add_argument('--compare-deflate', action='store_true')
+    parser.add_argument('--output', help="write the JSON report to this file")
+    options = parser.parse_args()
+
+    # Client and server each hold one descriptor per connection
+    limit = raise_fd_limit(options.connections * 2 + 256)
+    if limit < options.connections + 128:
+        parser.error(f"RLIMIT_NOFILE is {limit}, too low for {options.connections} connections")
+
+    report = asyncio.run(run(options))
+    for result in report['results']:
+        print(f"deflate {'on ' if result['deflate'] else 'off'}: "
+              f"{result['bytes_per_connection'] / 1024:.1f} KiB per connection")
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
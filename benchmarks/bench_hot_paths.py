@@ -0,0 +1,273 @@
+"""Micro-benchmarks for the functions on every message path.
+
+Run from the project root:
+
+    python -m benchmarks.bench_hot_paths                  # compare against the baseline
+    python -m benchmarks.bench_hot_paths --save-baseline  # record a new baseline
+
+Each case is parameterized only on the dimensions it actually depends on
+(connection count, payload size, both or neither). A measurement is the best
+of several timing repeats in ns/op; every case is measured in --runs
+interleaved runs and the median is kept, along with the spread between runs.
+
+Results are compared with benchmarks/baseline_hot_paths.json and the process
+exits with status 1 when any case is slower than its baseline by more than
+its tolerance. Unless --tolerance fixes one for every case, the tolerance is
+derived from the spread measured when the baseline was recorded, so noisy
+cases get more room and stable ones are held tighter.
+
+Each measurement is divided by a fixed pure-Python calibration loop timed
+right before it, and cases are compared on that ratio, so a baseline recorded
+on one machine stays roughly comparable on another and a machine that slows
+down mid-run doesn't look like a regression. Re-record the baseline after
+intentional performance changes.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.modules.commands.command_registry import CommandRegistry
+from app.modules.commands.help_command import HelpCommand
+from app.modules.generators.room import Room
+from app.modules.network.websocket_manager import WebSocketManager
+from app.modules.network.websocket_message import WebSocketMessage
+from benchmarks.bench_connection_index import FakeWebSocket
+
+BASELINE_PATH = Path(__file__).with_name('baseline_hot_paths.json')
+
+CONNECTIONS = (10, 1000, 10000)
+PAYLOADS = (16, 1024, 16384)
+
+# The dimensions each case depends on; it only runs across those
+CASE_AXES = {
+    'CommandHandler.parse_command': ('payload',),
+    'CommandRegistry.get_command': (),
+    'WebSocketManager._get_client_id': ('connections',),
+    'WebSocketMessage.to_dict': ('payload',),
+    'WebSocketMessage.to_json': ('payload',),
+    'SessionManager.is_logged_in': (),
+    'Room.from_dict': ('payload',),
+    'Room.to_dict': ('payload',),
+    'HelpCommand.execute': (),
+}
+
+# Derived tolerance: this many times the baseline spread, but never below the floor
+SPREAD_FACTOR = 3.0
+MIN_TOLERANCE = 0.15
+
+
+def run_sync(coroutine):
+    """Drive a coroutine that never suspends without an event loop round trip"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def room_data(payload: int) -> dict:
+    count = max(1, payload // 128)
+    return {
+        'coordinates': '3,2,0',
+        'description': 'x' * payload,
+        'exits': {'north': '3,1,0', 'south': '3,3,0'},
+        'npcs': [{'id': i, 'name': f'npc{i}', 'description': 'A figure'} for i in range(count)],
+        'items': [{'id': i, 'name': f'item{i}', 'description': 'A thing'} for i in range(count)],
+    }
+
+
+class Fixture:
+    """A WebSocketManager with ``connections`` logged in clients"""
+
+    def __init__(self, connections: int):
+        WebSocketManager._instance = None
+        self.manager = WebSocketManager()
+        self.sockets = []
+        self.client_ids = []
+        asyncio.run(self._connect(connections))
+        self.registry = CommandRegistry()
+        self.help = self.registry.get_command('help')
+
+    async def _connect(self, connections: int):
+        for port in range(connections):
+            websocket = FakeWebSocket(port)
+            client_id = await self.manager.connection_manager.connect(websocket)
+            self.manager.session_manager.create_session(client_id, f'user{port}')
+            self.sockets.append(websocket)
+            self.client_ids.append(client_id)
+
+
+def build_cases(fixture: Fixture, payload: int) -> Dict[str, Callable[[], object]]:
+    manager = fixture.manager
+    handler = manager.command_handler
+    sessions = manager.session_manager
+    registry = fixture.registry
+    help_command: HelpCommand = fixture.help
+    # Look up a client in the middle of the tables rather than the first one
+    websocket = fixture.sockets[len(fixture.sockets) // 2]
+    client_id = fixture.client_ids[len(fixture.client_ids) // 2]
+
+    line = 'say ' + 'x' * payload
+    message = WebSocketMessage(type='chat', message='x' * payload, data={'sender': 'user1', 'location': '0,0,0'})
+    data = room_data(payload)
+    room = Room.from_dict(data)
+
+    def to_json():
+        # A fresh message each time, as a dynamic reply would be
+        return WebSocketMessage(type='chat', message=message.message, data=message.data).to_json()
+
+    return {
+        'CommandHandler.parse_command': lambda: handler.parse_command(line),
+        'CommandRegistry.get_command': lambda: registry.get_command('look'),
+        'WebSocketManager._get_client_id': lambda: manager._get_client_id(websocket),
+        'WebSocketMessage.to_dict': message.to_dict,
+        'WebSocketMessage.to_json': to_json,
+        'SessionManager.is_logged_in': lambda: sessions.is_logged_in(client_id),
+        'Room.from_dict': lambda: Room.from_dict(data),
+        'Room.to_dict': room.to_dict,
+        'HelpCommand.execute': lambda: run_sync(help_command.execute('', client_id, sessions)),
+    }
+
+
+def best_ns(func: Callable[[], object], repeats: int, min_time: float) -> float:
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeats, number=number)) / number * 1e9
+
+
+def calibrate(repeats: int, min_time: float) -> float:
+    """Cost of a fixed pure-Python workload, used to normalize between machines"""
+    def workload():
+        total = 0
+        for i in range(100):
+            total += i * i
+        return {'total': total}
+
+    return best_ns(workload, repeats, min_time)
+
+
+def summarize(samples: List[float]) -> Tuple[float, float]:
+    """Median of repeated runs and their spread relative to it.
+
+    The spread is the median absolute deviation scaled to estimate a standard
+    deviation, so one run disturbed by the machine doesn't widen it.
+    """
+    median = statistics.median(samples)
+    deviation = statistics.median(abs(sample - median) for sample in samples)
+    return median, 1.4826 * deviation / median
+
+
+def collect_cases(options) -> Dict[str, Callable[[], object]]:
+    """Every case to measure, keyed by name and the axis values it depends on"""
+    cases: Dict[str, Callable[[], object]] = {}
+    for connections in options.connections:
+        fixture = None
+        for payload in options.payloads:
+            for name, axes in CASE_AXES.items():
+                if options.filter and options.filter not in name:
+                    continue
+                # Cases that don't depend on an axis run at its first value only
+                if 'connections' not in axes and connections != options.connections[0]:
+                    continue
+                if 'payload' not in axes and payload != options.payloads[0]:
+                    continue
+                if fixture is None:
+                    fixture = Fixture(connections)
+                values = {'connections': connections, 'payload': payload}
+                params = ','.join(f'{axis}={values[axis]}' for axis in axes)
+                key = f'{name}[{params}]' if params else name
+                cases[key] = build_cases(fixture, payload)[name]
+    return cases
+
+
+def run(options) -> Dict[str, Dict[str, float]]:
+    """Median ns/op, median cost relative to the calibration, and its spread, per case"""
+    cases = collect_cases(options)
+    timings: Dict[str, List[float]] = {key: [] for key in cases}
+    ratios: Dict[str, List[float]] = {key: [] for key in cases}
+    # Interleave the runs so drift in machine load spreads over every case, and
+    # calibrate right next to each measurement so the ratio cancels that drift
+    for _ in range(options.runs):
+        for key, func in cases.items():
+            calibration = calibrate(options.repeats, options.min_time)
+            elapsed = best_ns(func, options.repeats, options.min_time)
+            timings[key].append(elapsed)
+            ratios[key].append(elapsed / calibration)
+
+    results = {}
+    for key in cases:
+        relative, spread = summarize(ratios[key])
+        results[key] = {'median_ns': statistics.median(timings[key]), 'relative': relative, 'spread': spread}
+    return results
+
+
+def case_tolerance(expected: Dict[str, float], fixed: Optional[float]) -> float:
+    if fixed is not None:
+        return fixed
+    return max(MIN_TOLERANCE, SPREAD_FACTOR * expected['spread'])
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, tolerance: Optional[float]) -> int:
+    regressions = 0
+    print(f"{'case':<60} {'ns/op':>10} {'baseline':>10} {'change':>8} {'allowed':>8}")
+    for key, result in results.items():
+        value = result['median_ns']
+        expected = baseline['results'].get(key)
+        if expected is None:
+            print(f"{key:<60} {value:>10.0f} {'-':>10} {'new':>8}")
+            continue
+        allowed = case_tolerance(expected, tolerance)
+        # Compared relative to the calibration, so a slower machine isn't a regression
+        change = result['relative'] / expected['relative'] - 1
+        flag = ''
+        if change > allowed:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{key:<60} {value:>10.0f} {expected['median_ns']:>10.0f} {change:>+8.0%} {allowed:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, nargs='+', default=list(CONNECTIONS))
+    parser.add_argument('--payloads', type=int, nargs='+', default=list(PAYLOADS))
+    parser.add_argument('--runs', type=int, default=5, help="interleaved runs whose median is kept")
+    parser.add_argument('--repeats', type=int, default=3, help="timing repeats per run, best one counts")
+    parser.add_argument('--min-time', type=float, default=0.05, help="seconds per timing repeat")
+    parser.add_argument('--tolerance', type=float,
+                        help="allowed slowdown for every case (0.5 = 50%%); "
+                             "by default derived per case from the baseline spread")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    options = parser.parse_args()
+
+    results = run(options)
+
+    if options.save_baseline:
+        options.baseline.write_text(json.dumps(
+            {'results': results}, indent=2, sort_keys=True
+        ) + '\n')
+        for key, result in results.items():
+            print(f"{key:<60} {result['median_ns']:>10.0f} {result['spread']:>7.0%} spread")
+        print(f"baseline written to {options.baseline}")
+        return
+
+    if not options.baseline.exists():
+        print(f"no baseline at {options.baseline}; run with --save-baseline first", file=sys.stderr)
+        sys.exit(2)
+
+    regressions = compare(results, json.loads(options.baseline.read_text()), options.tolerance)
+    if regressions:
+        print(f"{regressions} case(s) regressed by more than their tolerance", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
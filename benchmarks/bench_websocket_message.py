@@ -0,0 +1,67 @@
+"""Allocation and time cost of encoding WebSocketMessage frames.
+
+Run from the project root:
+
+    python -m benchmarks.bench_websocket_message
+
+Compares the old send path (to_dict() + json.dumps per send), a dynamic
+message encoded with the configured serializer, and a frozen constant whose
+frame is encoded once.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from app.modules.constants import WELCOME_MESSAGE
+from app.modules.network.websocket_message import WebSocketMessage
+
+
+def measure(label, func, iterations):
+    func()
+    # Transient allocation volume: peak traced memory above the baseline per call
+    tracemalloc.start()
+    transient = 0
+    for _ in range(200):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - baseline
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / iterations * 1e9:>10.0f} ns/op {transient / 200:>10.0f} bytes/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100000)
+    options = parser.parse_args()
+
+    frozen = WebSocketMessage.constant(type='welcome', message=WELCOME_MESSAGE)
+    sent = []
+
+    def legacy():
+        sent.append(json.dumps(WebSocketMessage(type='welcome', message=WELCOME_MESSAGE).to_dict()))
+        sent.pop()
+
+    def dynamic():
+        sent.append(WebSocketMessage(type='welcome', message=WELCOME_MESSAGE).to_json())
+        sent.pop()
+
+    def constant():
+        sent.append(frozen.to_json())
+        sent.pop()
+
+    print(f"{'path':<28} {'time':>16} {'allocated':>19}")
+    measure("to_dict + json.dumps", legacy, options.iterations)
+    measure("to_json (per message)", dynamic, options.iterations)
+    measure("to_json (frozen constant)", constant, options.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Websocket load generator for the game server.
+
+Run from the project root:
+
+    python -m benchmarks.load_ws --clients 50 --rounds 20 --mix mixed --output results.json
+
+Starts a GameServer in a subprocess (fresh database and log file in a temp
+directory) unless --url points at an already running server, connects N
+simulated clients to /ws, registers each one and then replays a scripted
+command mix. Reports throughput, p50/p95/p99 latency per command, connection
+setup time and server RSS, and writes the same figures as JSON so results can
+be compared between commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import websockets
+
+# Command scripts replayed by every client. "{peer}" is replaced with the
+# username of another simulated client.
+MIXES: Dict[str, List[str]] = {
+    'explore': ['look', 'l', 'help', 'help look'],
+    'accessibility': ['speech on', 'speech rate 1.5', 'fontsize 18', 'highcontrast on',
+                      'speech repeat', 'speech stop', 'highcontrast off', 'speech off'],
+    'chat': ['say hello there', 'yell anyone around?', 'tell {peer} psst', 'say bye'],
+}
+MIXES['mixed'] = MIXES['explore'] + MIXES['accessibility'][:4] + MIXES['chat']
+
+PASSWORD = 'benchmark-pw'
+
+
+def command_label(line: str) -> str:
+    """Group latencies by command rather than by full input line"""
+    words = line.split()
+    if words[0] == 'help' and len(words) > 1:
+        return 'help <command>'
+    if words[0] == 'speech' and len(words) > 1 and words[1] in ('rate', 'repeat', 'stop'):
+        return f'speech {words[1]}'
+    return words[0]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(samples),
+        'mean_ms': sum(samples) / len(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p95_ms': percentile(samples, 0.95) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'max_ms': max(samples) * 1000 if samples else 0.0,
+    }
+
+
+def read_rss(pid: int) -> Optional[int]:
+    """Resident set size of a process in bytes, from /proc (Linux only)"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class ServerProcess:
+    """GameServer started with `python -m app.main` on a private port and database"""
+
+    def __init__(self, port: int, env: Dict[str, str]):
+        self.port = port
+        self.workdir = tempfile.TemporaryDirectory(prefix='wordcraft-bench-')
+        self.env = dict(os.environ)
+        self.env.update({
+            'PORT': str(port),
+            'DB_PATH': os.path.join(self.workdir.name, 'bench.db'),
+            'LOG_FILE': os.path.join(self.workdir.name, 'bench.log'),
+            'LOG_LEVEL': 'WARNING',
+        })
+        self.env.update(env)
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def start(self, timeout: float = 30.0):
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'app.main'],
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{self.port}/metrics', timeout=1).read()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError("Server did not become ready in time")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.workdir.cleanup()
+
+
+class SimulatedClient:
+    def __init__(self, url: str, username: str, script: List[str], peers: List[str],
+                 think_time: float, latencies: Dict[str, List[float]], errors: Dict[str, int]):
+        self.url = url
+        self.username = username
+        self.script = script
+        self.peers = peers
+        self.think_time = think_time
+        self.latencies = latencies
+        self.errors = errors
+        self.connect_time = 0.0
+        self.ws = None
+
+    async def connect(self):
+        started = time.perf_counter()
+        self.ws = await websockets.connect(self.url, max_size=None)
+        welcome = json.loads(await self.ws.recv())
+        if welcome.get('type') != 'welcome':
+            raise RuntimeError(f"Unexpected first frame: {welcome}")
+        self.connect_time = time.perf_counter() - started
+
+    async def command(self, text: str, label: str) -> dict:
+        """Send one command and wait for its reply, skipping progress and peer chat frames"""
+        started = time.perf_counter()
+        await self.ws.send(text)
+        while True:
+            reply = json.loads(await self.ws.recv())
+            kind = reply.get('type')
+            if kind == 'progress':
+                continue
+            if kind == 'chat' and (reply.get('data') or {}).get('sender') != self.username:
+                continue
+            break
+        self.latencies[label].append(time.perf_counter() - started)
+        if kind == 'error':
+            self.errors[label] += 1
+        return reply
+
+    async def run(self, rounds: int):
+        await self.command(f'register {self.username} {PASSWORD}', 'register')
+        await self.command('logout', 'logout')
+        await self.command(f'login {self.username} {PASSWORD}', 'login')
+        for _ in range(rounds):
+            for line in self.script:
+                if '{peer}' in line:
+                    line = line.replace('{peer}', random.choice(self.peers))
+                await self.command(line, command_label(line))
+                if self.think_time:
+                    await asyncio.sleep(random.uniform(0, self.think_time * 2))
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+
+async def run_load(url: str, options, server: Optional[ServerProcess]) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    run_id = uuid.uuid4().hex[:6]
+    usernames = [f'b{run_id}_{i}' for i in range(options.clients)]
+    script = MIXES[options.mix]
+    clients = [
+        SimulatedClient(url, name, script, [peer for peer in usernames if peer != name] or [name],
+                        options.think_time, latencies, errors)
+        for name in usernames
+    ]
+
+    # Connect in waves so setup time reflects the server, not a thundering herd
+    semaphore = asyncio.Semaphore(options.connect_concurrency)
+
+    async def connect(client):
+        async with semaphore:
+            await client.connect()
+
+    await asyncio.gather(*(connect(client) for client in clients))
+    connect_times = [client.connect_time for client in clients]
+
+    rss_samples: List[int] = []
+    sampling = True
+
+    async def sample_rss():
+        while sampling:
+            rss = read_rss(server.pid) if server else None
+            if rss:
+                rss_samples.append(rss)
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.run(options.rounds) for client in clients), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    sampling = False
+    await sampler
+
+    failures = [repr(result) for result in results if isinstance(result, Exception)]
+    await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        'config': {
+            'clients': options.clients,
+            'rounds': options.rounds,
+            'mix': options.mix,
+            'think_time': options.think_time,
+            'url': url,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'commit': git_commit(),
+        },
+        'elapsed_seconds': elapsed,
+        'commands': total,
+        'throughput_per_second': total / elapsed if elapsed else 0.0,
+        'connect': summarize(connect_times),
+        'latency': {label: summarize(samples) for label, samples in sorted(latencies.items())},
+        'all_commands': summarize([value for samples in latencies.values() for value in samples]),
+        'errors': dict(errors),
+        'client_failures': failures,
+        'server_rss_bytes': {
+            'initial': rss_samples[0] if rss_samples else None,
+            'peak': max(rss_samples) if rss_samples else None,
+            'final': rss_samples[-1] if rss_samples else None,
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict):
+    print(f"{report['config']['clients']} clients, mix '{report['config']['mix']}', "
+          f"{report['commands']} commands in {report['elapsed_seconds']:.2f}s "
+          f"({report['throughput_per_second']:.0f} cmd/s)")
+    connect = report['connect']
+    print(f"connect: p50 {connect['p50_ms']:.1f}ms p95 {connect['p95_ms']:.1f}ms p99 {connect['p99_ms']:.1f}ms")
+    print(f"{'command':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for label, stats in report['latency'].items():
+        print(f"{label:<16} {stats['count']:>7} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f} {report['errors'].get(label, 0):>7}")
+    rss = report['server_rss_bytes']
+    if rss['peak']:
+        print(f"server rss: initial {rss['initial'] / 2**20:.1f}MiB peak {rss['peak'] / 2**20:.1f}MiB "
+              f"final {rss['final'] / 2**20:.1f}MiB")
+    for failure in report['client_failures']:
+        print(f"client failed: {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=10, help="times each client replays the mix")
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="mean pause between commands in seconds")
+    parser.add_argument('--connect-concurrency', type=int, default=50)
+    parser.add_argument('--port', type=int, default=5099, help="port for the spawned server")
+    parser.add_argument('--url', help="drive an already running server instead, e.g. ws://localhost:5001/ws")
+    parser.add_argument('--server-env', action='append', default=[], metavar='KEY=VALUE',
+                        help="extra environment for the spawned server (repeatable)")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    options = parser.parse_args()
+
+    server = None
+    url = options.url
+    if url is None:
+        env = dict(item.split('=', 1) for item in options.server_env)
+        server = ServerProcess(options.port, env)
+        server.start()
+        url = f'ws://127.0.0.1:{options.port}/ws'
+    try:
+        report = asyncio.run(run_load(url, options, server))
+    finally:
+        if server:
+            server.stop()
+
+    print_report(report)
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"results written to {options.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Local multi-process harness for zone mode.
+
+Run from the project root:
+
+    python -m benchmarks.zone_harness --workers 4 --players 40 --zone-size 4 [--handoff direct]
+
+Starts the server with WORKERS worker processes and ZONE_MODE on, registers
+players, spreads their saved locations over a grid of zones directly in the
+harness database, then logs every player in through the shared port. Players
+whose zone belongs to another worker get a handoff frame and resume on the
+owner: in relay mode (the default) by reconnecting through the shared port
+with the owner as a hint, in direct mode by connecting to the owner's
+dedicated port. The harness checks that every session ends up on its zone
+owner, that room chat reaches co-located players, and reports handoff counts
+and latency.
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import websockets
+
+from app.modules.world.zones import ZoneMap
+from benchmarks.load_ws import PASSWORD, ServerProcess, summarize
+
+
+async def recv_reply(ws, types=('success', 'error', 'resume-failed', 'handoff', 'chat')) -> dict:
+    while True:
+        reply = json.loads(await ws.recv())
+        if reply.get('type') in types:
+            return reply
+
+
+class Player:
+    def __init__(self, username: str, location: str):
+        self.username = username
+        self.location = location
+        self.ws = None
+        self.url = None
+        self.handoffs = 0
+        self.handoff_time = 0.0
+
+    async def connect(self, url: str):
+        self.ws = await websockets.connect(url)
+        self.url = url
+        await self.ws.recv()
+
+    async def login(self, port: int):
+        self.port = port
+        await self.connect(f'ws://127.0.0.1:{port}/ws')
+        await self.ws.send(f'login {self.username} {PASSWORD}')
+        reply = await recv_reply(self.ws)
+        if reply['type'] != 'success':
+            raise RuntimeError(f"login failed for {self.username}: {reply['message']}")
+        await self.follow_handoffs()
+
+    async def follow_handoffs(self):
+        """Follow handoff frames until the player settles on a worker"""
+        while True:
+            try:
+                reply = await asyncio.wait_for(recv_reply(self.ws, ('handoff',)), 0.5)
+            except asyncio.TimeoutError:
+                return
+            started = time.perf_counter()
+            await self.ws.close()
+            data = reply['data']
+            if 'port' in data:
+                await self.connect(f"ws://127.0.0.1:{data['port']}/ws")
+            else:
+                await self.connect(f"ws://127.0.0.1:{self.port}/ws?worker={data['worker']}")
+            await self.ws.send(f"resume {reply['data']['resume_token']}")
+            resumed = await recv_reply(self.ws)
+            if resumed['type'] != 'success':
+                raise RuntimeError(f"resume failed for {self.username}: {resumed['message']}")
+            self.handoffs += 1
+            self.handoff_time = time.perf_counter() - started
+
+
+def wait_for_ports(ports: List[int], timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    for port in ports:
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"worker port {port} did not come up")
+                time.sleep(0.1)
+
+
+def active_sessions(port: int) -> int:
+    """Logged in sessions on one worker, scraped from its /metrics endpoint"""
+    metrics = urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5).read().decode()
+    for line in metrics.splitlines():
+        if line.startswith('wordcraft_active_sessions '):
+            return int(float(line.split()[1]))
+    return 0
+
+
+async def register(port: int, usernames: List[str]):
+    for username in usernames:
+        ws = await websockets.connect(f'ws://127.0.0.1:{port}/ws')
+        await ws.recv()
+        await ws.send(f'register {username} {PASSWORD}')
+        reply = await recv_reply(ws, ('success', 'error'))
+        if reply['type'] != 'success':
+            raise RuntimeError(f"register failed for {username}: {reply['message']}")
+        await ws.close()
+
+
+def place_players(db_path: str, players: List[Player]):
+    """Write saved locations straight into the database, as if they had walked there"""
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "UPDATE players SET location = ? WHERE username = ?",
+            [(player.location, player.username) for player in players]
+        )
+
+
+async def check_chat(players: List[Player]) -> Tuple[int, int]:
+    """Each occupied room: the first player says something, everyone else there must hear it"""
+    rooms: Dict[str, List[Player]] = defaultdict(list)
+    for player in players:
+        rooms[player.location].append(player)
+    expected = heard = 0
+    for occupants in rooms.values():
+        if len(occupants) < 2:
+            continue
+        speaker, listeners = occupants[0], occupants[1:]
+        await speaker.ws.send(f'say hello from {speaker.username}')
+        for listener in listeners:
+            expected += 1
+            try:
+                reply = await asyncio.wait_for(recv_reply(listener.ws, ('chat',)), 2)
+                if reply['data'].get('sender') == speaker.username:
+                    heard += 1
+            except asyncio.TimeoutError:
+                pass
+    return expected, heard
+
+
+async def run(options, server: ServerProcess, zones: ZoneMap) -> dict:
+    players = []
+    for i in range(options.players):
+        # Two players per room, rooms spread across a line of zones
+        room = i // 2
+        players.append(Player(f'zone{i}', f'{room * options.zone_size},0,0'))
+
+    await register(options.port, [player.username for player in players])
+    place_players(server.env['DB_PATH'], players)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(player.login(options.port) for player in players))
+    login_elapsed = time.perf_counter() - started
+
+    per_worker = defaultdict(int)
+    for player in players:
+        per_worker[zones.owner_of(player.location)] += 1
+    # Every worker must hold exactly the sessions of the zones it owns
+    sessions = {worker: active_sessions(zones.port_of(worker)) for worker in range(options.workers)}
+    misplaced = {
+        worker: {'expected': per_worker.get(worker, 0), 'actual': count}
+        for worker, count in sessions.items() if count != per_worker.get(worker, 0)
+    }
+
+    expected, heard = await check_chat(players)
+    for player in players:
+        await player.ws.close()
+
+    return {
+        'config': {'workers': options.workers, 'players': options.players, 'zone_size': options.zone_size,
+                   'handoff': options.handoff},
+        'login_seconds': login_elapsed,
+        'handoffs': sum(player.handoffs for player in players),
+        'handoff_latency': summarize([player.handoff_time for player in players if player.handoffs]),
+        'players_per_worker': dict(sorted(per_worker.items())),
+        'misplaced': misplaced,
+        'chat_expected': expected,
+        'chat_heard': heard,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--players', type=int, default=40)
+    parser.add_argument('--zone-size', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5199)
+    parser.add_argument('--handoff', choices=('relay', 'direct'), default='relay')
+    parser.add_argument('--output', help="write the JSON report to this file")
+    options = parser.parse_args()
+
+    zone_port_base = options.port + 1
+    server = ServerProcess(options.port, {
+        'WORKERS': str(options.workers),
+        'ZONE_MODE': 'true',
+        'ZONE_SIZE': str(options.zone_size),
+        'ZONE_PORT_BASE': str(zone_port_base),
+        'ZONE_HANDOFF': options.handoff,
+    })
+    server.env['SESSION_STORE_PATH'] = server.env['DB_PATH'] + '.sessions'
+    server.env['BUS_DIR'] = server.workdir.name + '/bus'
+    zones = ZoneMap(options.zone_size, options.workers, worker=-1, port_base=zone_port_base)
+
+    server.start()
+    try:
+        wait_for_ports([zones.port_of(worker) for worker in range(options.workers)])
+        report = asyncio.run(run(options, server, zones))
+    finally:
+        server.stop()
+
+    print(json.dumps(report, indent=2))
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    if report['misplaced'] or report['chat_heard'] != report['chat_expected']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -42,4 +42,4 @@ CREATE TABLE IF NOT EXISTS banned_players (
 
 -- Add indexes for performance
 CREATE INDEX IF NOT EXISTS idx_player_name ON players(username COLLATE NOCASE);
-CREATE INDEX IF NOT EXISTS idx_room_coordinates ON rooms(coordinates);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_room_coordinates ON rooms(coordinates);
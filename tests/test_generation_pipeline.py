@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.modules.database.sqlite_handler import SQLiteHandler
+from app.modules.generators.generation_pipeline import PLAYER, PREFETCH, RoomGenerationPipeline
+from app.modules.generators.room_generator import RoomGenerator
+from app.modules.llm.client import StubLLMClient
+from app.modules.world.room_store import RoomStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_singletons(monkeypatch):
+    monkeypatch.setattr(RoomGenerationPipeline, '_instance', None)
+    monkeypatch.setattr(RoomStore, '_instance', None)
+
+
+async def start_pipeline(tmp_path, latency=0.05, **kwargs):
+    db = SQLiteHandler(str(tmp_path / 'game.db'))
+    await db.init_db()
+    llm = StubLLMClient(latency=latency)
+    pipeline = RoomGenerationPipeline(RoomStore(db.db), RoomGenerator(llm), **kwargs)
+    await pipeline.start()
+    return pipeline, llm, db
+
+
+async def stop_pipeline(pipeline, db):
+    await pipeline.stop()
+    await db.close()
+
+
+def test_concurrent_requests_share_one_completion(tmp_path):
+    async def scenario():
+        pipeline, llm, db = await start_pipeline(tmp_path, prefetch_budget=0)
+        try:
+            rooms = await asyncio.gather(*(pipeline.request('5,5,0', PLAYER) for _ in range(5)))
+            assert llm.calls == 1
+            assert all(room is rooms[0] for room in rooms)
+            # Later requests are answered from the store without another completion
+            assert (await pipeline.get_room('5,5,0')).get_coordinates() == '5,5,0'
+            assert llm.calls == 1
+        finally:
+            await stop_pipeline(pipeline, db)
+
+    asyncio.run(scenario())
+
+
+def test_queued_prefetch_is_promoted_ahead_of_other_prefetches(tmp_path):
+    async def scenario():
+        pipeline, llm, db = await start_pipeline(tmp_path, workers=1, batch_size=1, prefetch_budget=4)
+        try:
+            finished = []
+            busy = pipeline.request('1,0,0', PLAYER)
+            # Let the dispatcher hand the only worker to the first request
+            await asyncio.sleep(0.01)
+            queued = [pipeline.request(key, PREFETCH) for key in ('2,0,0', '3,0,0', '4,0,0')]
+            for key, future in zip(('2,0,0', '3,0,0', '4,0,0'), queued):
+                future.add_done_callback(lambda _, key=key: finished.append(key))
+
+            promoted = pipeline.request('4,0,0', PLAYER)
+            job = pipeline._jobs['4,0,0']
+            assert job.priority == PLAYER and not job.started
+            assert pipeline._prefetching == 2
+
+            await asyncio.gather(busy, promoted, *queued)
+            assert finished[0] == '4,0,0'
+            assert llm.calls == 4
+        finally:
+            await stop_pipeline(pipeline, db)
+
+    asyncio.run(scenario())
+
+
+def test_prefetches_never_exceed_the_budget(tmp_path):
+    async def scenario():
+        budget = 2
+        pipeline, llm, db = await start_pipeline(tmp_path, workers=1, batch_size=1, prefetch_budget=budget)
+        request = pipeline.request
+        peak = 0
+
+        def counting_request(key, priority=PLAYER, previous=None):
+            nonlocal peak
+            future = request(key, priority, previous)
+            peak = max(peak, pipeline._prefetching)
+            assert pipeline._prefetching <= budget
+            return future
+
+        pipeline.request = counting_request
+        try:
+            # Every room shown queues prefetches of the unexplored rooms behind its exits
+            for x in range(6):
+                await pipeline.get_room(f'{x * 10},0,0')
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            assert peak == budget
+            assert pipeline._prefetching <= budget
+        finally:
+            await stop_pipeline(pipeline, db)
+
+        assert pipeline._prefetching == 0
+
+    asyncio.run(scenario())
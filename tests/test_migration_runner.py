@@ -0,0 +1,75 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import aiosqlite
+import pytest
+
+from app.modules.database.migration_runner import MigrationRunner
+
+# app/schema.sql as it was before numbered migrations, applied by every
+# server release up to then
+LEGACY_SCHEMA = Path(__file__).with_name('fixtures') / 'legacy_schema.sql'
+
+
+async def migrate(path: Path) -> int:
+    async with aiosqlite.connect(path) as conn:
+        return await MigrationRunner().migrate(conn)
+
+
+def columns(conn: sqlite3.Connection, table: str):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA.read_text())
+    conn.execute("INSERT INTO players (id, username, password_hash) VALUES ('1', 'bob', 'x')")
+    conn.execute("INSERT INTO rooms (coordinates, description) VALUES ('1,0,0', 'An old room')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_upgrades_a_pre_migration_database(legacy_db):
+    latest = MigrationRunner().latest
+
+    assert asyncio.run(migrate(legacy_db)) == latest
+    assert asyncio.run(migrate(legacy_db)) == 0
+
+    conn = sqlite3.connect(legacy_db)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == latest
+        # Existing rows survive and pick up the columns later migrations add
+        assert conn.execute("SELECT username, sessions_revoked_at FROM players").fetchall() == [('bob', None)]
+        assert conn.execute("SELECT coordinates, placeholder FROM rooms").fetchall() == [('1,0,0', 0)]
+        assert conn.execute("SELECT count(*) FROM roles").fetchone()[0] == 3
+    finally:
+        conn.close()
+
+
+def test_new_database_matches_an_upgraded_one(legacy_db, tmp_path):
+    fresh = tmp_path / 'fresh.db'
+    asyncio.run(migrate(fresh))
+    asyncio.run(migrate(legacy_db))
+
+    fresh_conn, legacy_conn = sqlite3.connect(fresh), sqlite3.connect(legacy_db)
+    try:
+        for table in ('players', 'rooms', 'roles', 'banned_players'):
+            assert columns(fresh_conn, table) == columns(legacy_conn, table)
+        assert fresh_conn.execute("PRAGMA user_version").fetchone() == legacy_conn.execute("PRAGMA user_version").fetchone()
+    finally:
+        fresh_conn.close()
+        legacy_conn.close()
+
+
+def test_refuses_a_newer_database(tmp_path):
+    path = tmp_path / 'future.db'
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {MigrationRunner().latest + 1:d}")
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(migrate(path))
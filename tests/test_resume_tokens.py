@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from app.modules.database.sqlite_handler import SQLiteHandler
+from app.modules.network import resume_tokens
+from app.modules.network.resume_tokens import ResumeTokens
+
+
+class FakeClock:
+    """Stands in for the time module inside resume_tokens"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Close to the real time so exp and iat still pass jwt's own checks,
+    # and early in a second so the steps below share the same whole second
+    clock = FakeClock(int(time.time()) + 0.1)
+    monkeypatch.setattr(resume_tokens, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def tokens(tmp_path, monkeypatch):
+    monkeypatch.setattr(ResumeTokens, '_instance', None)
+    db = SQLiteHandler(str(tmp_path / 'game.db'))
+
+    async def setup():
+        await db.init_db()
+        async with db.db.writer() as conn:
+            await conn.execute("INSERT INTO players (username, password_hash) VALUES (?, ?)", ('alice', b'x'))
+            await conn.commit()
+
+    asyncio.run(setup())
+    yield ResumeTokens(secret='test-secret', ttl=3600, db=db)
+    asyncio.run(db.close())
+
+
+def test_token_is_accepted_until_revoked(tokens, clock):
+    async def scenario():
+        token = tokens.issue('alice', [], '0,0,0')
+        assert (await tokens.verify(token))['sub'] == 'alice'
+        clock.now += 0.1
+        await tokens.revoke('alice')
+        assert await tokens.verify(token) is None
+
+    asyncio.run(scenario())
+
+
+def test_revocation_orders_within_the_same_second(tokens, clock):
+    async def scenario():
+        before = tokens.issue('alice', [], '0,0,0')
+        clock.now += 0.2
+        await tokens.revoke('alice')
+        clock.now += 0.2
+        after = tokens.issue('alice', [], '1,0,0')
+
+        # All three happened in one whole second, so only ts tells them apart
+        assert int(clock.now) == int(clock.now - 0.4)
+        assert await tokens.verify(before) is None
+        claims = await tokens.verify(after)
+        assert claims is not None and claims['loc'] == '1,0,0'
+
+    asyncio.run(scenario())
+
+
+def test_token_issued_at_the_revocation_time_is_rejected(tokens, clock):
+    async def scenario():
+        await tokens.revoke('alice')
+        assert await tokens.verify(tokens.issue('alice', [], None)) is None
+
+    asyncio.run(scenario())
+
+
+def test_revocation_survives_a_restart(tokens, clock, tmp_path, monkeypatch):
+    async def scenario():
+        token = tokens.issue('alice', [], None)
+        clock.now += 0.1
+        await tokens.revoke('alice')
+        monkeypatch.setattr(ResumeTokens, '_instance', None)
+        db = SQLiteHandler(str(tmp_path / 'game.db'))
+        try:
+            restarted = ResumeTokens(secret='test-secret', ttl=3600, db=db)
+            assert await restarted.verify(token) is None
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_player_is_rejected(tokens, clock):
+    async def scenario():
+        assert await tokens.verify(tokens.issue('mallory', [], None)) is None
+
+    asyncio.run(scenario())
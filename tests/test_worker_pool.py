@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.modules.llm.client import StubLLMClient
+from app.modules.llm.worker_pool import CircuitBreaker, CircuitOpenError, LLMTimeoutError, LLMWorkerPool
+
+MESSAGES = [{"role": "user", "content": "- 1,0,0"}]
+
+
+def half_open_breaker() -> CircuitBreaker:
+    # Opens on the first failure and turns half open straight away
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+
+def test_only_one_probe_is_let_through_while_half_open():
+    breaker = half_open_breaker()
+    probe = breaker.allow()
+    assert probe is not None and probe is not CircuitBreaker.PASS
+    assert breaker.allow() is None
+
+    breaker.release(probe)
+    assert breaker.allow() is not None
+
+
+def test_a_request_admitted_while_closed_cannot_release_the_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    admitted = breaker.allow()
+    assert admitted is CircuitBreaker.PASS
+
+    breaker.record_failure()
+    probe = breaker.allow()
+    breaker.release(admitted)
+    assert breaker.allow() is None
+
+    breaker.record_success()
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slot_timeout_after_the_breaker_turned_half_open_keeps_the_probe():
+    async def scenario():
+        pool = LLMWorkerPool(StubLLMClient(latency=0), concurrency=1, max_queue=4, rate_limit=0,
+                             timeout=0.05, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        # Every worker is busy, so the next request waits for a slot
+        await pool._slots.acquire()
+        waiting = asyncio.create_task(pool.complete(MESSAGES))
+        await asyncio.sleep(0)
+
+        pool.breaker.record_failure()
+        probe = pool.breaker.allow()
+        assert probe is not None
+
+        with pytest.raises(LLMTimeoutError):
+            await waiting
+        # The probe is still in flight elsewhere; nobody else may probe yet
+        with pytest.raises(CircuitOpenError):
+            await pool.complete(MESSAGES)
+
+        pool.breaker.release(probe)
+        pool._slots.release()
+        assert await pool.complete(MESSAGES)
+        assert pool.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_probe_that_times_out_waiting_for_a_worker_frees_the_probe():
+    async def scenario():
+        pool = LLMWorkerPool(StubLLMClient(latency=0), concurrency=1, max_queue=4, rate_limit=0,
+                             timeout=0.05, breaker=half_open_breaker())
+        await pool._slots.acquire()
+        with pytest.raises(LLMTimeoutError):
+            await pool.complete(MESSAGES)
+        # It never reached the backend, so the next request may probe instead
+        assert pool.breaker.allow() is not None
+
+    asyncio.run(scenario())
@@ -4,23 +4,31 @@ const sendButton = document.getElementById('send');
 const autoScroll = true; // Can be toggled by user preference
 let speechEnabled = localStorage.getItem('speechEnabled') === 'true';
 let speechRate = parseFloat(localStorage.getItem('speechRate') ?? '1.0');
+// Signed token from the server that restores the session after a reconnect
+const RESUME_TOKEN_KEY = 'resumeToken';
 
 // Dynamically determine WebSocket URL
-const wsUrl = 
+const publicWsUrl =
     window.location.protocol === "https:"
     ? `wss://${window.location.host}/ws`
     : `ws://${window.location.host}/ws`;
+let wsUrl = publicWsUrl;
 
 console.log(`Connecting to WebSocket server at: ${wsUrl}`);
 
 // Initialize WebSocket connection
 let ws: WebSocket;
+let handingOff = false;
 function connectWebSocket() {
     ws = new WebSocket(wsUrl);
     
     ws.onopen = () => {
         console.log('Connected to server');
         appendToOutput('Connected to server...');
+        const resumeToken = sessionStorage.getItem(RESUME_TOKEN_KEY);
+        if (resumeToken) {
+            ws.send(`resume ${resumeToken}`);
+        }
     };
     
     ws.onmessage = (event) => {
@@ -29,6 +37,30 @@ function connectWebSocket() {
             const data = JSON.parse(event.data);
             console.log('Parsed message:', data);
             
+            // Keep the latest resume token, forget it once it is no longer valid
+            if (data.data?.resume_token) {
+                sessionStorage.setItem(RESUME_TOKEN_KEY, data.data.resume_token);
+            }
+            if (data.type === 'logout' || data.type === 'resume-failed') {
+                sessionStorage.removeItem(RESUME_TOKEN_KEY);
+            }
+            
+            // Zone handoff: resume the session on the server that owns the new region
+            if (data.type === 'handoff' && data.data?.worker !== undefined) {
+                if (data.data.port) {
+                    // The server exposes each worker's zone port directly
+                    const scheme = window.location.protocol === "https:" ? 'wss' : 'ws';
+                    wsUrl = `${scheme}://${window.location.hostname}:${data.data.port}/ws`;
+                } else {
+                    // Same public endpoint, with a hint naming the owning worker
+                    wsUrl = `${publicWsUrl}?worker=${data.data.worker}`;
+                }
+                handingOff = true;
+                appendToOutput(data.message);
+                ws.close();
+                return;
+            }
+            
             // Handle theme changes
             if (data.type === 'theme' && data.data?.theme) {
                 document.documentElement.setAttribute('data-theme', data.data.theme);
@@ -91,6 +123,12 @@ function connectWebSocket() {
     
     ws.onclose = () => {
         console.log('Disconnected from server');
+        if (handingOff) {
+            // Reconnect straight away to the worker that owns the new zone
+            handingOff = false;
+            connectWebSocket();
+            return;
+        }
         appendToOutput('Disconnected from server. Reconnecting...');
         setTimeout(connectWebSocket, 1000);
     };